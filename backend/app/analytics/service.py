@@ -0,0 +1,197 @@
+"""
+Serviço de Resumo de Texto Livre
+===============================
+
+Mantém o TextSketch de cada pergunta de texto livre:
+- create_for(): cria o resumo vazio quando a pergunta de texto é criada
+- ingest(): grava as respostas da submissão em question_text_summary_deltas
+  (INSERT append-only, sem lock na linha do resumo)
+- TextSummaryMerger: incorpora os deltas pendentes aos sketches em lotes,
+  em background; só ele escreve em question_text_summaries
+- get_summaries(): lê os resumos para o analytics (somente leitura)
+
+As submissões de um formulário não disputam mais a mesma linha: o sketch
+(~10 KB de JSON) é reescrito uma vez por lote, não uma vez por resposta.
+
+Autor: Equipe de Desenvolvimento
+"""
+
+import asyncio
+import logging
+from collections import defaultdict
+from typing import Any, Dict, Iterable, List, Optional
+from sqlalchemy import delete, func, select
+from sqlalchemy.dialects.postgresql import insert
+from sqlalchemy.ext.asyncio import AsyncSession
+from app.analytics.text_sketch import TextSketch, TEXT_QUESTION_TYPES, answer_text
+from app.config import settings
+from app.database.connection import session_factories
+from app.database.models import Question, QuestionTextSummary, QuestionTextSummaryDelta
+
+logger = logging.getLogger(__name__)
+
+
+class TextSummaryService:
+    """Operações sobre os sketches de perguntas de texto livre"""
+
+    @staticmethod
+    async def create_for(db: AsyncSession, questions: Iterable[Question]) -> None:
+        """Cria o resumo vazio das perguntas de texto livre (chamar após o flush que gera os ids)"""
+        question_ids = sorted({str(q.id) for q in questions if q.type in TEXT_QUESTION_TYPES})
+        if not question_ids:
+            return
+        await db.execute(
+            insert(QuestionTextSummary)
+            .values([{"question_id": qid, "documents": 0, "sketch": {}} for qid in question_ids])
+            .on_conflict_do_nothing(index_elements=[QuestionTextSummary.question_id])
+        )
+
+    @staticmethod
+    async def ingest(db: AsyncSession, answers: Dict[str, str]) -> None:
+        """
+        Registra as respostas de texto livre de uma submissão para o próximo merge
+
+        Args:
+            answers: question_id -> valor armazenado (JSON string)
+        """
+        if not answers:
+            return
+
+        result = await db.execute(
+            select(Question.id).where(
+                Question.id.in_(list(answers.keys())),
+                Question.type.in_(TEXT_QUESTION_TYPES)
+            )
+        )
+        text_question_ids = [str(qid) for qid in result.scalars().all()]
+        if not text_question_ids:
+            return
+
+        await db.execute(
+            insert(QuestionTextSummaryDelta).values([
+                {"question_id": qid, "value": answers[qid]} for qid in text_question_ids
+            ])
+        )
+
+    @staticmethod
+    async def merge_pending(db: AsyncSession, limit: int) -> int:
+        """
+        Incorpora até `limit` deltas pendentes aos sketches (uma transação)
+
+        Várias réplicas podem rodar o merge: SKIP LOCKED divide os deltas entre
+        elas e os resumos são travados em ordem determinística.
+
+        Returns:
+            Quantidade de deltas consumidos
+        """
+        pending = (
+            select(QuestionTextSummaryDelta.id)
+            .order_by(QuestionTextSummaryDelta.id)
+            .limit(limit)
+            .with_for_update(skip_locked=True)
+        )
+        result = await db.execute(
+            delete(QuestionTextSummaryDelta)
+            .where(QuestionTextSummaryDelta.id.in_(pending.scalar_subquery()))
+            .returning(QuestionTextSummaryDelta.question_id, QuestionTextSummaryDelta.value)
+        )
+        values: Dict[str, List[Optional[str]]] = defaultdict(list)
+        consumed = 0
+        for question_id, value in result.all():
+            values[str(question_id)].append(value)
+            consumed += 1
+        if not consumed:
+            return 0
+
+        question_ids = sorted(values)
+        # Perguntas que viraram texto depois de criadas ainda não têm resumo
+        await db.execute(
+            insert(QuestionTextSummary)
+            .values([{"question_id": qid, "documents": 0, "sketch": {}} for qid in question_ids])
+            .on_conflict_do_nothing(index_elements=[QuestionTextSummary.question_id])
+        )
+        result = await db.execute(
+            select(QuestionTextSummary)
+            .where(QuestionTextSummary.question_id.in_(question_ids))
+            .order_by(QuestionTextSummary.question_id)
+            .with_for_update()
+        )
+        for summary in result.scalars().all():
+            sketch = TextSketch(settings.ANALYTICS_TEXT_TOP_K, summary.sketch)
+            sketch.add_documents(answer_text(value) for value in values[str(summary.question_id)])
+            summary.documents = sketch.documents  # type: ignore
+            summary.sketch = sketch.to_dict()  # type: ignore
+
+        await db.commit()
+        return consumed
+
+    @staticmethod
+    async def get_summaries(db: AsyncSession, question_ids: Iterable[str]) -> Dict[str, Dict[str, Any]]:
+        """Resumo top-k por pergunta, com tamanho limitado, e respostas aguardando o merge"""
+        question_ids = [str(qid) for qid in question_ids]
+        if not question_ids:
+            return {}
+
+        result = await db.execute(
+            select(QuestionTextSummary).where(QuestionTextSummary.question_id.in_(question_ids))
+        )
+        summaries = {
+            str(s.question_id): TextSketch(settings.ANALYTICS_TEXT_TOP_K, s.sketch).summary()
+            for s in result.scalars().all()
+        }
+        # Respostas ainda na fila do merge (a tabela de deltas é drenada em background)
+        result = await db.execute(
+            select(QuestionTextSummaryDelta.question_id, func.count())
+            .where(QuestionTextSummaryDelta.question_id.in_(question_ids))
+            .group_by(QuestionTextSummaryDelta.question_id)
+        )
+        pending = {str(qid): count for qid, count in result.all()}
+
+        # Sem linha: pergunta sem respostas de texto ainda incorporadas
+        empty = TextSketch(settings.ANALYTICS_TEXT_TOP_K).summary()
+        return {qid: {**summaries.get(qid, empty), "pending": pending.get(qid, 0)} for qid in question_ids}
+
+
+class TextSummaryMerger:
+    """Worker que incorpora os deltas de texto livre aos resumos"""
+
+    def __init__(self):
+        self._task: Optional["asyncio.Task[None]"] = None
+        self.stats = {"merged": 0, "batches": 0, "errors": 0}
+
+    async def merge(self) -> int:
+        """Consome os deltas pendentes em lotes até esvaziar a fila"""
+        merged = 0
+        while True:
+            async with session_factories["background"]() as db:
+                consumed = await TextSummaryService.merge_pending(db, settings.ANALYTICS_TEXT_MERGE_BATCH)
+            if consumed:
+                merged += consumed
+                self.stats["merged"] += consumed
+                self.stats["batches"] += 1
+            if consumed < settings.ANALYTICS_TEXT_MERGE_BATCH:
+                return merged
+
+    def start(self) -> None:
+        self._task = asyncio.create_task(self._run())
+
+    async def stop(self) -> None:
+        if self._task is not None:
+            self._task.cancel()
+            await asyncio.gather(self._task, return_exceptions=True)
+            self._task = None
+
+    async def _run(self) -> None:
+        while True:
+            try:
+                await self.merge()
+            except asyncio.CancelledError:
+                raise
+            except Exception as e:
+                self.stats["errors"] += 1
+                logger.error(f"Falha ao incorporar respostas aos resumos de texto: {e}")
+            await asyncio.sleep(settings.ANALYTICS_TEXT_MERGE_SECONDS)
+
+
+# Instances
+text_summary_merger = TextSummaryMerger()
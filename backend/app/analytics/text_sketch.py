@@ -0,0 +1,215 @@
+"""
+Sketches de Texto Livre - Resumo Top-K
+=====================================
+
+Estruturas de dados em streaming para resumir respostas de texto livre
+(short-text, long-text, paragraph) com memória fixa:
+
+- CountMinSketch: estima a frequência de qualquer termo com tabela fixa
+- SpaceSavingTopK: mantém apenas os K candidatos mais frequentes (min-heap)
+- TextSketch: combina os dois para termos (tokens) e frases (bigramas)
+
+Cada resposta é processada uma única vez na submissão. O estado é
+serializável em JSON para ser persistido por pergunta, e o resumo gerado
+tem tamanho limitado independentemente do número de respostas.
+
+Autor: Equipe de Desenvolvimento
+"""
+
+import hashlib
+import heapq
+import json
+import re
+from typing import Any, Dict, Iterable, List, Optional, Tuple
+
+
+# Tipos de pergunta tratados como texto livre
+TEXT_QUESTION_TYPES = {"short-text", "long-text", "paragraph", "text", "textarea"}
+
+# Palavras ignoradas na contagem (português + inglês)
+STOP_WORDS = frozenset("""
+a ao aos as à às com como da das de dei do dos e é ela elas ele eles em entre era essa esse
+esta este eu foi for há isso isto já la lhe mais mas me mesmo meu minha muito na nas não nem
+no nos nós num numa o os ou para pela pelas pelo pelos por qual quando que quem se sem ser seu
+seus sua suas só também te tem tenho tu um uma umas uns você vocês vai vou
+about an and are as at be been but by can do for from had has have i if in into is it its
+me my not of on or our so than that the their them then there they this to was we were what
+when which who will with would you your
+""".split())
+
+_TOKEN_RE = re.compile(r"[^\W\d_]+", re.UNICODE)
+
+# Limites por documento para manter o custo de ingestão previsível
+MAX_TOKENS_PER_DOCUMENT = 2000
+MAX_TERM_LENGTH = 48
+
+
+def answer_text(value: Optional[str]) -> str:
+    """Extrai o texto de uma resposta armazenada (sempre JSON array de strings)"""
+    if not value:
+        return ""
+    try:
+        parsed = json.loads(value)
+    except (TypeError, ValueError):
+        return value
+    if isinstance(parsed, list):
+        return " ".join(str(item) for item in parsed if item is not None)
+    return str(parsed)
+
+
+def tokenize(text: str) -> List[str]:
+    """Quebra o texto em tokens minúsculos (apenas letras), limitado por documento"""
+    tokens = _TOKEN_RE.findall(text.lower())
+    return [t[:MAX_TERM_LENGTH] for t in tokens[:MAX_TOKENS_PER_DOCUMENT]]
+
+
+def _hash_pair(item: str) -> Tuple[int, int]:
+    """Dois hashes de 32 bits estáveis entre processos (hash() do Python é aleatório)"""
+    digest = hashlib.blake2b(item.encode("utf-8"), digest_size=8).digest()
+    return int.from_bytes(digest[:4], "little"), int.from_bytes(digest[4:], "little") | 1
+
+
+class CountMinSketch:
+    """Count-min sketch com atualização conservadora"""
+
+    def __init__(self, width: int = 512, depth: int = 4, table: Optional[List[List[int]]] = None):
+        self.width = width
+        self.depth = depth
+        self.table = table or [[0] * width for _ in range(depth)]
+
+    def _cells(self, item: str) -> List[int]:
+        h1, h2 = _hash_pair(item)
+        return [(h1 + row * h2) % self.width for row in range(self.depth)]
+
+    def estimate(self, item: str) -> int:
+        """Estimativa (nunca subestima) da frequência do item"""
+        cells = self._cells(item)
+        return min(self.table[row][col] for row, col in enumerate(cells))
+
+    def add(self, item: str, count: int = 1) -> int:
+        """Incrementa o item e retorna a nova estimativa"""
+        cells = self._cells(item)
+        current = min(self.table[row][col] for row, col in enumerate(cells))
+        target = current + count
+        # Atualização conservadora: só sobe as células abaixo do novo mínimo
+        for row, col in enumerate(cells):
+            if self.table[row][col] < target:
+                self.table[row][col] = target
+        return target
+
+    def to_dict(self) -> Dict[str, Any]:
+        return {"width": self.width, "depth": self.depth, "table": self.table}
+
+    @classmethod
+    def from_dict(cls, data: Dict[str, Any]) -> "CountMinSketch":
+        return cls(width=data["width"], depth=data["depth"], table=data["table"])
+
+
+class SpaceSavingTopK:
+    """
+    Heavy hitters com capacidade fixa (space-saving sobre um min-heap)
+
+    Os contadores vêm do CountMinSketch: um item novo só entra no lugar do
+    menor candidato quando sua estimativa o supera.
+    """
+
+    def __init__(self, capacity: int, counters: Optional[Dict[str, int]] = None):
+        self.capacity = capacity
+        self.counters: Dict[str, int] = dict(counters or {})
+        # Heap com entradas "preguiçosas": valores desatualizados são descartados no topo
+        self._heap: List[Tuple[int, str]] = [(count, item) for item, count in self.counters.items()]
+        heapq.heapify(self._heap)
+
+    def _min_entry(self) -> Tuple[int, str]:
+        while self._heap:
+            count, item = self._heap[0]
+            if self.counters.get(item) == count:
+                return count, item
+            heapq.heappop(self._heap)
+        raise IndexError("heap vazio")
+
+    def offer(self, item: str, estimate: int) -> None:
+        """Registra a estimativa atual de um item"""
+        if item in self.counters:
+            if estimate > self.counters[item]:
+                self.counters[item] = estimate
+                heapq.heappush(self._heap, (estimate, item))
+            return
+
+        if len(self.counters) < self.capacity:
+            self.counters[item] = estimate
+            heapq.heappush(self._heap, (estimate, item))
+            return
+
+        min_count, min_item = self._min_entry()
+        if estimate > min_count:
+            heapq.heappop(self._heap)
+            del self.counters[min_item]
+            self.counters[item] = estimate
+            heapq.heappush(self._heap, (estimate, item))
+
+        # Compacta o heap se acumulou muitas entradas antigas
+        if len(self._heap) > 4 * self.capacity:
+            self._heap = [(count, key) for key, count in self.counters.items()]
+            heapq.heapify(self._heap)
+
+    def top(self, k: int) -> List[Tuple[str, int]]:
+        """K itens mais frequentes em ordem decrescente"""
+        return heapq.nlargest(k, self.counters.items(), key=lambda entry: (entry[1], entry[0]))
+
+
+class TextSketch:
+    """Resumo incremental de respostas de texto livre de uma pergunta"""
+
+    # Candidatos mantidos além do top-k exibido, para absorver erro de ranking
+    CANDIDATES_FACTOR = 4
+
+    def __init__(self, top_k: int = 10, data: Optional[Dict[str, Any]] = None):
+        data = data or {}
+        self.top_k = top_k
+        capacity = max(top_k * self.CANDIDATES_FACTOR, data.get("capacity", 0))
+        self.documents: int = data.get("documents", 0)
+        self.sketch = CountMinSketch.from_dict(data["sketch"]) if "sketch" in data else CountMinSketch()
+        self.terms = SpaceSavingTopK(capacity, data.get("terms"))
+        self.phrases = SpaceSavingTopK(capacity, data.get("phrases"))
+
+    def add_document(self, text: str) -> None:
+        """Processa uma resposta (frequência por documento, não por ocorrência)"""
+        tokens = tokenize(text)
+        if not tokens:
+            return
+        self.documents += 1
+
+        terms = {t for t in tokens if len(t) > 1 and t not in STOP_WORDS}
+        phrases = {
+            f"{first} {second}"
+            for first, second in zip(tokens, tokens[1:])
+            if first in terms and second in terms
+        }
+
+        for term in terms:
+            self.terms.offer(term, self.sketch.add(term))
+        for phrase in phrases:
+            self.phrases.offer(phrase, self.sketch.add(phrase))
+
+    def add_documents(self, texts: Iterable[str]) -> None:
+        for text in texts:
+            self.add_document(text)
+
+    def summary(self, k: Optional[int] = None) -> Dict[str, Any]:
+        """Resumo com tamanho limitado (k termos + k frases)"""
+        k = k or self.top_k
+        return {
+            "documents": self.documents,
+            "top_terms": [{"term": term, "count": count} for term, count in self.terms.top(k)],
+            "top_phrases": [{"phrase": phrase, "count": count} for phrase, count in self.phrases.top(k)],
+        }
+
+    def to_dict(self) -> Dict[str, Any]:
+        return {
+            "documents": self.documents,
+            "capacity": self.terms.capacity,
+            "sketch": self.sketch.to_dict(),
+            "terms": self.terms.counters,
+            "phrases": self.phrases.counters,
+        }
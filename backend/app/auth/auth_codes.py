@@ -1,20 +1,22 @@
+import hmac
 from typing import Dict, Any, Optional
 from datetime import datetime, timedelta
-import redis
-import json
+from app.auth.code_store import CodeStore, create_code_store
 from app.email.service import email_service
 
+# Validade e tentativas de cada código
+CODE_TTL_MINUTES = 10
+CODE_MAX_ATTEMPTS = 3
 
-# Redis para cache de códigos (ou use in-memory dict para desenvolvimento)
+
+# Códigos ficam no store configurado (memória local ou Redis compartilhado)
 class AuthCodeManager:
     """Gerenciador de códigos de autenticação"""
 
-    def __init__(self):
-        # Para desenvolvimento, usar dict em memória
-        # Em produção, usar Redis
-        self.codes_cache: Dict[str, Dict[str, Any]] = {}
+    def __init__(self, store: Optional[CodeStore] = None):
+        self.store = store or create_code_store()
 
-    def generate_and_send_code(
+    async def generate_and_send_code(
             self,
             email: str,
             form_id: str,
@@ -36,14 +38,12 @@ class AuthCodeManager:
             "form_id": form_id,
             "form_title": form_title,
             "created_at": datetime.utcnow().isoformat(),
-            "expires_at": (datetime.utcnow() + timedelta(minutes=10)).isoformat(),
-            "attempts": 0,
-            "max_attempts": 3,
-            "used": False
+            "expires_at": (datetime.utcnow() + timedelta(minutes=CODE_TTL_MINUTES)).isoformat(),
+            "max_attempts": CODE_MAX_ATTEMPTS
         }
 
-        # Salvar no cache (10 minutos)
-        self.codes_cache[cache_key] = code_data
+        # Salvar no store (substitui um código anterior do mesmo e-mail/formulário)
+        await self.store.set(cache_key, code_data, CODE_TTL_MINUTES * 60)
 
         # Enviar email
         email_result = email_service.send_auth_code(
@@ -51,19 +51,19 @@ class AuthCodeManager:
             to_name=user_name or "Usuário",
             auth_code=auth_code,
             form_title=form_title,
-            expires_in_minutes=10
+            expires_in_minutes=CODE_TTL_MINUTES
         )
 
         return {
             "success": True,
             "code_sent": email_result.get("success", False),
             "email": email,
-            "expires_in": 10,
+            "expires_in": CODE_TTL_MINUTES,
             "form_id": form_id,
             "cache_key": cache_key  # Para debug
         }
 
-    def verify_code(
+    async def verify_code(
             self,
             email: str,
             form_id: str,
@@ -72,7 +72,7 @@ class AuthCodeManager:
         """Verifica código submetido"""
 
         cache_key = f"auth_code:{form_id}:{email}"
-        code_data = self.codes_cache.get(cache_key)
+        code_data = await self.store.get(cache_key)
 
         if not code_data:
             return {
@@ -93,30 +93,39 @@ class AuthCodeManager:
         expires_at = datetime.fromisoformat(code_data["expires_at"])
         if datetime.utcnow() > expires_at:
             # Limpar código expirado
-            del self.codes_cache[cache_key]
+            await self.store.delete(cache_key)
             return {
                 "valid": False,
                 "reason": "code_expired",
                 "message": "Código expirado. Solicite um novo código."
             }
 
-        # Verificar tentativas
-        if code_data["attempts"] >= code_data["max_attempts"]:
-            del self.codes_cache[cache_key]
+        # Incrementar tentativas (atômico: requisições paralelas em réplicas diferentes contam todas)
+        attempts = await self.store.incr_attempts(cache_key)
+        if attempts is None:
+            return {
+                "valid": False,
+                "reason": "code_not_found",
+                "message": "Código não encontrado. Solicite um novo código."
+            }
+        max_attempts = code_data["max_attempts"]
+        if attempts > max_attempts:
+            await self.store.delete(cache_key)
             return {
                 "valid": False,
                 "reason": "max_attempts_exceeded",
                 "message": "Muitas tentativas. Solicite um novo código."
             }
 
-        # Incrementar tentativas
-        code_data["attempts"] += 1
-
         # Verificar código
-        if submitted_code == code_data["code"]:
-            # Marcar como usado
-            code_data["used"] = True
-            code_data["used_at"] = datetime.utcnow().isoformat()
+        if hmac.compare_digest(submitted_code.encode(), code_data["code"].encode()):
+            # Marcar como usado (somente a primeira verificação concorrente vence)
+            if not await self.store.mark_used(cache_key):
+                return {
+                    "valid": False,
+                    "reason": "code_already_used",
+                    "message": "Este código já foi utilizado."
+                }
 
             return {
                 "valid": True,
@@ -129,24 +138,17 @@ class AuthCodeManager:
             return {
                 "valid": False,
                 "reason": "invalid_code",
-                "message": f"Código incorreto. Tentativas restantes: {code_data['max_attempts'] - code_data['attempts']}",
-                "attempts_remaining": code_data["max_attempts"] - code_data["attempts"]
+                "message": f"Código incorreto. Tentativas restantes: {max_attempts - attempts}",
+                "attempts_remaining": max_attempts - attempts
             }
 
-    def cleanup_expired_codes(self):
-        """Limpa códigos expirados (executar periodicamente)"""
-        now = datetime.utcnow()
-        expired_keys = []
-
-        for key, data in self.codes_cache.items():
-            expires_at = datetime.fromisoformat(data["expires_at"])
-            if now > expires_at:
-                expired_keys.append(key)
-
-        for key in expired_keys:
-            del self.codes_cache[key]
+    async def cleanup_expired_codes(self):
+        """Limpa códigos expirados (no Redis o próprio TTL remove)"""
+        return await self.store.cleanup_expired()
 
-        return len(expired_keys)
+    async def close(self) -> None:
+        """Fecha as conexões do store (shutdown da aplicação)"""
+        await self.store.close()
 
 
 # Instance
@@ -0,0 +1,210 @@
+"""
+Armazenamento de Códigos de Autenticação - TTL Store
+===================================================
+
+Interface única para os códigos enviados por e-mail (AuthCodeManager), com
+dois backends selecionados por AUTH_CODE_STORE:
+
+- "memory": dict local limitado (AUTH_CODE_MAX_ENTRIES) com expiração por
+  min-heap (O(log n) por inserção/expiração, sem varrer todos os códigos) e
+  despejo LRU quando o limite é atingido; suficiente para uma única réplica
+- "redis": hash por código com TTL no próprio Redis (REDIS_URL), visível
+  por todas as réplicas atrás do load balancer; tentativas e uso do código
+  são atualizados atomicamente no servidor (HINCRBY/HSETNX via script).
+  Cliente redis.asyncio: as chamadas não bloqueiam o event loop
+
+Todos os métodos são corrotinas (mesma interface para os dois backends).
+
+Autor: Equipe de Desenvolvimento
+"""
+
+import heapq
+import itertools
+import time
+from abc import ABC, abstractmethod
+from collections import OrderedDict
+from typing import Any, Dict, List, Optional, Tuple
+
+from app.config import settings
+
+
+class CodeStore(ABC):
+    """Armazenamento chave -> dados do código, com expiração"""
+
+    @abstractmethod
+    async def set(self, key: str, data: Dict[str, Any], ttl_seconds: int) -> None:
+        """Grava (ou substitui) o código; tentativas começam em 0"""
+
+    @abstractmethod
+    async def get(self, key: str) -> Optional[Dict[str, Any]]:
+        """Dados do código, ou None se não existir ou tiver expirado"""
+
+    @abstractmethod
+    async def incr_attempts(self, key: str) -> Optional[int]:
+        """Incrementa as tentativas atomicamente e retorna o novo valor (None se não existir)"""
+
+    @abstractmethod
+    async def mark_used(self, key: str) -> bool:
+        """Marca o código como usado; False se já estava usado ou não existe"""
+
+    @abstractmethod
+    async def delete(self, key: str) -> None:
+        """Remove o código"""
+
+    async def cleanup_expired(self) -> int:
+        """Remove códigos expirados; backends com TTL nativo não precisam"""
+        return 0
+
+    async def close(self) -> None:
+        """Libera conexões do backend (shutdown da aplicação)"""
+
+
+class InMemoryCodeStore(CodeStore):
+    """Store local: LRU limitado com expiração por min-heap (remoção preguiçosa)"""
+
+    def __init__(self, max_entries: int):
+        self.max_entries = max_entries
+        # chave -> (expires_at, seq, dados)
+        self._entries: "OrderedDict[str, Tuple[float, int, Dict[str, Any]]]" = OrderedDict()
+        # (expires_at, seq, chave); itens cujo seq não bate com a entrada são obsoletos
+        self._expiry: List[Tuple[float, int, str]] = []
+        self._seq = itertools.count()
+        self.stats = {"evictions": 0, "expirations": 0}
+
+    async def set(self, key: str, data: Dict[str, Any], ttl_seconds: int) -> None:
+        await self.cleanup_expired()
+        expires_at = time.time() + ttl_seconds
+        seq = next(self._seq)
+        self._entries[key] = (expires_at, seq, dict(data, attempts=0, used=False))
+        self._entries.move_to_end(key)
+        heapq.heappush(self._expiry, (expires_at, seq, key))
+
+        while len(self._entries) > self.max_entries:
+            self._entries.popitem(last=False)
+            self.stats["evictions"] += 1
+
+        # Substituições e despejos deixam itens obsoletos no heap; compacta quando dominarem
+        if len(self._expiry) > 2 * len(self._entries) + 64:
+            self._expiry = [(e[0], e[1], k) for k, e in self._entries.items()]
+            heapq.heapify(self._expiry)
+
+    def _live(self, key: str) -> Optional[Dict[str, Any]]:
+        entry = self._entries.get(key)
+        if entry is None:
+            return None
+        if entry[0] <= time.time():
+            del self._entries[key]
+            self.stats["expirations"] += 1
+            return None
+        self._entries.move_to_end(key)
+        return entry[2]
+
+    async def get(self, key: str) -> Optional[Dict[str, Any]]:
+        data = self._live(key)
+        return dict(data) if data is not None else None
+
+    async def incr_attempts(self, key: str) -> Optional[int]:
+        data = self._live(key)
+        if data is None:
+            return None
+        data["attempts"] += 1
+        return data["attempts"]
+
+    async def mark_used(self, key: str) -> bool:
+        data = self._live(key)
+        if data is None or data["used"]:
+            return False
+        data["used"] = True
+        data["used_at"] = time.time()
+        return True
+
+    async def delete(self, key: str) -> None:
+        self._entries.pop(key, None)
+
+    async def cleanup_expired(self) -> int:
+        """Remove apenas os códigos vencidos do topo do heap (O(k log n))"""
+        now = time.time()
+        removed = 0
+        while self._expiry and self._expiry[0][0] <= now:
+            _, seq, key = heapq.heappop(self._expiry)
+            entry = self._entries.get(key)
+            if entry is not None and entry[1] == seq:
+                del self._entries[key]
+                removed += 1
+        self.stats["expirations"] += removed
+        return removed
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+
+# Só altera o hash se ele ainda existir (não recria sem TTL um código expirado)
+_INCR_ATTEMPTS_SCRIPT = """
+if redis.call('EXISTS', KEYS[1]) == 0 then return false end
+return redis.call('HINCRBY', KEYS[1], 'attempts', 1)
+"""
+
+_MARK_USED_SCRIPT = """
+if redis.call('EXISTS', KEYS[1]) == 0 then return 0 end
+return redis.call('HSETNX', KEYS[1], 'used_at', ARGV[1])
+"""
+
+
+class RedisCodeStore(CodeStore):
+    """Store compartilhado entre réplicas (qualquer servidor compatível com o protocolo Redis)"""
+
+    def __init__(self, url: str, prefix: str = "formerr:"):
+        try:
+            from redis import asyncio as redis
+        except ImportError as e:
+            raise RuntimeError("AUTH_CODE_STORE=redis requer o pacote 'redis' (pip install redis)") from e
+        self.prefix = prefix
+        self.client = redis.Redis.from_url(url, decode_responses=True)
+        self._incr_attempts = self.client.register_script(_INCR_ATTEMPTS_SCRIPT)
+        self._mark_used = self.client.register_script(_MARK_USED_SCRIPT)
+
+    def _key(self, key: str) -> str:
+        return self.prefix + key
+
+    async def set(self, key: str, data: Dict[str, Any], ttl_seconds: int) -> None:
+        redis_key = self._key(key)
+        fields = {name: str(value) for name, value in data.items() if value is not None}
+        fields["attempts"] = "0"
+        async with self.client.pipeline(transaction=True) as pipe:
+            pipe.delete(redis_key)
+            pipe.hset(redis_key, mapping=fields)
+            pipe.expire(redis_key, ttl_seconds)
+            await pipe.execute()
+
+    async def get(self, key: str) -> Optional[Dict[str, Any]]:
+        fields = await self.client.hgetall(self._key(key))
+        if not fields:
+            return None
+        data: Dict[str, Any] = dict(fields)
+        data["attempts"] = int(fields.get("attempts", 0))
+        if "max_attempts" in fields:
+            data["max_attempts"] = int(fields["max_attempts"])
+        data["used"] = "used_at" in fields
+        return data
+
+    async def incr_attempts(self, key: str) -> Optional[int]:
+        attempts = await self._incr_attempts(keys=[self._key(key)])
+        return int(attempts) if attempts is not None else None
+
+    async def mark_used(self, key: str) -> bool:
+        return await self._mark_used(keys=[self._key(key)], args=[time.time()]) == 1
+
+    async def delete(self, key: str) -> None:
+        await self.client.delete(self._key(key))
+
+    async def close(self) -> None:
+        await self.client.aclose()
+
+
+def create_code_store() -> CodeStore:
+    """Backend configurado em AUTH_CODE_STORE"""
+    if settings.AUTH_CODE_STORE == "redis":
+        return RedisCodeStore(settings.REDIS_URL)
+    if settings.AUTH_CODE_STORE != "memory":
+        raise ValueError(f"AUTH_CODE_STORE inválido: {settings.AUTH_CODE_STORE!r} (use 'memory' ou 'redis')")
+    return InMemoryCodeStore(settings.AUTH_CODE_MAX_ENTRIES)
@@ -0,0 +1,77 @@
+"""
+Cliente da API do GitHub - Callback OAuth
+========================================
+
+Um único httpx.AsyncClient por processo, aberto no startup e fechado no
+shutdown da API:
+
+- Pool keep-alive: logins seguidos reaproveitam a conexão TLS com
+  api.github.com em vez de um handshake por login
+- Timeouts explícitos (o GitHub lento não prende a requisição de callback)
+- /user e /user/emails buscados em paralelo (asyncio.gather)
+
+Sem requisições condicionais (ETag): o GitHub varia a resposta por
+Authorization e emite um token novo a cada login, então o callback nunca
+repetiria a chave de um cache.
+
+Autor: Equipe de Desenvolvimento
+"""
+
+import asyncio
+from typing import Any, Dict, List, Optional, Tuple
+
+import httpx
+
+GITHUB_API_URL = "https://api.github.com"
+
+
+class GitHubAPIError(Exception):
+    """Resposta inesperada da API do GitHub"""
+
+
+class GitHubClient:
+    """Cliente compartilhado da API do GitHub"""
+
+    def __init__(self, timeout: float = 10.0, max_connections: int = 50):
+        self.timeout = httpx.Timeout(timeout, connect=5.0)
+        self.limits = httpx.Limits(max_connections=max_connections, max_keepalive_connections=20)
+        self._client: Optional[httpx.AsyncClient] = None
+        self.stats = {"requests": 0}
+
+    def start(self) -> None:
+        if self._client is None:
+            self._client = httpx.AsyncClient(
+                base_url=GITHUB_API_URL,
+                timeout=self.timeout,
+                limits=self.limits,
+                headers={
+                    "Accept": "application/vnd.github+json",
+                    "X-GitHub-Api-Version": "2022-11-28",
+                    "User-Agent": "Formerr-API",
+                },
+            )
+
+    async def close(self) -> None:
+        if self._client is not None:
+            await self._client.aclose()
+            self._client = None
+
+    async def _get_json(self, path: str, access_token: str) -> Any:
+        self.start()
+        self.stats["requests"] += 1
+        response = await self._client.get(path, headers={"Authorization": f"Bearer {access_token}"})
+        if response.status_code != 200:
+            raise GitHubAPIError(f"GitHub {path} respondeu {response.status_code}")
+        return response.json()
+
+    async def fetch_user_and_emails(self, access_token: str) -> Tuple[Dict[str, Any], List[Dict[str, Any]]]:
+        """Perfil e e-mails do usuário, buscados em paralelo"""
+        user_data, emails = await asyncio.gather(
+            self._get_json("/user", access_token),
+            self._get_json("/user/emails", access_token),
+        )
+        return user_data, emails
+
+
+# Instances
+github_client = GitHubClient()
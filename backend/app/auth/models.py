@@ -78,4 +78,28 @@ ROLE_LIMITS: Dict[UserRole, Dict[str, int]] = {
         "max_questions_per_form": -1,
         "max_file_size_mb": 1000,
     }
-}
\ No newline at end of file
+}
+
+# Formato compacto do JWT: role como id numérico e permissões como bitmask.
+# Os valores ficam gravados em tokens já emitidos: novas roles/permissões
+# devem ser acrescentadas ao final, nunca reordenadas.
+ROLE_IDS: Dict[UserRole, int] = {
+    UserRole.FREE: 0,
+    UserRole.PRO: 1,
+    UserRole.ENTERPRISE: 2,
+    UserRole.ADMIN: 3,
+}
+ROLES_BY_ID: Dict[int, UserRole] = {role_id: role for role, role_id in ROLE_IDS.items()}
+
+PERMISSION_BITS: Dict[Permission, int] = {permission: 1 << index for index, permission in enumerate(Permission)}
+
+
+def permissions_to_mask(permissions: List[Permission]) -> int:
+    mask = 0
+    for permission in permissions:
+        mask |= PERMISSION_BITS[permission]
+    return mask
+
+
+def mask_to_permissions(mask: int) -> List[str]:
+    return [permission.value for permission, bit in PERMISSION_BITS.items() if mask & bit]
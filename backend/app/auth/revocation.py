@@ -0,0 +1,221 @@
+"""
+Revogação de Tokens - Gerações e Bloom Filter
+============================================
+
+Tokens duram JWT_EXPIRE_DAYS; para que logout e troca de role tenham efeito
+antes disso, sem consulta ao banco por requisição:
+
+- Geração por usuário: cada token carrega `gen` (users.token_generation no
+  login). Mudar role/is_active incrementa a geração (evento before_flush) e
+  grava uma linha em revoked_tokens; tokens com `gen` menor são recusados
+- Logout grava o `jti` do token em revoked_tokens
+- Cada réplica mantém em memória {github_id: geração mínima} e um Bloom
+  filter dos jtis revogados, sincronizados em background a cada
+  REVOCATION_SYNC_SECONDS (incremental por revoked_at, com sobreposição) e
+  reconstruídos a cada REVOCATION_REBUILD_SECONDS (descartando expirados)
+- Um hit do Bloom filter é confirmado no banco (falsos positivos ~0,1%)
+
+No caminho quente a verificação é uma busca em dict; o resultado do Bloom
+filter fica memorizado nas claims em cache até a próxima mudança no estado.
+
+Autor: Equipe de Desenvolvimento
+"""
+
+import asyncio
+import hashlib
+import logging
+import math
+from datetime import datetime, timedelta
+from typing import Any, Dict, Optional
+
+from sqlalchemy import delete, event, inspect, select
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.orm import Session
+
+from app.config import settings
+from app.database.connection import AsyncSessionLocal, session_factories
+from app.database.models import RevokedToken, User
+
+logger = logging.getLogger(__name__)
+
+# Taxa de falsos positivos do Bloom filter
+BLOOM_ERROR_RATE = 0.001
+
+# Sobreposição da sincronização incremental (transações que commitam fora de ordem)
+SYNC_OVERLAP_SECONDS = 60
+
+
+class BloomFilter:
+    """Bloom filter com double hashing sobre blake2b"""
+
+    def __init__(self, capacity: int, error_rate: float = BLOOM_ERROR_RATE):
+        capacity = max(capacity, 1)
+        self.size = max(8, int(-capacity * math.log(error_rate) / math.log(2) ** 2))
+        self.hashes = max(1, round(self.size / capacity * math.log(2)))
+        self._bits = bytearray((self.size + 7) // 8)
+        self.count = 0
+
+    def _positions(self, item: str):
+        digest = hashlib.blake2b(item.encode(), digest_size=16).digest()
+        h1 = int.from_bytes(digest[:8], "little")
+        h2 = int.from_bytes(digest[8:], "little") | 1
+        return ((h1 + i * h2) % self.size for i in range(self.hashes))
+
+    def add(self, item: str) -> None:
+        for position in self._positions(item):
+            self._bits[position >> 3] |= 1 << (position & 7)
+        self.count += 1
+
+    def __contains__(self, item: str) -> bool:
+        return all(self._bits[position >> 3] & (1 << (position & 7)) for position in self._positions(item))
+
+
+class RevocationRegistry:
+    """Estado de revogação local da réplica"""
+
+    def __init__(self, capacity: int):
+        self.capacity = capacity
+        self.generations: Dict[int, int] = {}
+        self.bloom = BloomFilter(capacity)
+        # Incrementa a cada mudança; claims verificadas nesta versão não precisam do Bloom de novo
+        self.version = 0
+        self._synced_until: Optional[datetime] = None
+        self._task: Optional["asyncio.Task[None]"] = None
+        self.stats = {"stale_generation": 0, "bloom_hits": 0, "bloom_false_positives": 0, "revoked": 0}
+
+    # ---------- caminho quente ----------
+
+    async def is_revoked(self, claims: Dict[str, Any]) -> bool:
+        """True se o token foi revogado (logout) ou é de uma geração anterior"""
+        if claims.get("gen", 0) < self.generations.get(claims.get("github_id"), 0):
+            self.stats["stale_generation"] += 1
+            return True
+        if claims.get("_revocation_version") == self.version:
+            return False
+
+        jti = claims.get("jti")
+        if jti and jti in self.bloom:
+            self.stats["bloom_hits"] += 1
+            if await self._confirm(jti):
+                self.stats["revoked"] += 1
+                return True
+            self.stats["bloom_false_positives"] += 1
+        claims["_revocation_version"] = self.version
+        return False
+
+    @staticmethod
+    async def _confirm(jti: str) -> bool:
+        async with AsyncSessionLocal() as db:
+            return await db.scalar(select(RevokedToken.id).where(RevokedToken.jti == jti)) is not None
+
+    # ---------- escrita ----------
+
+    async def revoke_token(self, db: AsyncSession, claims: Dict[str, Any]) -> None:
+        """Revoga um token individual (commit fica a cargo do chamador)"""
+        jti = claims.get("jti")
+        if not jti:
+            return
+        exp = claims.get("exp")
+        expires_at = datetime.utcfromtimestamp(exp) if exp else datetime.utcnow() + timedelta(days=settings.JWT_EXPIRE_DAYS)
+        exists = await db.scalar(select(RevokedToken.id).where(RevokedToken.jti == jti))
+        if exists is None:
+            db.add(RevokedToken(jti=jti, github_id=claims.get("github_id"), expires_at=expires_at))
+        self._add_jti(jti)
+
+    def _add_jti(self, jti: str) -> None:
+        if jti not in self.bloom:
+            self.bloom.add(jti)
+            self.version += 1
+
+    def _add_generation(self, github_id: int, generation: int) -> None:
+        if generation > self.generations.get(github_id, 0):
+            self.generations[github_id] = generation
+            self.version += 1
+
+    # ---------- sincronização ----------
+
+    async def sync(self) -> None:
+        """Aplica revogações gravadas por qualquer réplica desde a última sincronização"""
+        started = datetime.utcnow()
+        since = self._synced_until - timedelta(seconds=SYNC_OVERLAP_SECONDS) if self._synced_until else None
+        async with session_factories["background"]() as db:
+            query = select(RevokedToken.jti, RevokedToken.github_id, RevokedToken.generation).where(
+                RevokedToken.expires_at > started
+            )
+            if since is not None:
+                query = query.where(RevokedToken.revoked_at >= since)
+            for row in await db.execute(query):
+                if row.jti:
+                    self._add_jti(row.jti)
+                if row.generation is not None and row.github_id is not None:
+                    self._add_generation(row.github_id, row.generation)
+        self._synced_until = started
+
+    async def rebuild(self) -> None:
+        """Recria o estado só com revogações vigentes e remove as expiradas do banco"""
+        now = datetime.utcnow()
+        async with session_factories["background"]() as db:
+            await db.execute(delete(RevokedToken).where(RevokedToken.expires_at <= now))
+            await db.commit()
+            rows = (await db.execute(
+                select(RevokedToken.jti, RevokedToken.github_id, RevokedToken.generation)
+            )).all()
+
+        jtis = [row.jti for row in rows if row.jti]
+        bloom = BloomFilter(max(self.capacity, 2 * len(jtis)))
+        for jti in jtis:
+            bloom.add(jti)
+        generations: Dict[int, int] = {}
+        for row in rows:
+            if row.generation is not None and row.github_id is not None:
+                generations[row.github_id] = max(row.generation, generations.get(row.github_id, 0))
+
+        self.bloom, self.generations = bloom, generations
+        self.version += 1
+        self._synced_until = now
+
+    def start(self) -> None:
+        self._task = asyncio.create_task(self._run())
+
+    async def stop(self) -> None:
+        if self._task is not None:
+            self._task.cancel()
+            await asyncio.gather(self._task, return_exceptions=True)
+            self._task = None
+
+    async def _run(self) -> None:
+        last_rebuild = None
+        while True:
+            try:
+                now = asyncio.get_running_loop().time()
+                if last_rebuild is None or now - last_rebuild >= settings.REVOCATION_REBUILD_SECONDS:
+                    await self.rebuild()
+                    last_rebuild = now
+                else:
+                    await self.sync()
+            except asyncio.CancelledError:
+                raise
+            except Exception as e:
+                logger.error(f"Falha ao sincronizar revogações de token: {e}")
+            await asyncio.sleep(settings.REVOCATION_SYNC_SECONDS)
+
+
+@event.listens_for(Session, "before_flush")
+def _bump_token_generation(session: Session, flush_context, instances) -> None:
+    """Troca de role ou desativação invalida os tokens já emitidos do usuário"""
+    for obj in session.dirty:
+        if not isinstance(obj, User):
+            continue
+        state = inspect(obj)
+        if not (state.attrs.role.history.has_changes() or state.attrs.is_active.history.has_changes()):
+            continue
+        obj.token_generation = (obj.token_generation or 0) + 1
+        session.add(RevokedToken(
+            github_id=obj.github_id,
+            generation=obj.token_generation,
+            expires_at=datetime.utcnow() + timedelta(days=settings.JWT_EXPIRE_DAYS),
+        ))
+
+
+# Instances
+revocation_registry = RevocationRegistry(settings.REVOCATION_BLOOM_CAPACITY)
@@ -18,17 +18,19 @@ Autor: Equipe de Desenvolvimento
 """
 
 from typing import Dict, Any
-import httpx
 from datetime import datetime
-from fastapi import APIRouter, Depends, Request
+from fastapi import APIRouter, Depends, HTTPException, Request
 from fastapi.responses import RedirectResponse
 from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy import select
 from authlib.integrations.starlette_client import OAuth
 from app.config import settings
-from app.auth.service import create_jwt_token, create_user_payload
+from app.auth.github import github_client
+from app.auth.service import create_jwt_token, create_user_payload, verify_jwt_token
+from app.auth.revocation import revocation_registry
+from app.auth.token_cache import token_cache
 from app.auth.models import UserRole
-from app.dependencies import get_current_user
+from app.dependencies import get_current_user, resolve_user_id
 from app.database.connection import get_db
 from app.database.models import User
 
@@ -74,21 +76,8 @@ async def github_callback(request: Request, db: AsyncSession = Depends(get_db)):
         # Get access token
         token = await oauth.github.authorize_access_token(request)
 
-        # Fetch user data from GitHub API
-        async with httpx.AsyncClient() as client:
-            # Get user info
-            user_response = await client.get(
-                'https://api.github.com/user',
-                headers={'Authorization': f'token {token["access_token"]}'}
-            )
-            user_data = user_response.json()
-
-            # Get user emails
-            email_response = await client.get(
-                'https://api.github.com/user/emails',
-                headers={'Authorization': f'token {token["access_token"]}'}
-            )
-            emails = email_response.json()
+        # Fetch user data and emails from GitHub API (in parallel, pooled client)
+        user_data, emails = await github_client.fetch_user_and_emails(token["access_token"])
 
         # Find primary email
         primary_email = next(
@@ -102,15 +91,22 @@ async def github_callback(request: Request, db: AsyncSession = Depends(get_db)):
         existing_user = result.scalar_one_or_none()
 
         if existing_user:
-            # Update existing user
-            existing_user.username = user_data["login"]
-            existing_user.name = user_data.get("name") or user_data["login"]
-            existing_user.email = primary_email or user_data.get("email")
-            existing_user.avatar_url = user_data["avatar_url"]
-            existing_user.github_url = user_data["html_url"]
-            existing_user.updated_at = datetime.utcnow()
-            await db.commit()
-            print(f"✅ User updated: {existing_user.username}")
+            # Update existing user only if the GitHub profile changed
+            profile = {
+                "username": user_data["login"],
+                "name": user_data.get("name") or user_data["login"],
+                "email": primary_email or user_data.get("email"),
+                "avatar_url": user_data["avatar_url"],
+                "github_url": user_data["html_url"],
+            }
+            changed = {field: value for field, value in profile.items() if getattr(existing_user, field) != value}
+            if changed:
+                for field, value in changed.items():
+                    setattr(existing_user, field, value)
+                existing_user.updated_at = datetime.utcnow()
+                await db.commit()
+                print(f"✅ User updated: {existing_user.username} ({', '.join(changed)})")
+            user_id, user_role, generation = existing_user.id, existing_user.role, existing_user.token_generation
         else:
             # Create new user
             new_user = User(
@@ -127,10 +123,11 @@ async def github_callback(request: Request, db: AsyncSession = Depends(get_db)):
             )
             db.add(new_user)
             await db.commit()
+            user_id, user_role, generation = new_user.id, new_user.role, new_user.token_generation
             print(f"✅ New user created: {new_user.username}")
 
         # Create JWT payload and token
-        jwt_payload = create_user_payload(user_data, primary_email)
+        jwt_payload = create_user_payload(user_data, user_role, user_id=user_id, token_generation=generation or 0)
         jwt_token = create_jwt_token(jwt_payload)
 
         # Redirect to frontend with token
@@ -148,10 +145,30 @@ async def github_callback(request: Request, db: AsyncSession = Depends(get_db)):
 
 
 @router.get("/me")
-async def get_current_user_info(current_user: Dict[str, Any] = Depends(get_current_user)):
-    """Retorna informações do usuário autenticado"""
+async def get_current_user_info(
+    current_user: Dict[str, Any] = Depends(get_current_user),
+    db: AsyncSession = Depends(get_db)
+):
+    """Retorna informações do usuário autenticado (perfil do banco + role/permissões do token)"""
+    user = await db.get(User, await resolve_user_id(db, current_user))
+    if user is None:
+        raise HTTPException(status_code=404, detail="Usuário não encontrado")
+    profile = {
+        "github_id": user.github_id,
+        "username": user.username,
+        "name": user.name or user.username,
+        "email": user.email,
+        "avatar_url": user.avatar_url,
+        "github_url": user.github_url,
+        "role": current_user.get("role"),
+        "permissions": current_user.get("permissions", []),
+        "limits": current_user.get("limits", {}),
+        "created_at": current_user.get("created_at"),
+        "user_type": "github_user",
+        "is_admin": current_user.get("is_admin", False),
+    }
     return {
-        "user": current_user,
+        "user": profile,
         "authenticated": True,
         "session_time": current_user.get("created_at"),
         "github_profile": f"https://github.com/{current_user.get('username')}",
@@ -160,8 +177,16 @@ async def get_current_user_info(current_user: Dict[str, Any] = Depends(get_curre
 
 
 @router.post("/logout")
-async def logout():
-    """Logout endpoint"""
+async def logout(request: Request, db: AsyncSession = Depends(get_db)):
+    """Logout endpoint - revoga o token enviado no header Authorization (em todas as réplicas)"""
+    auth_header = request.headers.get("authorization")
+    if auth_header and auth_header.startswith("Bearer "):
+        token = auth_header.split(" ")[1]
+        claims = verify_jwt_token(token)
+        if claims:
+            await revocation_registry.revoke_token(db, claims)
+            await db.commit()
+            token_cache.revoke(token, claims.get("exp"))
     return {
         "message": "Logout realizado com sucesso",
         "action": "remove_token_from_frontend"
@@ -172,7 +197,7 @@ async def logout():
 async def test_auth(current_user: Dict[str, Any] = Depends(get_current_user)):
     """Test protected endpoint"""
     return {
-        "message": f"🎉 Olá {current_user['name']}! Auth funcionando!",
+        "message": f"🎉 Olá {current_user.get('name') or current_user['username']}! Auth funcionando!",
         "user": current_user["username"],
         "github_id": current_user["github_id"],
         "domain": "auth",
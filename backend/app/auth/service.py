@@ -1,10 +1,17 @@
 # app/auth/service.py - BEAST MODE AUTH
 import jwt
+import secrets
 from jwt.exceptions import ExpiredSignatureError, InvalidTokenError
 from datetime import datetime, timedelta
 from typing import Dict, Any, Optional, List
 from app.config import settings
-from app.auth.models import UserRole, Permission, ROLE_PERMISSIONS, ROLE_LIMITS
+from app.auth.models import (
+    UserRole, Permission, ROLE_PERMISSIONS, ROLE_LIMITS, ROLE_IDS, ROLES_BY_ID, PERMISSION_BITS,
+    permissions_to_mask, mask_to_permissions
+)
+
+# Versão do formato compacto de claims (tokens sem "ver" são do formato antigo)
+TOKEN_VERSION = 2
 
 
 def create_jwt_token(user_data: Dict[str, Any]) -> str:
@@ -12,6 +19,7 @@ def create_jwt_token(user_data: Dict[str, Any]) -> str:
     to_encode = user_data.copy()
     expire = datetime.utcnow() + timedelta(days=settings.JWT_EXPIRE_DAYS)
     to_encode.update({
+        "jti": secrets.token_urlsafe(12),
         "exp": expire,
         "iat": datetime.utcnow(),
         "iss": f"{settings.APP_NAME}-{settings.DEVELOPER}"
@@ -19,15 +27,43 @@ def create_jwt_token(user_data: Dict[str, Any]) -> str:
     return jwt.encode(to_encode, settings.JWT_SECRET, algorithm=settings.JWT_ALGORITHM)
 
 
+def expand_claims(payload: Dict[str, Any]) -> Dict[str, Any]:
+    """
+    Expande as claims compactas (ver 2) para o formato usado pela aplicação
+
+    Permissões vêm do bitmask e os limites de ROLE_LIMITS pela role; tokens
+    do formato antigo já trazem tudo e são devolvidos como estão.
+    """
+    if payload.get("ver") != TOKEN_VERSION:
+        return payload
+    role = ROLES_BY_ID.get(payload.get("rid"), UserRole.FREE)
+    mask = payload.get("prm", 0)
+    return {
+        "uid": payload.get("uid"),
+        "github_id": payload["gid"],
+        "username": payload["usr"],
+        "role": role.value,
+        "permissions": mask_to_permissions(mask),
+        "permission_mask": mask,
+        "limits": dict(ROLE_LIMITS.get(role, {})),
+        "is_admin": payload["usr"] == "admin",
+        "gen": payload.get("gen", 0),
+        "jti": payload.get("jti"),
+        "created_at": datetime.utcfromtimestamp(payload["iat"]).isoformat() if "iat" in payload else None,
+        "exp": payload.get("exp"),
+        "ver": TOKEN_VERSION,
+    }
+
+
 def verify_jwt_token(token: str) -> Optional[Dict[str, Any]]:
-    """Verifica e decodifica JWT token"""
+    """Verifica e decodifica JWT token (claims já expandidas)"""
     try:
         payload = jwt.decode(
             token,
             settings.JWT_SECRET,
             algorithms=[settings.JWT_ALGORITHM]
         )
-        return payload
+        return expand_claims(payload)
     except ExpiredSignatureError:
         print("🚨 JWT Token expirado")
         return None
@@ -39,35 +75,36 @@ def verify_jwt_token(token: str) -> Optional[Dict[str, Any]]:
         return None
 
 
-def create_user_payload(github_user: Dict[str, Any], primary_email: str, user_role: UserRole = UserRole.FREE) -> Dict[
-    str, Any]:
-    """Cria payload do usuário para JWT com role info"""
+def create_user_payload(github_user: Dict[str, Any], user_role: UserRole = UserRole.FREE,
+                        user_id: Optional[int] = None, token_generation: int = 0) -> Dict[str, Any]:
+    """
+    Cria payload compacto do usuário para JWT
+
+    Apenas identidade + role id + bitmask de permissões; limites e perfil
+    (nome, e-mail, avatar) são resolvidos no servidor (ver expand_claims e
+    /auth/me). uid = users.id, evita lookup por github_id; gen =
+    users.token_generation (ver app/auth/revocation.py).
+    """
     permissions = ROLE_PERMISSIONS.get(user_role, [])
-    limits = ROLE_LIMITS.get(user_role, {})
 
     return {
-        "github_id": github_user["id"],
-        "username": github_user["login"],
-        "name": github_user.get("name") or github_user["login"],
-        "email": primary_email or github_user.get("email"),
-        "avatar_url": github_user["avatar_url"],
-        "github_url": github_user["html_url"],
+        "ver": TOKEN_VERSION,
+        "uid": user_id,
+        "gid": github_user["id"],
+        "usr": github_user["login"],
+        "gen": token_generation,
 
         # 🔥 BEAST MODE: Role & Permissions
-        "role": user_role.value,
-        "permissions": [p.value for p in permissions],
-        "limits": limits,
-
-        # Metadata
-        "created_at": datetime.utcnow().isoformat(),
-        "user_type": "github_user",
-        "sprint_version": "formerr_platform_2025",
-        "is_admin": github_user["login"] == "admin"
+        "rid": ROLE_IDS[user_role],
+        "prm": permissions_to_mask(permissions),
     }
 
 
 def check_permission(user_data: Dict[str, Any], required_permission: Permission) -> bool:
     """Verifica se usuário tem permissão específica"""
+    mask = user_data.get("permission_mask")
+    if mask is not None:
+        return bool(mask & PERMISSION_BITS[required_permission])
     user_permissions = user_data.get("permissions", [])
     return required_permission.value in user_permissions
 
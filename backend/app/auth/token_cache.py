@@ -0,0 +1,95 @@
+"""
+Cache de Tokens Verificados - JWT
+================================
+
+Evita repetir a verificação HMAC e o parse das claims do mesmo token a cada
+requisição (o dashboard faz dezenas de chamadas por página):
+
+- LRU limitado (JWT_CACHE_MAX_ENTRIES) com as claims já decodificadas,
+  válidas até o `exp` do próprio token
+- Chave: a assinatura HMAC-SHA256 do token (o último segmento), que já é um
+  digest do header + payload; o token completo é comparado no hit para que
+  uma assinatura reaproveitada com outro payload nunca case
+- Revogação (logout) consultada em todo hit; tokens revogados ficam na lista
+  até expirarem
+- Métricas: hits, misses, evictions, revoked_hits
+
+Um hit é uma busca em dict + comparação de string (sub-microssegundo); o
+miss paga o jwt.decode completo uma vez por token.
+
+Autor: Equipe de Desenvolvimento
+"""
+
+import time
+from collections import OrderedDict
+from typing import Any, Dict, Optional, Tuple
+
+from app.config import settings
+
+
+def token_key(token: str) -> str:
+    """Chave do token no cache (assinatura HMAC)"""
+    return token.rpartition(".")[2]
+
+
+class VerifiedTokenCache:
+    """LRU de claims de tokens já verificados, com lista de revogação"""
+
+    # Varredura dos revogados expirados a cada N revogações
+    REVOKED_SWEEP_INTERVAL = 1000
+
+    def __init__(self, max_entries: int):
+        self.max_entries = max_entries
+        self._entries: "OrderedDict[str, Tuple[str, float, Dict[str, Any]]]" = OrderedDict()
+        self._revoked: Dict[str, float] = {}
+        self.stats = {"hits": 0, "misses": 0, "evictions": 0, "revoked_hits": 0}
+
+    def get(self, token: str) -> Optional[Dict[str, Any]]:
+        """Claims do token se estiver em cache, válido e não revogado"""
+        key = token_key(token)
+        entry = self._entries.get(key)
+        if entry is None or entry[0] != token:
+            self.stats["misses"] += 1
+            return None
+        if key in self._revoked:
+            self.stats["revoked_hits"] += 1
+            del self._entries[key]
+            return None
+        if entry[1] <= time.time():
+            del self._entries[key]
+            self.stats["misses"] += 1
+            return None
+        self._entries.move_to_end(key)
+        self.stats["hits"] += 1
+        return entry[2]
+
+    def put(self, token: str, claims: Dict[str, Any]) -> None:
+        """Guarda as claims de um token recém-verificado (até o seu exp)"""
+        exp = claims.get("exp")
+        if exp is None:
+            return
+        key = token_key(token)
+        self._entries[key] = (token, float(exp), claims)
+        self._entries.move_to_end(key)
+        while len(self._entries) > self.max_entries:
+            self._entries.popitem(last=False)
+            self.stats["evictions"] += 1
+
+    def is_revoked(self, token: str) -> bool:
+        return token_key(token) in self._revoked
+
+    def revoke(self, token: str, exp: Optional[float]) -> None:
+        """Revoga o token até o seu exp"""
+        key = token_key(token)
+        self._revoked[key] = float(exp) if exp is not None else time.time() + settings.JWT_EXPIRE_DAYS * 86400
+        self._entries.pop(key, None)
+        if len(self._revoked) % self.REVOKED_SWEEP_INTERVAL == 0:
+            now = time.time()
+            self._revoked = {k: e for k, e in self._revoked.items() if e > now}
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+
+# Instances
+token_cache = VerifiedTokenCache(settings.JWT_CACHE_MAX_ENTRIES)
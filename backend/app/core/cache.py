@@ -0,0 +1,180 @@
+"""
+Cache de Resultados - Analytics e Dashboard
+==========================================
+
+Cache em memória para payloads caros de recalcular (analytics do formulário,
+estatísticas do dashboard), com:
+
+- Watermark: cada entrada guarda o watermark (ex: total de respostas do
+  formulário) do momento do cálculo; se o watermark atual for diferente,
+  a entrada é considerada desatualizada
+- Stale-while-revalidate: entradas desatualizadas (dentro da janela de
+  stale) são servidas imediatamente enquanto uma task em background recalcula
+- Single-flight: N requisições concorrentes para a mesma chave disparam
+  um único cálculo
+- Frescor configurável por role do usuário
+
+Também oferece TTLCache, um LRU simples com expiração para mapas pequenos
+e quentes (ex: metadados das perguntas de um formulário).
+
+Autor: Equipe de Desenvolvimento
+"""
+
+import asyncio
+import logging
+import time
+from collections import OrderedDict
+from dataclasses import dataclass
+from typing import Any, Awaitable, Callable, Dict, Hashable, Optional, Tuple
+
+from app.config import settings
+
+logger = logging.getLogger(__name__)
+
+Loader = Callable[[], Awaitable[Any]]
+
+
+@dataclass
+class _CacheEntry:
+    value: Any
+    watermark: Any
+    computed_at: float
+    stale: bool = False
+
+
+class ResultCache:
+    """Cache LRU com watermark, stale-while-revalidate e single-flight"""
+
+    def __init__(self, name: str, max_entries: int = 1024):
+        self.name = name
+        self.max_entries = max_entries
+        self._entries: "OrderedDict[Hashable, _CacheEntry]" = OrderedDict()
+        self._inflight: Dict[Hashable, "asyncio.Task[Any]"] = {}
+        self.stats = {"hits": 0, "stale_hits": 0, "misses": 0, "refreshes": 0}
+
+    async def get_or_compute(
+            self,
+            key: Hashable,
+            watermark: Any,
+            loader: Loader,
+            fresh_for: float,
+            stale_for: Optional[float] = None
+    ) -> Any:
+        """
+        Retorna o valor em cache ou calcula com `loader`
+
+        Args:
+            key: Chave do payload (ex: ("form", form_id))
+            watermark: Versão atual dos dados de origem
+            loader: Corrotina sem argumentos que calcula o payload
+                (deve abrir sua própria sessão de banco, pois pode rodar em background)
+            fresh_for: Segundos em que a entrada é servida sem recalcular
+            stale_for: Segundos adicionais em que a entrada ainda pode ser servida
+                enquanto é recalculada em background
+        """
+        stale_for = settings.ANALYTICS_CACHE_STALE_SECONDS if stale_for is None else stale_for
+        entry = self._entries.get(key)
+
+        if entry is not None:
+            self._entries.move_to_end(key)
+            age = time.monotonic() - entry.computed_at
+            up_to_date = not entry.stale and entry.watermark == watermark
+
+            if up_to_date and age <= fresh_for:
+                self.stats["hits"] += 1
+                return entry.value
+
+            if age <= fresh_for + stale_for:
+                self.stats["stale_hits"] += 1
+                self._start_flight(key, watermark, loader)
+                return entry.value
+
+        self.stats["misses"] += 1
+        return await asyncio.shield(self._start_flight(key, watermark, loader))
+
+    def invalidate(self, key: Hashable) -> None:
+        """Marca a entrada como desatualizada (continua servível como stale)"""
+        entry = self._entries.get(key)
+        if entry is not None:
+            entry.stale = True
+
+    def _start_flight(self, key: Hashable, watermark: Any, loader: Loader) -> "asyncio.Task[Any]":
+        task = self._inflight.get(key)
+        if task is None:
+            self.stats["refreshes"] += 1
+            task = asyncio.create_task(self._compute(key, watermark, loader))
+            # Recalculos em background já logam a falha; evita "exception never retrieved"
+            task.add_done_callback(lambda t: t.cancelled() or t.exception())
+            self._inflight[key] = task
+        return task
+
+    async def _compute(self, key: Hashable, watermark: Any, loader: Loader) -> Any:
+        try:
+            value = await loader()
+            self._entries[key] = _CacheEntry(value=value, watermark=watermark, computed_at=time.monotonic())
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+            return value
+        except Exception as e:
+            logger.warning(f"Falha ao recalcular cache '{self.name}' para {key!r}: {e}")
+            raise
+        finally:
+            self._inflight.pop(key, None)
+
+
+class TTLCache:
+    """LRU em memória com expiração por entrada e invalidação explícita"""
+
+    def __init__(self, name: str, ttl: float, max_entries: int = 1024):
+        self.name = name
+        self.ttl = ttl
+        self.max_entries = max_entries
+        self._entries: "OrderedDict[Hashable, Tuple[float, Any]]" = OrderedDict()
+        self.stats = {"hits": 0, "misses": 0, "evictions": 0}
+
+    def get(self, key: Hashable, default: Any = None) -> Any:
+        entry = self._entries.get(key)
+        if entry is None or entry[0] < time.monotonic():
+            if entry is not None:
+                del self._entries[key]
+            self.stats["misses"] += 1
+            return default
+        self._entries.move_to_end(key)
+        self.stats["hits"] += 1
+        return entry[1]
+
+    def set(self, key: Hashable, value: Any, ttl: Optional[float] = None) -> None:
+        self._entries[key] = (time.monotonic() + (self.ttl if ttl is None else ttl), value)
+        self._entries.move_to_end(key)
+        while len(self._entries) > self.max_entries:
+            self._entries.popitem(last=False)
+            self.stats["evictions"] += 1
+
+    def invalidate(self, key: Hashable) -> None:
+        self._entries.pop(key, None)
+
+    def clear(self) -> None:
+        self._entries.clear()
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+
+def freshness_for(user: Dict[str, Any]) -> float:
+    """Segundos de frescor do cache para o role do usuário"""
+    freshness = settings.ANALYTICS_CACHE_FRESHNESS
+    return freshness.get(user.get("role", "free"), freshness.get("free", 60))
+
+
+# Instances
+analytics_cache = ResultCache("analytics")
+
+# form_id -> {question_id: (title, type)}; invalidado ao editar seções/perguntas
+question_metadata_cache = TTLCache("question_metadata", ttl=300)
+
+# github_id -> users.id (não muda enquanto o usuário existir)
+user_id_cache = TTLCache("user_id", ttl=3600, max_entries=10000)
+
+# form_id -> users.id do dono; invalidado ao remover/transferir o formulário
+form_owner_cache = TTLCache("form_owner", ttl=600, max_entries=50000)
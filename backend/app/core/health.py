@@ -0,0 +1,178 @@
+"""
+Health e Readiness - Estado Atualizado em Background
+===================================================
+
+As probes do Kubernetes não fazem I/O: leem o estado mantido por tarefas
+em background.
+
+- /health/live: o processo responde (sem I/O; falha só se o event loop travar)
+- /health/ready: 503 quando o pod não deve receber tráfego:
+  - banco inacessível (SELECT 1 a cada HEALTH_CHECK_SECONDS, numa conexão
+    própria fora dos pools das rotas) ou verificação atrasada
+  - pools submit/interactive acima de HEALTH_MAX_POOL_UTILIZATION
+  - event loop atrasado (média da janela) acima de HEALTH_MAX_LOOP_LAG_SECONDS
+  - fila de e-mail acima de HEALTH_MAX_QUEUE_UTILIZATION da capacidade
+  - shutdown em andamento: o SIGTERM marca o pod como drenando e só repassa
+    o encerramento ao uvicorn após HEALTH_DRAIN_SECONDS, período em que as
+    requisições continuam sendo atendidas e a probe já responde 503
+
+Um pod sobrecarregado sai do balanceamento e volta sozinho quando alivia, em
+vez de ser reiniciado ou de receber mais requisições.
+
+Autor: Equipe de Desenvolvimento
+"""
+
+import asyncio
+import logging
+import os
+import signal
+import time
+from collections import deque
+from typing import Any, Dict, List, Optional, Tuple
+
+from sqlalchemy import text
+
+from app.config import settings
+from app.database.connection import health_engine, pool_stats
+from app.email.queue import email_queue
+
+logger = logging.getLogger(__name__)
+
+# Pools que atendem as rotas síncronas do usuário; analytics/background têm espera própria
+READINESS_POOLS = ("submit", "interactive")
+
+# Amostragem do atraso do event loop: intervalo e tamanho da janela (4s)
+LOOP_LAG_INTERVAL_SECONDS = 0.25
+LOOP_LAG_WINDOW = 16
+
+
+class HealthMonitor:
+    """Estado de saúde do processo, atualizado em background"""
+
+    def __init__(self):
+        self.started_at = time.monotonic()
+        self.draining = False
+        self.db_ok = False
+        self.db_latency_ms: Optional[float] = None
+        self.db_error: Optional[str] = None
+        self.db_checked_at: Optional[float] = None
+        self._loop_lags: "deque[float]" = deque(maxlen=LOOP_LAG_WINDOW)
+        self._tasks: List["asyncio.Task[None]"] = []
+
+    @property
+    def loop_lag_seconds(self) -> float:
+        return sum(self._loop_lags) / len(self._loop_lags) if self._loop_lags else 0.0
+
+    async def check_db(self) -> None:
+        started = time.monotonic()
+        try:
+            async with health_engine.connect() as conn:
+                await asyncio.wait_for(conn.execute(text("SELECT 1")), timeout=settings.HEALTH_DB_TIMEOUT_SECONDS)
+            self.db_latency_ms = round((time.monotonic() - started) * 1000, 2)
+            self.db_error = None
+            if not self.db_ok:
+                logger.info("Banco de dados acessível")
+            self.db_ok = True
+        except Exception as e:
+            self.db_error = str(e) or type(e).__name__
+            if self.db_ok:
+                logger.warning(f"Banco de dados inacessível: {self.db_error}")
+            self.db_ok = False
+        self.db_checked_at = time.monotonic()
+
+    def readiness(self) -> Tuple[bool, Dict[str, Any]]:
+        """(pronto, detalhes) a partir do estado em memória"""
+        reasons = []
+        if self.draining:
+            reasons.append("shutdown em andamento")
+
+        checked_ago = time.monotonic() - self.db_checked_at if self.db_checked_at is not None else None
+        if not self.db_ok:
+            reasons.append("banco de dados inacessível")
+        elif checked_ago is None or checked_ago > 3 * settings.HEALTH_CHECK_SECONDS:
+            reasons.append("verificação do banco atrasada")
+
+        pools = pool_stats()
+        for name in READINESS_POOLS:
+            if pools[name]["utilization"] >= settings.HEALTH_MAX_POOL_UTILIZATION:
+                reasons.append(f"pool {name} saturado")
+
+        loop_lag = self.loop_lag_seconds
+        if loop_lag > settings.HEALTH_MAX_LOOP_LAG_SECONDS:
+            reasons.append("event loop atrasado")
+
+        queue_capacity = email_queue.capacity
+        if queue_capacity and email_queue.depth >= settings.HEALTH_MAX_QUEUE_UTILIZATION * queue_capacity:
+            reasons.append("fila de e-mail cheia")
+
+        details = {
+            "status": "ready" if not reasons else "not_ready",
+            "reasons": reasons,
+            "database": {
+                "ok": self.db_ok,
+                "latency_ms": self.db_latency_ms,
+                "checked_seconds_ago": round(checked_ago, 2) if checked_ago is not None else None,
+                "error": self.db_error,
+            },
+            "pools": {name: pools[name]["utilization"] for name in READINESS_POOLS},
+            "event_loop_lag_ms": round(loop_lag * 1000, 2),
+            "email_queue": {"depth": email_queue.depth, "capacity": queue_capacity},
+        }
+        return not reasons, details
+
+    @property
+    def uptime_seconds(self) -> float:
+        return round(time.monotonic() - self.started_at, 1)
+
+    def start(self) -> None:
+        self.draining = False
+        self._tasks = [asyncio.create_task(self._run_db_checks()), asyncio.create_task(self._run_loop_lag())]
+        self._install_sigterm_handler()
+
+    def begin_drain(self) -> None:
+        """Marca o pod como não pronto (chamado no SIGTERM e no início do shutdown)"""
+        self.draining = True
+
+    def _install_sigterm_handler(self) -> None:
+        """
+        Substitui o handler de SIGTERM do uvicorn (instalado antes do startup).
+        Fora da thread principal ou sem suporte a sinais no loop, mantém o padrão.
+        """
+        try:
+            asyncio.get_running_loop().add_signal_handler(signal.SIGTERM, self._on_sigterm)
+        except (NotImplementedError, RuntimeError, ValueError):
+            logger.debug("Handler de SIGTERM não instalado; drenagem só no shutdown")
+
+    def _on_sigterm(self) -> None:
+        """
+        Drena antes de encerrar: o uvicorn para de aceitar conexões assim que
+        recebe o sinal, então o encerramento é repassado como SIGINT (também
+        gracioso no uvicorn) depois da janela de drenagem. Um segundo SIGTERM
+        encerra sem esperar.
+        """
+        delay = 0.0 if self.draining else settings.HEALTH_DRAIN_SECONDS
+        self.begin_drain()
+        logger.info("SIGTERM recebido; drenando por %.1fs antes do shutdown", delay)
+        asyncio.get_running_loop().call_later(delay, os.kill, os.getpid(), signal.SIGINT)
+
+    async def stop(self) -> None:
+        for task in self._tasks:
+            task.cancel()
+        await asyncio.gather(*self._tasks, return_exceptions=True)
+        self._tasks = []
+
+    async def _run_db_checks(self) -> None:
+        while True:
+            await self.check_db()
+            await asyncio.sleep(settings.HEALTH_CHECK_SECONDS)
+
+    async def _run_loop_lag(self) -> None:
+        loop = asyncio.get_running_loop()
+        while True:
+            expected = loop.time() + LOOP_LAG_INTERVAL_SECONDS
+            await asyncio.sleep(LOOP_LAG_INTERVAL_SECONDS)
+            self._loop_lags.append(max(0.0, loop.time() - expected))
+
+
+# Instances
+health_monitor = HealthMonitor()
@@ -0,0 +1,268 @@
+"""
+Métricas Prometheus - /metrics
+=============================
+
+- HTTP: latência por rota (template, ex: /forms/{form_id}/submit), método e
+  status; requisições em andamento; consultas SQL e tempo de banco por
+  requisição (app/database/instrumentation.py)
+- Banco: ocupação dos pools (em uso, overflow, utilização), checkouts, tempo
+  de checkout e timeouts; consultas e suspeitas de N+1 por rota
+- Caches: acertos/erros por cache (taxa de acerto = hits / (hits + misses))
+- Componentes: fila de e-mail, roteamento de réplica, revogação, GitHub,
+  merge dos resumos de texto
+- Submissões de formulário e respostas ingeridas
+
+Valores mantidos em memória pelos componentes (stats, pool_stats) são
+amostrados a cada METRICS_SAMPLE_SECONDS e a cada scrape; contadores sobem
+pela diferença desde a última amostra.
+
+Vários workers do uvicorn: defina PROMETHEUS_MULTIPROC_DIR (diretório vazio
+no início do container). Cada worker grava suas séries no diretório e o
+/metrics de qualquer worker agrega todos (gauges somados ou pelo máximo).
+
+Autor: Equipe de Desenvolvimento
+"""
+
+import asyncio
+import os
+import time
+from typing import Dict, Optional, Tuple
+
+import psutil
+from fastapi import Request
+from fastapi.responses import Response
+from prometheus_client import (
+    CONTENT_TYPE_LATEST,
+    REGISTRY,
+    CollectorRegistry,
+    Counter,
+    Gauge,
+    Histogram,
+    generate_latest,
+    multiprocess,
+)
+
+from app.analytics.service import text_summary_merger
+from app.auth.github import github_client
+from app.auth.revocation import revocation_registry
+from app.auth.token_cache import token_cache
+from app.config import settings
+from app.core.cache import analytics_cache, form_owner_cache, question_metadata_cache, user_id_cache
+from app.core.health import health_monitor
+from app.database.connection import pool_stats
+from app.database.routing import replica_monitor
+from app.email.queue import email_queue
+
+MULTIPROCESS = bool(os.getenv("PROMETHEUS_MULTIPROC_DIR"))
+
+# Probes e o próprio scrape ficam fora das métricas HTTP
+EXCLUDED_PATHS = {"/metrics", "/health", "/health/live", "/health/ready"}
+
+LATENCY_BUCKETS = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0)
+QUERY_COUNT_BUCKETS = (0, 1, 2, 3, 5, 10, 20, 50, 100)
+DB_TIME_BUCKETS = (0.001, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0)
+
+# ---------- HTTP ----------
+
+http_request_duration = Histogram(
+    "http_request_duration_seconds", "Latência das requisições HTTP",
+    ["method", "route", "status"], buckets=LATENCY_BUCKETS,
+)
+http_requests_in_progress = Gauge(
+    "http_requests_in_progress", "Requisições HTTP em andamento",
+    ["method"], multiprocess_mode="livesum",
+)
+http_request_queries = Histogram(
+    "http_request_db_queries", "Consultas SQL executadas por requisição",
+    ["route"], buckets=QUERY_COUNT_BUCKETS,
+)
+http_request_db_seconds = Histogram(
+    "http_request_db_seconds", "Tempo total no banco por requisição",
+    ["route"], buckets=DB_TIME_BUCKETS,
+)
+
+# ---------- Banco ----------
+
+db_queries = Counter("db_queries_total", "Consultas SQL executadas", ["route", "pool"])
+db_n_plus_one = Counter(
+    "db_n_plus_one_total", "Requisições com o mesmo statement repetido (possível N+1)", ["route"]
+)
+db_pool_size = Gauge("db_pool_size", "Conexões base do pool", ["pool"], multiprocess_mode="livesum")
+db_pool_checked_out = Gauge("db_pool_checked_out", "Conexões em uso", ["pool"], multiprocess_mode="livesum")
+db_pool_overflow = Gauge("db_pool_overflow", "Conexões de overflow abertas", ["pool"], multiprocess_mode="livesum")
+db_pool_utilization = Gauge(
+    "db_pool_utilization", "Conexões em uso / capacidade (maior entre os workers)",
+    ["pool"], multiprocess_mode="livemax",
+)
+db_pool_checkouts = Counter("db_pool_checkouts_total", "Checkouts de conexão", ["pool"])
+db_pool_checkout_seconds = Counter(
+    "db_pool_checkout_seconds_total", "Tempo gasto em checkouts (espera, overflow e pre-ping)", ["pool"]
+)
+db_pool_timeouts = Counter("db_pool_timeouts_total", "Checkouts que esgotaram o pool_timeout", ["pool"])
+
+# ---------- Caches e componentes ----------
+
+cache_operations = Counter("formerr_cache_operations_total", "Leituras de cache por resultado", ["cache", "result"])
+cache_evictions = Counter("formerr_cache_evictions_total", "Entradas removidas por limite de tamanho", ["cache"])
+component_events = Counter("formerr_component_events_total", "Eventos dos componentes internos", ["component", "event"])
+email_queue_depth = Gauge("formerr_email_queue_depth", "Mensagens aguardando envio", multiprocess_mode="livesum")
+replica_lag = Gauge("formerr_replica_lag_seconds", "Lag da réplica de leitura", multiprocess_mode="livemax")
+event_loop_lag = Gauge("formerr_event_loop_lag_seconds", "Atraso médio do event loop", multiprocess_mode="livemax")
+worker_memory = Gauge("formerr_worker_memory_bytes", "Memória residente do worker", multiprocess_mode="livesum")
+worker_cpu_seconds = Counter("formerr_worker_cpu_seconds_total", "Tempo de CPU do worker (user + system)")
+
+# ---------- Submissões ----------
+
+form_submissions = Counter("formerr_form_submissions_total", "Submissões de formulário aceitas")
+form_submission_answers = Counter("formerr_form_submission_answers_total", "Respostas individuais ingeridas")
+
+
+def record_submission(answers: int) -> None:
+    """Conta uma submissão aceita (chamado após o commit)"""
+    form_submissions.inc()
+    form_submission_answers.inc(answers)
+
+
+# ---------- Middleware ----------
+
+def _route_template(request: Request) -> str:
+    route = request.scope.get("route")
+    return getattr(route, "path", None) or "unmatched"
+
+
+async def metrics_middleware(request: Request, call_next):
+    """Latência, requisições em andamento e consultas SQL por rota"""
+    if request.url.path in EXCLUDED_PATHS:
+        return await call_next(request)
+
+    in_progress = http_requests_in_progress.labels(request.method)
+    in_progress.inc()
+    started = time.perf_counter()
+    status = "500"
+    try:
+        response = await call_next(request)
+        status = str(response.status_code)
+        return response
+    finally:
+        elapsed = time.perf_counter() - started
+        in_progress.dec()
+        route = _route_template(request)
+        http_request_duration.labels(request.method, route, status).observe(elapsed)
+        # Preenchido pelo query_tracking_middleware (registrado por dentro deste)
+        stats = getattr(request.state, "query_stats", None)
+        if stats is not None:
+            http_request_queries.labels(route).observe(stats.count)
+            http_request_db_seconds.labels(route).observe(stats.seconds)
+            for pool, count in stats.by_pool.items():
+                db_queries.labels(route, pool).inc(count)
+            if stats.n_plus_one:
+                db_n_plus_one.labels(route).inc()
+
+
+# ---------- Amostragem dos componentes ----------
+
+class _DeltaCounter:
+    """Converte totais acumulados em memória em incrementos de um Counter"""
+
+    def __init__(self, counter: Counter):
+        self.counter = counter
+        self._last: Dict[Tuple[str, ...], float] = {}
+
+    def sync(self, labels: Tuple[str, ...], value: float) -> None:
+        last = self._last.get(labels, 0)
+        # Valor menor que o anterior: o componente foi recriado e recomeçou do zero
+        delta = value - last if value >= last else value
+        if delta > 0:
+            (self.counter.labels(*labels) if labels else self.counter).inc(delta)
+        self._last[labels] = value
+
+
+class MetricsSampler:
+    """Copia os stats dos componentes para as métricas Prometheus"""
+
+    CACHES = {
+        "analytics": analytics_cache,
+        "question_metadata": question_metadata_cache,
+        "user_id": user_id_cache,
+        "form_owner": form_owner_cache,
+        "jwt": token_cache,
+    }
+
+    def __init__(self):
+        self._checkouts = _DeltaCounter(db_pool_checkouts)
+        self._checkout_seconds = _DeltaCounter(db_pool_checkout_seconds)
+        self._timeouts = _DeltaCounter(db_pool_timeouts)
+        self._cache_operations = _DeltaCounter(cache_operations)
+        self._cache_evictions = _DeltaCounter(cache_evictions)
+        self._component_events = _DeltaCounter(component_events)
+        self._cpu_seconds = _DeltaCounter(worker_cpu_seconds)
+        self._process = psutil.Process()
+        self._task: Optional["asyncio.Task[None]"] = None
+
+    def sample(self) -> None:
+        for pool, stats in pool_stats().items():
+            db_pool_size.labels(pool).set(stats["size"])
+            db_pool_checked_out.labels(pool).set(stats["checked_out"])
+            db_pool_overflow.labels(pool).set(stats["overflow"])
+            db_pool_utilization.labels(pool).set(stats["utilization"])
+            self._checkouts.sync((pool,), stats["checkouts"])
+            self._checkout_seconds.sync((pool,), stats["checkout_seconds"])
+            self._timeouts.sync((pool,), stats["timeouts"])
+
+        for name, cache in self.CACHES.items():
+            for result, value in cache.stats.items():
+                if result == "evictions":
+                    self._cache_evictions.sync((name,), value)
+                else:
+                    self._cache_operations.sync((name, result), value)
+
+        components = {
+            "email_queue": email_queue.stats,
+            "replica_routing": replica_monitor.stats,
+            "revocation": revocation_registry.stats,
+            "github": github_client.stats,
+            "text_summaries": text_summary_merger.stats,
+        }
+        for component, stats in components.items():
+            for name, value in stats.items():
+                self._component_events.sync((component, name), value)
+
+        email_queue_depth.set(email_queue.depth)
+        if replica_monitor.lag_seconds is not None:
+            replica_lag.set(replica_monitor.lag_seconds)
+        event_loop_lag.set(health_monitor.loop_lag_seconds)
+
+        worker_memory.set(self._process.memory_info().rss)
+        cpu = self._process.cpu_times()
+        self._cpu_seconds.sync((), cpu.user + cpu.system)
+
+    def start(self) -> None:
+        self._task = asyncio.create_task(self._run())
+
+    async def stop(self) -> None:
+        if self._task is not None:
+            self._task.cancel()
+            await asyncio.gather(self._task, return_exceptions=True)
+            self._task = None
+        if MULTIPROCESS:
+            multiprocess.mark_process_dead(os.getpid())
+
+    async def _run(self) -> None:
+        while True:
+            self.sample()
+            await asyncio.sleep(settings.METRICS_SAMPLE_SECONDS)
+
+
+def metrics_response() -> Response:
+    """Exposição no formato texto do Prometheus (agregando os workers em modo multiprocesso)"""
+    metrics_sampler.sample()
+    if MULTIPROCESS:
+        registry = CollectorRegistry()
+        multiprocess.MultiProcessCollector(registry)
+    else:
+        registry = REGISTRY
+    return Response(generate_latest(registry), media_type=CONTENT_TYPE_LATEST)
+
+
+# Instances
+metrics_sampler = MetricsSampler()
@@ -0,0 +1,51 @@
+"""
+Paginação por Cursor (Keyset)
+============================
+
+Cursores opacos para paginação keyset: o cursor carrega os valores da
+chave de ordenação do último item da página (ex: (created_at, id)), e a
+próxima página é buscada com uma comparação de tupla que usa o índice
+composto, com custo constante independentemente da profundidade.
+
+Autor: Equipe de Desenvolvimento
+"""
+
+import base64
+import json
+from datetime import datetime
+from typing import Any, List
+
+from fastapi import HTTPException
+
+_DATETIME_PREFIX = "dt:"
+
+
+def encode_cursor(*values: Any) -> str:
+    """Codifica os valores da chave de ordenação em um cursor opaco"""
+    payload = [
+        f"{_DATETIME_PREFIX}{v.isoformat()}" if isinstance(v, datetime) else v
+        for v in values
+    ]
+    raw = json.dumps(payload, separators=(",", ":")).encode("utf-8")
+    return base64.urlsafe_b64encode(raw).decode("ascii").rstrip("=")
+
+
+def decode_cursor(cursor: str, size: int) -> List[Any]:
+    """
+    Decodifica um cursor gerado por encode_cursor
+
+    Raises:
+        HTTPException: 400 se o cursor for inválido
+    """
+    try:
+        raw = base64.urlsafe_b64decode(cursor + "=" * (-len(cursor) % 4))
+        payload = json.loads(raw)
+        if not isinstance(payload, list) or len(payload) != size:
+            raise ValueError("tamanho inválido")
+        return [
+            datetime.fromisoformat(v[len(_DATETIME_PREFIX):])
+            if isinstance(v, str) and v.startswith(_DATETIME_PREFIX) else v
+            for v in payload
+        ]
+    except (ValueError, TypeError):
+        raise HTTPException(status_code=400, detail="Cursor de paginação inválido")
@@ -20,18 +20,19 @@ Autor: Equipe de Desenvolvimento
 Data: Janeiro 2025
 """
 
-from fastapi import APIRouter, Depends, HTTPException
+from fastapi import APIRouter, Depends, HTTPException, Query
 from typing import List, Dict, Any, Optional
 from datetime import datetime, timedelta
 from sqlalchemy.ext.asyncio import AsyncSession
-from sqlalchemy import func, and_, desc
+from sqlalchemy import func, desc
 from sqlalchemy.orm import selectinload
-from app.dependencies import get_current_user
-from app.database.connection import get_db
-from app.database.models import Form, ResponseSession, FormStatus, User
+from app.dependencies import get_current_user, resolve_user_id
+from app.database.routing import get_analytics_read_db, get_read_db
+from app.database.models import Form, ResponseSession, FormStatus
 from sqlalchemy.future import select
 from pydantic import BaseModel
-from app.dashboard.service import FormsService, ResponsesService
+from app.dashboard.service import FormsService, ResponsesService, DashboardStatsService, ActivityService
+from app.core.pagination import encode_cursor, decode_cursor
 
 router = APIRouter()
 
@@ -62,7 +63,7 @@ class FormSummary(BaseModel):
            response_model=DashboardStats)
 async def get_dashboard_stats(
     current_user: Dict[str, Any] = Depends(get_current_user),
-    db: AsyncSession = Depends(get_db)
+    db: AsyncSession = Depends(get_read_db)
 ):
     """
     **Estatísticas do Dashboard**
@@ -72,105 +73,15 @@ async def get_dashboard_stats(
     - **Total de respostas** recebidas
     - **Formulários ativos** no momento
     - **Respostas recebidas este mês e esta semana**
-    """
-    # Buscar o user_id correto baseado no github_id
-    result = await db.execute(
-        select(User.id).where(User.github_id == current_user["github_id"])
-    )
-    user_id = result.scalar_one_or_none()
-    
-    if not user_id:
-        raise HTTPException(status_code=404, detail="Usuário não encontrado no banco de dados")
     
-    # Datas para filtros
-    now = datetime.utcnow()
-    start_of_month = now.replace(day=1, hour=0, minute=0, second=0, microsecond=0)
-    start_of_week = now - timedelta(days=now.weekday())
-    start_of_week = start_of_week.replace(hour=0, minute=0, second=0, microsecond=0)
+    Os valores vêm de uma única linha de user_dashboard_stats, mantida
+    incrementalmente na criação/remoção de formulários e nas submissões.
+    """
+    user_id = await resolve_user_id(db, current_user)
     
     try:
-        # Total de formulários
-        total_forms_query = select(func.count(Form.id)).where(Form.user_id == user_id)
-        total_forms_result = await db.execute(total_forms_query)
-        total_forms = total_forms_result.scalar() or 0
-        
-        # Formulários ativos (PUBLIC status)
-        active_forms_query = select(func.count(Form.id)).where(
-            and_(Form.user_id == user_id, Form.status == FormStatus.PUBLIC)
-        )
-        active_forms_result = await db.execute(active_forms_query)
-        active_forms = active_forms_result.scalar() or 0
-        
-        # Total de respostas (através de response_sessions)
-        total_responses_query = select(func.count(ResponseSession.id)).join(
-            Form, ResponseSession.form_id == Form.id
-        ).where(Form.user_id == user_id)
-        total_responses_result = await db.execute(total_responses_query)
-        total_responses = total_responses_result.scalar() or 0
-        
-        # Respostas este mês
-        responses_month_query = select(func.count(ResponseSession.id)).join(
-            Form, ResponseSession.form_id == Form.id
-        ).where(
-            and_(
-                Form.user_id == user_id,
-                ResponseSession.submitted_at >= start_of_month
-            )
-        )
-        responses_month_result = await db.execute(responses_month_query)
-        responses_this_month = responses_month_result.scalar() or 0
-        
-        # Respostas esta semana
-        responses_week_query = select(func.count(ResponseSession.id)).join(
-            Form, ResponseSession.form_id == Form.id
-        ).where(
-            and_(
-                Form.user_id == user_id,
-                ResponseSession.submitted_at >= start_of_week
-            )
-        )
-        responses_week_result = await db.execute(responses_week_query)
-        responses_this_week = responses_week_result.scalar() or 0
-        
-        # Taxa média de resposta (respostas / formulários ativos)
-        avg_response_rate = 0.0
-        if active_forms > 0:
-            avg_response_rate = round(total_responses / active_forms, 2)
-        
-        # Formulário mais popular (com mais respostas)
-        most_popular_form = None
-        most_popular_query = select(
-            Form.id, Form.title, func.count(ResponseSession.id).label('response_count')
-        ).outerjoin(
-            ResponseSession, Form.id == ResponseSession.form_id
-        ).where(
-            Form.user_id == user_id
-        ).group_by(
-            Form.id, Form.title
-        ).order_by(
-            desc('response_count')
-        ).limit(1)
-        
-        most_popular_result = await db.execute(most_popular_query)
-        most_popular_row = most_popular_result.first()
-        
-        if most_popular_row:
-            most_popular_form = {
-                "id": most_popular_row.id,
-                "title": most_popular_row.title,
-                "response_count": most_popular_row.response_count
-            }
-        
-        return DashboardStats(
-            total_forms=total_forms,
-            active_forms=active_forms,
-            total_responses=total_responses,
-            responses_this_month=responses_this_month,
-            responses_this_week=responses_this_week,
-            avg_response_rate=avg_response_rate,
-            most_popular_form=most_popular_form
-        )
-        
+        stats = await DashboardStatsService.get(db, user_id)
+        return DashboardStats(**stats)
     except Exception as e:
         raise HTTPException(
             status_code=500,
@@ -183,7 +94,7 @@ async def get_dashboard_stats(
            response_model=List[FormSummary])
 async def get_user_forms(
     current_user: Dict[str, Any] = Depends(get_current_user),
-    db: AsyncSession = Depends(get_db)
+    db: AsyncSession = Depends(get_read_db)
 ):
     """
     **Lista de Formulários**
@@ -194,14 +105,7 @@ async def get_user_forms(
     - Contagem de respostas
     - Timestamps de criação e atualização
     """
-    # Buscar o user_id interno baseado no github_id
-    user_result = await db.execute(
-        select(User.id).where(User.github_id == current_user["github_id"])
-    )
-    user_id = user_result.scalar_one_or_none()
-    
-    if not user_id:
-        raise HTTPException(status_code=404, detail="User not found")
+    user_id = await resolve_user_id(db, current_user)
     
     try:
         # Query para buscar formulários com contagem de respostas
@@ -264,7 +168,7 @@ async def get_user_forms(
            response_description="Objeto com dados de analytics para visualização")
 async def get_dashboard_analytics(
     current_user: Dict[str, Any] = Depends(get_current_user),
-    db: AsyncSession = Depends(get_db)
+    db: AsyncSession = Depends(get_analytics_read_db)
 ):
     """
     **Analytics do Dashboard**
@@ -279,17 +183,12 @@ async def get_dashboard_analytics(
     Para usuários sem dados, retorna objetos vazios.
     """
     try:
-        # Buscar o user_id interno baseado no github_id
-        user_result = await db.execute(
-            select(User.id).where(User.github_id == current_user["github_id"])
-        )
-        user_id = user_result.scalar_one_or_none()
-        
-        if not user_id:
-            raise HTTPException(status_code=404, detail="User not found")
+        user_id = await resolve_user_id(db, current_user)
         
-        # Buscar dados reais para analytics
+        # Buscar dados reais para analytics (número fixo de queries, independente
+        # da quantidade de formulários)
         forms_data = await FormsService.get_user_forms(db, user_id)
+        counts_by_form = await ResponsesService.count_by_form(db, user_id)
         
         # Preparar analytics reais
         responses_by_form = []
@@ -297,8 +196,7 @@ async def get_dashboard_analytics(
         total_responses = 0
         
         for form in forms_data:
-            submissions = await ResponsesService.get_form_responses(db, form.id, user_id)
-            form_responses = len(submissions)
+            form_responses = counts_by_form.get(str(form.id), 0)
             total_responses += form_responses
             
             # Dados por formulário
@@ -308,8 +206,8 @@ async def get_dashboard_analytics(
                 "responses": form_responses
             })
             
-            # Contar por tipo
-            form_type = form.form_type or "survey"
+            # Contar por tipo (formulários ainda não têm tipo próprio)
+            form_type = "survey"
             forms_by_type[form_type] = forms_by_type.get(form_type, 0) + 1
         
         # Ordenar por número de respostas
@@ -320,13 +218,16 @@ async def get_dashboard_analytics(
         responses_timeline = []
         conversion_rates = []
         
-        # Se tiver dados, criar timeline baseado nos dados reais
+        # Se tiver dados, criar timeline com as contagens diárias reais
         if forms_data:
+            today = datetime.utcnow().replace(hour=0, minute=0, second=0, microsecond=0)
+            first_day = today - timedelta(days=6)
+            daily_counts = await ResponsesService.daily_counts(db, user_id, first_day)
             for i in range(7):
-                date = (datetime.utcnow() - timedelta(days=6-i)).strftime("%Y-%m-%d")
+                date = (first_day + timedelta(days=i)).strftime("%Y-%m-%d")
                 responses_timeline.append({
                     "date": date,
-                    "responses": max(0, int(total_responses / 7) + (i * 5) - 10)
+                    "responses": daily_counts.get(date, 0)
                 })
             
             for form_data in responses_by_form:
@@ -359,75 +260,40 @@ async def get_dashboard_analytics(
            description="Retorna o histórico de atividades recentes do usuário, incluindo criação de formulários e novas respostas.",
            response_description="Lista de atividades recentes do usuário")
 async def get_recent_activity(
+    limit: int = Query(20, ge=1, le=100, description="Quantidade de atividades por página"),
+    cursor: Optional[str] = Query(None, description="Cursor retornado em next_cursor"),
     current_user: Dict[str, Any] = Depends(get_current_user),
-    db: AsyncSession = Depends(get_db)
+    db: AsyncSession = Depends(get_read_db)
 ):
     """
     **Atividades Recentes**
     
     Fornece um resumo das últimas atividades do usuário:
     - **Formulários criados** recentemente
-    - **Novas respostas** recebidas em formulários
-    - **Publicações de formulários** (se aplicável)
+    - **Novas respostas** recebidas em formulários (agrupadas em rajadas)
+    - **Publicações e encerramentos de formulários**
     
-    Os dados são coletados em tempo real do banco de dados.
+    Os dados vêm do log append-only activity_events, paginado por cursor:
+    envie o `next_cursor` da resposta para buscar a página seguinte.
     Para usuários sem atividades, retorna uma lista vazia.
     """
     try:
-        # Buscar o user_id interno baseado no github_id
-        user_result = await db.execute(
-            select(User.id).where(User.github_id == current_user["github_id"])
-        )
-        user_id = user_result.scalar_one_or_none()
-        
-        if not user_id:
-            raise HTTPException(status_code=404, detail="User not found")
-        
-        # Buscar atividades reais
-        activities = []
-        
-        # Buscar formulários recentes
-        forms_data = await FormsService.get_user_forms(db, user_id)
-        recent_forms = sorted(forms_data, key=lambda x: x.created_at, reverse=True)[:3]
-        
-        # Adicionar atividades de formulários criados
-        for form in recent_forms:
-            activities.append({
-                "id": f"act_form_{form.id}",
-                "type": "form_created",
-                "message": f"Formulário '{form.title}' criado",
-                "form_id": form.id,
-                "timestamp": form.created_at.isoformat(),
-                "icon": "form"
-            })
-        
-        # Buscar respostas recentes
-        for form in recent_forms:
-            submissions = await ResponsesService.get_form_responses(db, form.id, user_id)
-            recent_submissions = sorted(submissions, key=lambda x: x.created_at, reverse=True)[:2]
-            
-            for submission in recent_submissions:
-                activities.append({
-                    "id": f"act_response_{submission.id}",
-                    "type": "form_response",
-                    "message": f"Nova resposta em '{form.title}'",
-                    "form_id": form.id,
-                    "timestamp": submission.created_at.isoformat(),
-                    "icon": "chart"
-                })
+        user_id = await resolve_user_id(db, current_user)
         
-        # Ordenar por timestamp
-        activities.sort(key=lambda x: x["timestamp"], reverse=True)
-        activities = activities[:10]  # Limitar a 10 atividades
+        cursor_key = tuple(decode_cursor(cursor, 2)) if cursor else None
+        activities, next_key = await ActivityService.get_feed(db, user_id, limit, cursor_key)
         
         return {
             "success": True,
             "activities": activities,
             "count": len(activities),
+            "next_cursor": encode_cursor(*next_key) if next_key else None,
             "timestamp": datetime.utcnow().isoformat(),
             "user": current_user["username"]
         }
         
+    except HTTPException:
+        raise
     except Exception as e:
         print(f"Recent activity error: {e}")
-        raise HTTPException(status_code=500, detail=f"Error fetching activity: {str(e)}")
\ No newline at end of file
+        raise HTTPException(status_code=500, detail=f"Error fetching activity: {str(e)}")
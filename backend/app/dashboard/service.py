@@ -1,14 +1,434 @@
-from typing import List, Any
+from typing import List, Any, Dict, Optional, Tuple
+from datetime import datetime, timedelta
+from sqlalchemy import select, update, func, case, desc, cast, Date, tuple_
+from sqlalchemy.dialects.postgresql import insert
 from sqlalchemy.ext.asyncio import AsyncSession
+from app.database.connection import session_factories
+from app.database.models import Form, FormStatus, ResponseSession, UserDashboardStats, ActivityEvent
 
 class FormsService:
+    """Consultas de formulários do usuário (apenas as colunas necessárias)"""
+
     @staticmethod
-    async def get_user_forms(db: AsyncSession, user_id: Any) -> List[Any]:
-        # TODO: Implementar lógica real
-        return []
+    async def get_user_forms(
+        db: AsyncSession,
+        user_id: Any,
+        order_by: str = "updated_at",
+        limit: Optional[int] = None
+    ) -> List[Any]:
+        """Formulários do usuário como linhas leves (id, title, status, timestamps)"""
+        order_column = Form.created_at if order_by == "created_at" else Form.updated_at
+        query = select(
+            Form.id,
+            Form.title,
+            Form.status,
+            Form.created_at,
+            Form.updated_at
+        ).where(Form.user_id == user_id).order_by(desc(order_column))
+        if limit is not None:
+            query = query.limit(limit)
+        result = await db.execute(query)
+        return list(result.all())
 
 class ResponsesService:
+    """Consultas de respostas em lote, sem N+1 por formulário"""
+
+    @staticmethod
+    async def count_by_form(db: AsyncSession, user_id: Any) -> Dict[str, int]:
+        """Quantidade de sessões por formulário do usuário, em uma única query agrupada"""
+        result = await db.execute(
+            select(ResponseSession.form_id, func.count(ResponseSession.id))
+            .join(Form, ResponseSession.form_id == Form.id)
+            .where(Form.user_id == user_id)
+            .group_by(ResponseSession.form_id)
+        )
+        return {str(form_id): count for form_id, count in result.all()}
+
+    @staticmethod
+    async def daily_counts(db: AsyncSession, user_id: Any, since: datetime) -> Dict[str, int]:
+        """Sessões por dia (YYYY-MM-DD) em todos os formulários do usuário desde `since`"""
+        day = cast(ResponseSession.submitted_at, Date).label("day")
+        result = await db.execute(
+            select(day, func.count(ResponseSession.id))
+            .join(Form, ResponseSession.form_id == Form.id)
+            .where(Form.user_id == user_id, ResponseSession.submitted_at >= since)
+            .group_by(day)
+        )
+        return {d.isoformat(): count for d, count in result.all()}
+
+
+def calendar_windows(now: Optional[datetime] = None) -> Tuple[datetime, datetime]:
+    """Início do mês e da semana (segunda-feira) correntes, em UTC"""
+    now = now or datetime.utcnow()
+    start_of_month = now.replace(day=1, hour=0, minute=0, second=0, microsecond=0)
+    start_of_week = now - timedelta(days=now.weekday())
+    start_of_week = start_of_week.replace(hour=0, minute=0, second=0, microsecond=0)
+    return start_of_month, start_of_week
+
+
+class DashboardStatsService:
+    """
+    Mantém a tabela user_dashboard_stats
+
+    Os contadores são atualizados com UPDATEs atômicos nos eventos de
+    formulário (criação, remoção, mudança de status) e de submissão.
+    As janelas de mês/semana rolam sozinhas: quando o início gravado é
+    diferente do início corrente, o contador recomeça.
+
+    Ordem de locks: sempre a(s) linha(s) de forms primeiro, depois a linha
+    de user_dashboard_stats (evita deadlock entre submissão, remoção e rebuild).
+    """
+
+    @staticmethod
+    async def get(db: AsyncSession, user_id: int) -> Dict[str, Any]:
+        """
+        Lê as estatísticas do usuário (uma linha), reconstruindo se ainda não existir
+
+        `db` pode ser uma sessão de leitura (réplica): o rebuild roda em uma
+        sessão própria do primário.
+        """
+        result = await db.execute(
+            select(UserDashboardStats, Form.title)
+            .outerjoin(Form, Form.id == UserDashboardStats.most_popular_form_id)
+            .where(UserDashboardStats.user_id == user_id)
+        )
+        row = result.first()
+        if row is None:
+            async with session_factories["interactive"]() as primary:
+                await DashboardStatsService.rebuild(primary, user_id)
+                await primary.commit()
+                return await DashboardStatsService.get(primary, user_id)
+
+        stats, most_popular_title = row
+        start_of_month, start_of_week = calendar_windows()
+
+        most_popular_form = None
+        if stats.most_popular_form_id is not None:
+            most_popular_form = {
+                "id": stats.most_popular_form_id,
+                "title": most_popular_title,
+                "response_count": stats.most_popular_count
+            }
+
+        return {
+            "total_forms": stats.total_forms,
+            "active_forms": stats.active_forms,
+            "total_responses": stats.total_responses,
+            "responses_this_month": stats.responses_this_month if stats.month_start == start_of_month else 0,
+            "responses_this_week": stats.responses_this_week if stats.week_start == start_of_week else 0,
+            "avg_response_rate": (
+                round(stats.total_responses / stats.active_forms, 2) if stats.active_forms > 0 else 0.0
+            ),
+            "most_popular_form": most_popular_form
+        }
+
+    @staticmethod
+    async def rebuild(db: AsyncSession, user_id: int) -> None:
+        """
+        Recalcula as estatísticas do usuário a partir das tabelas de origem
+
+        Também corrige forms.total_responses, que é a base dos incrementos.
+        Os formulários do usuário ficam travados (FOR UPDATE) até o commit:
+        submissões em andamento terminam antes da contagem e as novas esperam
+        o rebuild, então nenhum incremento se perde ou é contado duas vezes.
+        """
+        start_of_month, start_of_week = calendar_windows()
+
+        await db.execute(
+            select(Form.id).where(Form.user_id == user_id).order_by(Form.id).with_for_update()
+        )
+
+        await db.execute(
+            update(Form)
+            .where(Form.user_id == user_id)
+            .values(total_responses=select(func.count(ResponseSession.id))
+                    .where(ResponseSession.form_id == Form.id)
+                    .scalar_subquery(),
+                    updated_at=Form.updated_at)  # contadores não contam como edição
+            .execution_options(synchronize_session=False)
+        )
+
+        forms_result = await db.execute(
+            select(
+                func.count(Form.id),
+                func.count(Form.id).filter(Form.status == FormStatus.PUBLIC),
+                func.coalesce(func.sum(Form.total_responses), 0)
+            ).where(Form.user_id == user_id)
+        )
+        total_forms, active_forms, total_responses = forms_result.one()
+
+        windows_result = await db.execute(
+            select(
+                func.count(ResponseSession.id).filter(ResponseSession.submitted_at >= start_of_month),
+                func.count(ResponseSession.id).filter(ResponseSession.submitted_at >= start_of_week)
+            ).join(Form, ResponseSession.form_id == Form.id).where(
+                Form.user_id == user_id,
+                ResponseSession.submitted_at >= min(start_of_month, start_of_week)
+            )
+        )
+        responses_this_month, responses_this_week = windows_result.one()
+
+        most_popular = (await db.execute(
+            select(Form.id, Form.total_responses)
+            .where(Form.user_id == user_id)
+            .order_by(desc(Form.total_responses))
+            .limit(1)
+        )).first()
+
+        values = {
+            "total_forms": total_forms,
+            "active_forms": active_forms,
+            "total_responses": total_responses,
+            "month_start": start_of_month,
+            "responses_this_month": responses_this_month,
+            "week_start": start_of_week,
+            "responses_this_week": responses_this_week,
+            "most_popular_form_id": most_popular.id if most_popular else None,
+            "most_popular_count": (most_popular.total_responses or 0) if most_popular else 0,
+            "updated_at": datetime.utcnow()
+        }
+        await db.execute(
+            insert(UserDashboardStats)
+            .values(user_id=user_id, **values)
+            .on_conflict_do_update(index_elements=[UserDashboardStats.user_id], set_=values)
+        )
+
+    @staticmethod
+    async def on_form_created(db: AsyncSession, user_id: int, status: FormStatus = FormStatus.DRAFT) -> None:
+        await db.execute(
+            update(UserDashboardStats)
+            .where(UserDashboardStats.user_id == user_id)
+            .values(
+                total_forms=UserDashboardStats.total_forms + 1,
+                active_forms=UserDashboardStats.active_forms + (1 if status == FormStatus.PUBLIC else 0),
+                updated_at=datetime.utcnow()
+            )
+        )
+
     @staticmethod
-    async def get_form_responses(db: AsyncSession, form_id: Any, user_id: Any) -> List[Any]:
-        # TODO: Implementar lógica real
-        return [] 
\ No newline at end of file
+    async def on_form_status_changed(db: AsyncSession, user_id: int, old_status: Any, new_status: Any) -> None:
+        delta = int(new_status == FormStatus.PUBLIC) - int(old_status == FormStatus.PUBLIC)
+        if delta == 0:
+            return
+        await db.execute(
+            update(UserDashboardStats)
+            .where(UserDashboardStats.user_id == user_id)
+            .values(active_forms=UserDashboardStats.active_forms + delta, updated_at=datetime.utcnow())
+        )
+
+    @staticmethod
+    async def on_form_deleted(db: AsyncSession, form: Form) -> None:
+        """Desconta um formulário (chamar antes de removê-lo, na mesma transação)"""
+        start_of_month, start_of_week = calendar_windows()
+        # Trava o formulário antes da linha de stats (mesma ordem de on_submission);
+        # submissões em andamento terminam antes da contagem abaixo
+        await db.execute(select(Form.id).where(Form.id == form.id).with_for_update())
+        windows_result = await db.execute(
+            select(
+                func.count(ResponseSession.id),
+                func.count(ResponseSession.id).filter(ResponseSession.submitted_at >= start_of_month),
+                func.count(ResponseSession.id).filter(ResponseSession.submitted_at >= start_of_week)
+            ).where(ResponseSession.form_id == form.id)
+        )
+        form_total, form_month, form_week = windows_result.one()
+
+        most_popular = (await db.execute(
+            select(Form.id, Form.total_responses)
+            .where(Form.user_id == form.user_id, Form.id != form.id)
+            .order_by(desc(Form.total_responses))
+            .limit(1)
+        )).first()
+
+        await db.execute(
+            update(UserDashboardStats)
+            .where(UserDashboardStats.user_id == form.user_id)
+            .values(
+                total_forms=UserDashboardStats.total_forms - 1,
+                active_forms=UserDashboardStats.active_forms - (1 if form.status == FormStatus.PUBLIC else 0),
+                total_responses=UserDashboardStats.total_responses - form_total,
+                responses_this_month=case(
+                    (UserDashboardStats.month_start == start_of_month,
+                     func.greatest(UserDashboardStats.responses_this_month - form_month, 0)),
+                    else_=0
+                ),
+                month_start=start_of_month,
+                responses_this_week=case(
+                    (UserDashboardStats.week_start == start_of_week,
+                     func.greatest(UserDashboardStats.responses_this_week - form_week, 0)),
+                    else_=0
+                ),
+                week_start=start_of_week,
+                most_popular_form_id=most_popular.id if most_popular else None,
+                most_popular_count=(most_popular.total_responses or 0) if most_popular else 0,
+                updated_at=datetime.utcnow()
+            )
+        )
+
+    @staticmethod
+    async def on_submission(db: AsyncSession, form_id: str) -> Optional[Tuple[int, str]]:
+        """
+        Registra uma nova resposta: incrementa forms.total_responses e o resumo do dono
+
+        Returns:
+            (user_id do dono, título do formulário), ou None se o formulário não existir
+        """
+        result = await db.execute(
+            update(Form)
+            .where(Form.id == form_id)
+            .values(
+                total_responses=func.coalesce(Form.total_responses, 0) + 1,
+                updated_at=Form.updated_at  # contadores não contam como edição
+            )
+            .returning(Form.user_id, Form.total_responses, Form.title)
+            .execution_options(synchronize_session=False)
+        )
+        row = result.first()
+        if row is None:
+            return None
+        user_id, form_count, form_title = row
+
+        start_of_month, start_of_week = calendar_windows()
+        takes_lead = (UserDashboardStats.most_popular_form_id == form_id) | \
+                     (UserDashboardStats.most_popular_count < form_count)
+        await db.execute(
+            update(UserDashboardStats)
+            .where(UserDashboardStats.user_id == user_id)
+            .values(
+                total_responses=UserDashboardStats.total_responses + 1,
+                responses_this_month=case(
+                    (UserDashboardStats.month_start == start_of_month, UserDashboardStats.responses_this_month + 1),
+                    else_=1
+                ),
+                month_start=start_of_month,
+                responses_this_week=case(
+                    (UserDashboardStats.week_start == start_of_week, UserDashboardStats.responses_this_week + 1),
+                    else_=1
+                ),
+                week_start=start_of_week,
+                most_popular_form_id=case((takes_lead, form_id), else_=UserDashboardStats.most_popular_form_id),
+                most_popular_count=case((takes_lead, form_count), else_=UserDashboardStats.most_popular_count),
+                updated_at=datetime.utcnow()
+            )
+        )
+        return user_id, form_title
+
+
+class ActivityService:
+    """
+    Feed de atividades append-only (tabela activity_events)
+
+    Eventos são gravados na mesma transação da ação que os gerou. Respostas
+    recebidas em rajada no mesmo formulário são agrupadas em um único evento
+    dentro da janela COALESCE_WINDOW.
+
+    O feed é ordenado pela última atividade (last_event_at), o mesmo horário
+    exibido: uma rajada que continua crescendo sobe para o topo. Ela pode
+    sair do trecho ainda não paginado e não aparecer nas páginas seguintes
+    de uma leitura em andamento; aparece no topo na próxima.
+    """
+
+    COALESCE_WINDOW = timedelta(minutes=10)
+
+    ICONS = {
+        "form_created": "form",
+        "form_published": "globe",
+        "form_closed": "lock",
+        "form_response": "chart"
+    }
+
+    @staticmethod
+    async def record(db: AsyncSession, user_id: int, event_type: str, form_id: str, form_title: Optional[str]) -> None:
+        """Grava um evento de formulário (criação, publicação, encerramento)"""
+        now = datetime.utcnow()
+        db.add(ActivityEvent(
+            user_id=user_id,
+            form_id=form_id,
+            form_title=form_title,
+            type=event_type,
+            count=1,
+            created_at=now,
+            last_event_at=now
+        ))
+
+    @staticmethod
+    async def record_status_change(db: AsyncSession, form: Form, old_status: Any) -> None:
+        """Grava publicação/encerramento quando o status do formulário muda"""
+        if form.status == old_status:
+            return
+        if form.status == FormStatus.PUBLIC:
+            await ActivityService.record(db, form.user_id, "form_published", str(form.id), form.title)
+        elif form.status == FormStatus.CLOSED:
+            await ActivityService.record(db, form.user_id, "form_closed", str(form.id), form.title)
+
+    @staticmethod
+    async def record_submission(db: AsyncSession, user_id: int, form_id: str, form_title: Optional[str]) -> None:
+        """Grava uma resposta, agrupando no evento aberto do formulário se houver"""
+        now = datetime.utcnow()
+        open_bucket = select(ActivityEvent.id).where(
+            ActivityEvent.user_id == user_id,
+            ActivityEvent.form_id == form_id,
+            ActivityEvent.type == "form_response",
+            ActivityEvent.created_at >= now - ActivityService.COALESCE_WINDOW,
+            # Implícito (last_event_at >= created_at); permite usar o índice do feed
+            ActivityEvent.last_event_at >= now - ActivityService.COALESCE_WINDOW
+        ).order_by(desc(ActivityEvent.created_at)).limit(1).scalar_subquery()
+
+        result = await db.execute(
+            update(ActivityEvent)
+            .where(ActivityEvent.id == open_bucket)
+            .values(count=ActivityEvent.count + 1, last_event_at=now, form_title=form_title)
+            .returning(ActivityEvent.id)
+            .execution_options(synchronize_session=False)
+        )
+        if result.first() is None:
+            await ActivityService.record(db, user_id, "form_response", form_id, form_title)
+
+    @staticmethod
+    async def get_feed(
+        db: AsyncSession,
+        user_id: int,
+        limit: int,
+        cursor: Optional[Tuple[datetime, int]] = None
+    ) -> Tuple[List[Dict[str, Any]], Optional[Tuple[datetime, int]]]:
+        """
+        Página do feed ordenada por (last_event_at, id) decrescente
+
+        Returns:
+            (atividades, chave do último item se houver próxima página)
+        """
+        query = select(ActivityEvent).where(ActivityEvent.user_id == user_id)
+        if cursor is not None:
+            query = query.where(tuple_(ActivityEvent.last_event_at, ActivityEvent.id) < tuple_(*cursor))
+        query = query.order_by(desc(ActivityEvent.last_event_at), desc(ActivityEvent.id)).limit(limit + 1)
+
+        events = list((await db.execute(query)).scalars().all())
+
+        has_more = len(events) > limit
+        events = events[:limit]
+        next_key = (events[-1].last_event_at, events[-1].id) if has_more else None
+        return [ActivityService.to_activity(event) for event in events], next_key
+
+    @staticmethod
+    def to_activity(event: ActivityEvent) -> Dict[str, Any]:
+        """Formata o evento no formato do feed"""
+        title = event.form_title or ""
+        if event.type == "form_created":
+            message = f"Formulário '{title}' criado"
+        elif event.type == "form_published":
+            message = f"Formulário '{title}' publicado"
+        elif event.type == "form_closed":
+            message = f"Formulário '{title}' encerrado"
+        elif event.count > 1:
+            message = f"{event.count} novas respostas em '{title}'"
+        else:
+            message = f"Nova resposta em '{title}'"
+
+        return {
+            "id": f"act_{event.id}",
+            "type": event.type,
+            "message": message,
+            "form_id": event.form_id,
+            "count": event.count,
+            "timestamp": event.last_event_at.isoformat(),
+            "icon": ActivityService.ICONS.get(event.type, "form")
+        }
@@ -1,7 +1,11 @@
+from typing import Any, Dict
+from sqlalchemy import exc
 from sqlalchemy.ext.asyncio import create_async_engine, AsyncSession, async_sessionmaker
 from sqlalchemy.ext.declarative import declarative_base
+from sqlalchemy.pool import AsyncAdaptedQueuePool
 from app.config import settings
 import ssl
+import time
 
 # Base para models
 Base = declarative_base()
@@ -11,25 +15,89 @@ ssl_context = ssl.create_default_context()
 ssl_context.check_hostname = False
 ssl_context.verify_mode = ssl.CERT_NONE
 
-# Async engine para PostgreSQL
-engine = create_async_engine(
-    settings.DATABASE_URL,
-    echo=True if settings.ENVIRONMENT == "development" else False,
-    pool_pre_ping=True,
-    pool_recycle=300,
-    connect_args={
-        "ssl": ssl_context,
-        "server_settings": {
-            "application_name": "formerr_api_platform",
+
+class InstrumentedQueuePool(AsyncAdaptedQueuePool):
+    """Pool padrão do asyncpg que acumula checkouts, tempo de checkout e timeouts"""
+
+    def __init__(self, *args, **kwargs):
+        super().__init__(*args, **kwargs)
+        self.checkouts = 0
+        self.checkout_seconds = 0.0
+        self.timeouts = 0
+
+    def connect(self):
+        # Inclui a espera por uma conexão livre, a abertura de overflow e o pre-ping
+        started = time.perf_counter()
+        try:
+            return super().connect()
+        except exc.TimeoutError:
+            self.timeouts += 1
+            raise
+        finally:
+            self.checkouts += 1
+            self.checkout_seconds += time.perf_counter() - started
+
+
+def _create_engine(url: str, application_name: str, size: int = 5, overflow: int = 10,
+                   timeout: float = 30.0, statement_timeout_ms: int = 0):
+    server_settings = {"application_name": application_name}
+    if statement_timeout_ms:
+        server_settings["statement_timeout"] = str(statement_timeout_ms)
+    return create_async_engine(
+        url,
+        echo=True if settings.ENVIRONMENT == "development" else False,
+        poolclass=InstrumentedQueuePool,
+        pool_pre_ping=True,
+        pool_recycle=300,
+        pool_size=size,
+        max_overflow=overflow,
+        pool_timeout=timeout,
+        connect_args={
+            "ssl": ssl_context,
+            "server_settings": server_settings
         }
-    }
-)
+    )
+
+
+# Um pool por carga de trabalho (submit, interactive, analytics, background),
+# com tamanho, espera e statement_timeout próprios: consultas lentas de
+# analytics/exportação não esgotam as conexões das submissões e do painel
+POOL_CONFIGS = settings.DATABASE_POOLS
+
+engines = {
+    name: _create_engine(settings.DATABASE_URL, f"formerr_api_{name}", **config)
+    for name, config in POOL_CONFIGS.items()
+}
+
+session_factories = {
+    name: async_sessionmaker(pool_engine, class_=AsyncSession, expire_on_commit=False)
+    for name, pool_engine in engines.items()
+}
+
+# Async engine para PostgreSQL (pool padrão: rotas interativas)
+engine = engines["interactive"]
 
 # Session factory
-AsyncSessionLocal = async_sessionmaker(
-    engine,
+AsyncSessionLocal = session_factories["interactive"]
+
+# Réplica de leitura (opcional): dashboard, analytics e leituras públicas.
+# O roteamento (lag, read-your-writes) fica em app/database/routing.py
+replica_engine = _create_engine(
+    settings.DATABASE_REPLICA_URL, "formerr_api_replica", **POOL_CONFIGS["analytics"]
+) if settings.DATABASE_REPLICA_URL else None
+
+ReplicaSessionLocal = async_sessionmaker(
+    replica_engine,
     class_=AsyncSession,
     expire_on_commit=False
+) if replica_engine is not None else None
+
+# Conexão única do monitor de saúde (app/core/health.py), fora dos pools das rotas:
+# probes e pools saturados não interferem um no outro
+health_engine = _create_engine(
+    settings.DATABASE_URL, "formerr_api_health", size=1, overflow=0,
+    timeout=settings.HEALTH_DB_TIMEOUT_SECONDS,
+    statement_timeout_ms=int(settings.HEALTH_DB_TIMEOUT_SECONDS * 1000)
 )
 
 async def get_db():
@@ -40,6 +108,49 @@ async def get_db():
         finally:
             await session.close()
 
+
+def pool_db(pool: str):
+    """Factory de dependency com sessão do pool indicado"""
+    session_factory = session_factories[pool]
+
+    async def get_pool_db():
+        async with session_factory() as session:
+            try:
+                yield session
+            finally:
+                await session.close()
+
+    return get_pool_db
+
+
+get_submit_db = pool_db("submit")
+get_analytics_db = pool_db("analytics")
+get_background_db = pool_db("background")
+
+
+def pool_stats() -> Dict[str, Dict[str, Any]]:
+    """Ocupação de cada pool (conexões em uso, ociosas e overflow) e totais de checkout"""
+    all_engines = dict(engines)
+    if replica_engine is not None:
+        all_engines["replica"] = replica_engine
+    stats = {}
+    for name, pool_engine in all_engines.items():
+        pool = pool_engine.sync_engine.pool
+        capacity = pool.size() + getattr(pool, "_max_overflow", 0)
+        checked_out = pool.checkedout()
+        stats[name] = {
+            "size": pool.size(),
+            "capacity": capacity,
+            "checked_out": checked_out,
+            "checked_in": pool.checkedin(),
+            "overflow": max(pool.overflow(), 0),
+            "utilization": round(checked_out / capacity, 4) if capacity else 0.0,
+            "checkouts": getattr(pool, "checkouts", 0),
+            "checkout_seconds": round(getattr(pool, "checkout_seconds", 0.0), 6),
+            "timeouts": getattr(pool, "timeouts", 0),
+        }
+    return stats
+
 async def init_db():
     """Inicializar database"""
     async with engine.begin() as conn:
@@ -49,5 +160,9 @@ async def init_db():
 
 async def close_db():
     """Fechar conexão com database"""
-    await engine.dispose()
+    for pool_engine in engines.values():
+        await pool_engine.dispose()
+    if replica_engine is not None:
+        await replica_engine.dispose()
+    await health_engine.dispose()
     print("✅ Database connection closed!")
\ No newline at end of file
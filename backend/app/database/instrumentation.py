@@ -0,0 +1,186 @@
+"""
+Instrumentação SQL - Consultas por Requisição e Detecção de N+1
+==============================================================
+
+Eventos before/after_cursor_execute em todos os engines atribuem cada
+statement à requisição atual (ContextVar):
+
+- Quantidade de statements, tempo total no banco e os mais lentos
+- Forma do statement (placeholders e listas IN normalizados): a mesma forma
+  repetida N_PLUS_ONE_THRESHOLD vezes ou mais na requisição é registrada em
+  log como possível N+1 (consulta dentro de loop)
+- Slow query log (SLOW_QUERY_MS) com os parâmetros redigidos: só None,
+  booleanos e inteiros aparecem; os demais viram tipo e tamanho
+- Header Server-Timing (SERVER_TIMING_ENABLED) com o tempo de banco e o
+  total da requisição, visível no DevTools do navegador
+
+As métricas Prometheus (app/core/metrics.py) leem o mesmo resumo em
+request.state.query_stats.
+
+Autor: Equipe de Desenvolvimento
+"""
+
+import heapq
+import logging
+import re
+import time
+from collections import Counter
+from contextvars import ContextVar
+from functools import partial
+from typing import Any, Dict, List, Optional, Tuple
+
+from fastapi import Request
+from sqlalchemy import event
+
+from app.config import settings
+from app.database.connection import engines, health_engine, replica_engine
+
+logger = logging.getLogger(__name__)
+
+# Statements mais lentos guardados por requisição
+SLOWEST_PER_REQUEST = 3
+
+# Tamanho máximo do statement nos logs
+LOG_STATEMENT_CHARS = 500
+
+# Placeholders do asyncpg, com o cast opcional que o SQLAlchemy adiciona ($1::VARCHAR)
+_PLACEHOLDER = re.compile(r"\$\d+(?:::\w+(?:\[\])?)?")
+_PLACEHOLDER_LIST = re.compile(r"\(\s*\?(?:\s*,\s*\?)+\s*\)")
+_WHITESPACE = re.compile(r"\s+")
+
+
+def statement_shape(statement: str) -> str:
+    """Forma do statement: placeholders viram ?, listas IN viram (...)"""
+    shape = _PLACEHOLDER.sub("?", statement)
+    shape = _PLACEHOLDER_LIST.sub("(...)", shape)
+    return _WHITESPACE.sub(" ", shape).strip()
+
+
+def redact(value: Any) -> Any:
+    """Parâmetros para log: mantém None/bool/int, o resto vira tipo e tamanho"""
+    if value is None or isinstance(value, (bool, int)):
+        return value
+    if isinstance(value, (list, tuple)):
+        return [redact(item) for item in value]
+    if isinstance(value, dict):
+        return {key: redact(item) for key, item in value.items()}
+    if isinstance(value, (str, bytes)):
+        return f"<{type(value).__name__}:{len(value)}>"
+    return f"<{type(value).__name__}>"
+
+
+class RequestQueryStats:
+    """Resumo das consultas de uma requisição"""
+
+    __slots__ = ("count", "seconds", "by_pool", "shapes", "slowest", "n_plus_one")
+
+    def __init__(self):
+        self.count = 0
+        self.seconds = 0.0
+        self.by_pool: Dict[str, int] = {}
+        self.shapes: "Counter[str]" = Counter()
+        self.slowest: List[Tuple[float, str]] = []
+        self.n_plus_one: List[Tuple[str, int]] = []
+
+    def record(self, pool: str, shape: str, seconds: float) -> None:
+        self.count += 1
+        self.seconds += seconds
+        self.by_pool[pool] = self.by_pool.get(pool, 0) + 1
+        self.shapes[shape] += 1
+        if len(self.slowest) < SLOWEST_PER_REQUEST:
+            heapq.heappush(self.slowest, (seconds, shape))
+        elif seconds > self.slowest[0][0]:
+            heapq.heapreplace(self.slowest, (seconds, shape))
+
+    def finish(self) -> None:
+        self.n_plus_one = [
+            (shape, count) for shape, count in self.shapes.most_common()
+            if count >= settings.N_PLUS_ONE_THRESHOLD
+        ]
+
+    def server_timing(self, total_seconds: float) -> str:
+        return (
+            f'db;dur={self.seconds * 1000:.1f};desc="{self.count} queries", '
+            f"total;dur={total_seconds * 1000:.1f}"
+        )
+
+
+_current_stats: ContextVar[Optional[RequestQueryStats]] = ContextVar("request_query_stats", default=None)
+
+
+# ---------- eventos do engine ----------
+
+def _before_cursor_execute(conn, cursor, statement, parameters, context, executemany) -> None:
+    conn.info.setdefault("query_started", []).append(time.perf_counter())
+
+
+def _after_cursor_execute(pool: str, conn, cursor, statement, parameters, context, executemany) -> None:
+    started = conn.info["query_started"].pop()
+    elapsed = time.perf_counter() - started
+    shape = statement_shape(statement)
+
+    stats = _current_stats.get()
+    if stats is not None:
+        stats.record(pool, shape, elapsed)
+
+    if elapsed * 1000 >= settings.SLOW_QUERY_MS:
+        params = f"executemany x{len(parameters)}" if executemany else redact(parameters)
+        logger.warning(
+            f"Consulta lenta ({elapsed * 1000:.0f} ms, pool {pool}): "
+            f"{shape[:LOG_STATEMENT_CHARS]} | parâmetros: {params}"
+        )
+
+
+def _handle_error(exception_context) -> None:
+    # Statement que falhou não passa pelo after_cursor_execute
+    connection = exception_context.connection
+    if connection is not None and connection.info.get("query_started"):
+        connection.info["query_started"].pop()
+
+
+def _instrument_engines() -> None:
+    all_engines = dict(engines)
+    all_engines["health"] = health_engine
+    if replica_engine is not None:
+        all_engines["replica"] = replica_engine
+    for name, pool_engine in all_engines.items():
+        sync_engine = pool_engine.sync_engine
+        event.listen(sync_engine, "before_cursor_execute", _before_cursor_execute)
+        event.listen(sync_engine, "after_cursor_execute", partial(_after_cursor_execute, name))
+        event.listen(sync_engine, "handle_error", _handle_error)
+
+
+_instrument_engines()
+
+
+# ---------- requisição ----------
+
+def _route_template(request: Request) -> str:
+    route = request.scope.get("route")
+    return getattr(route, "path", None) or request.url.path
+
+
+async def query_tracking_middleware(request: Request, call_next):
+    """Atribui as consultas à requisição, aponta N+1 e adiciona Server-Timing"""
+    stats = RequestQueryStats()
+    token = _current_stats.set(stats)
+    started = time.perf_counter()
+    try:
+        response = await call_next(request)
+    finally:
+        _current_stats.reset(token)
+        stats.finish()
+        request.state.query_stats = stats
+
+    if stats.n_plus_one:
+        slowest = ", ".join(f"{seconds * 1000:.1f} ms: {shape[:120]}" for seconds, shape in sorted(stats.slowest, reverse=True))
+        for shape, count in stats.n_plus_one:
+            logger.warning(
+                f"Possível N+1 em {request.method} {_route_template(request)}: "
+                f"{count}x {shape[:LOG_STATEMENT_CHARS]} "
+                f"({stats.count} consultas, {stats.seconds * 1000:.1f} ms no banco; mais lentas: {slowest})"
+            )
+
+    if settings.SERVER_TIMING_ENABLED:
+        response.headers["Server-Timing"] = stats.server_timing(time.perf_counter() - started)
+    return response
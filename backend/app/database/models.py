@@ -9,18 +9,33 @@ Modelos de dados para o sistema de formulários seguindo estrutura normalizada:
 - Question: Perguntas dentro de seções
 - ResponseSession: Sessões de resposta (uma submissão completa)
 - Response: Respostas individuais por pergunta
+- QuestionTextSummary: Resumo top-k de perguntas de texto livre
+- QuestionTextSummaryDelta: Respostas de texto ainda não incorporadas ao resumo
+- UserDashboardStats: Resumo do dashboard por usuário (contadores incrementais)
+- ActivityEvent: Log append-only do feed de atividades
+- ExportJob: Exportações em background (progresso e checkpoint)
+- ExportChunk: Blocos dos arquivos exportados (storage compartilhado entre réplicas)
+- RevokedToken: Revogações de JWT (logout por jti e troca de geração do usuário)
 
 Estrutura normalizada para facilitar analytics e performance.
 """
 
-from sqlalchemy import Column, Integer, String, Boolean, DateTime, Text, ForeignKey, JSON, Float, Enum as SQLEnum
-from sqlalchemy.orm import relationship
-from sqlalchemy.dialects.postgresql import UUID, JSONB
+from sqlalchemy import Column, Computed, Integer, BigInteger, String, Boolean, DateTime, Text, ForeignKey, JSON, Float, Index, LargeBinary, func, Enum as SQLEnum
+from sqlalchemy.orm import deferred, relationship
+from sqlalchemy.dialects.postgresql import UUID, JSONB, TSVECTOR
 from datetime import datetime
 import uuid
 from app.database.connection import Base
+from app.config import settings
 from app.auth.models import UserRole
 import enum
+import re
+
+
+# Configuração de text search embutida no DDL de responses.search_vector
+if not re.fullmatch(r"[A-Za-z_][A-Za-z0-9_.]*", settings.SEARCH_LANGUAGE):
+    raise ValueError(f"SEARCH_LANGUAGE inválido: {settings.SEARCH_LANGUAGE!r}")
+SEARCH_CONFIG = settings.SEARCH_LANGUAGE
 
 
 class FormStatus(enum.Enum):
@@ -47,6 +62,9 @@ class User(Base):
     subscription_expires = Column(DateTime, nullable=True)
     is_active = Column(Boolean, default=True)
 
+    # Incrementado quando role/is_active mudam: tokens de gerações anteriores deixam de valer
+    token_generation = Column(Integer, default=0, server_default="0", nullable=False)
+
     # Usage tracking
     monthly_submissions_used = Column(Integer, default=0)
     monthly_reset_date = Column(DateTime, default=datetime.utcnow)
@@ -69,7 +87,7 @@ class Form(Base):
     
     # Identificação
     id = Column(String, primary_key=True, default=lambda: str(uuid.uuid4()))
-    user_id = Column(Integer, ForeignKey("users.id", ondelete="CASCADE"), nullable=False, index=True)
+    user_id = Column(Integer, ForeignKey("users.id", ondelete="CASCADE"), nullable=False)
     
     # 🔧 CONFIGURAÇÕES INICIAIS (/forms/new)
     title = Column(String(255), nullable=False)
@@ -97,11 +115,18 @@ class Form(Base):
     response_sessions = relationship("ResponseSession", back_populates="form", cascade="all, delete-orphan")
 
 
+# Listagem do painel: WHERE user_id = ? ORDER BY updated_at DESC (cobre as colunas leves)
+Index(
+    "ix_forms_user_updated", Form.user_id, Form.updated_at.desc(),
+    postgresql_include=["id", "title", "status", "created_at"]
+)
+
+
 class Section(Base):
     __tablename__ = "sections"
     
     id = Column(String, primary_key=True, default=lambda: str(uuid.uuid4()))
-    form_id = Column(String, ForeignKey("forms.id", ondelete="CASCADE"), nullable=False, index=True)
+    form_id = Column(String, ForeignKey("forms.id", ondelete="CASCADE"), nullable=False)
     
     # Conteúdo da seção
     title = Column(String(255), nullable=False)
@@ -119,11 +144,14 @@ class Section(Base):
     questions = relationship("Question", back_populates="section", cascade="all, delete-orphan", order_by="Question.order")
 
 
+Index("ix_sections_form_order", Section.form_id, Section.order)
+
+
 class Question(Base):
     __tablename__ = "questions"
     
     id = Column(String, primary_key=True, default=lambda: str(uuid.uuid4()))
-    section_id = Column(String, ForeignKey("sections.id", ondelete="CASCADE"), nullable=False, index=True)
+    section_id = Column(String, ForeignKey("sections.id", ondelete="CASCADE"), nullable=False)
     
     # Tipo e conteúdo da pergunta
     type = Column(String(50), nullable=False)  # short-text, paragraph, multiple-choice, etc.
@@ -147,12 +175,15 @@ class Question(Base):
     responses = relationship("Response", back_populates="question", cascade="all, delete-orphan")
 
 
+Index("ix_questions_section_order", Question.section_id, Question.order)
+
+
 class ResponseSession(Base):
     """Uma sessão de respostas = uma submissão completa do formulário"""
     __tablename__ = "response_sessions"
     
     id = Column(String, primary_key=True, default=lambda: str(uuid.uuid4()))
-    form_id = Column(String, ForeignKey("forms.id", ondelete="CASCADE"), nullable=False, index=True)
+    form_id = Column(String, ForeignKey("forms.id", ondelete="CASCADE"), nullable=False)
     
     # Informações do respondente (opcional)
     respondent_email = Column(String(255), nullable=True)
@@ -167,16 +198,32 @@ class ResponseSession(Base):
     responses = relationship("Response", back_populates="session", cascade="all, delete-orphan")
 
 
+# Listagem paginada por formulário: WHERE form_id = ? ORDER BY submitted_at DESC, id DESC
+Index("ix_response_sessions_form_submitted", ResponseSession.form_id, ResponseSession.submitted_at, ResponseSession.id)
+
+
 class Response(Base):
     """Uma resposta individual para uma pergunta específica"""
     __tablename__ = "responses"
     
     id = Column(String, primary_key=True, default=lambda: str(uuid.uuid4()))
     session_id = Column(String, ForeignKey("response_sessions.id", ondelete="CASCADE"), nullable=False, index=True)
-    question_id = Column(String, ForeignKey("questions.id", ondelete="CASCADE"), nullable=False, index=True)
+    question_id = Column(String, ForeignKey("questions.id", ondelete="CASCADE"), nullable=False)
     
     # Valor da resposta
     value = Column(Text, nullable=True)  # Sempre texto, pode ser JSON para multiple choice
+
+    # Valor numérico da resposta (quando houver), para filtros de faixa (ex: nota >= 8)
+    value_numeric = Column(Float, nullable=True)
+
+    # Busca textual: mantida pelo Postgres a cada INSERT/UPDATE (coluna gerada).
+    # Indexa os valores decodificados do JSON (value guarda "n\u00e3o", não "não").
+    # Deferred para não ser carregada junto com Response.
+    search_vector = deferred(Column(
+        TSVECTOR,
+        Computed(f"to_tsvector('{SEARCH_CONFIG}'::regconfig, coalesce(value, '[]')::jsonb)", persisted=True),
+        nullable=True
+    ))
     
     # 🕐 TIMESTAMPS
     created_at = Column(DateTime, default=datetime.utcnow)
@@ -184,3 +231,175 @@ class Response(Base):
     # Relationships
     session = relationship("ResponseSession", back_populates="responses")
     question = relationship("Question", back_populates="responses")
+
+
+# Busca textual por formulário: WHERE search_vector @@ websearch_to_tsquery(...)
+Index("ix_responses_search_vector", Response.search_vector, postgresql_using="gin")
+
+# Contagens por pergunta restritas a sessões filtradas (session_id IN ...)
+Index("ix_responses_question_session", Response.question_id, Response.session_id)
+
+# Filtros por resposta (app/forms/filters.py): semi-joins por pergunta + valor.
+# md5(value) porque respostas longas excedem o limite de tamanho de chave do btree
+Index("ix_responses_question_value", Response.question_id, func.md5(Response.value))
+Index(
+    "ix_responses_question_numeric", Response.question_id, Response.value_numeric,
+    postgresql_where=Response.value_numeric.isnot(None)
+)
+
+
+class QuestionTextSummary(Base):
+    """Resumo incremental (sketch top-k) das respostas de uma pergunta de texto livre"""
+    __tablename__ = "question_text_summaries"
+
+    question_id = Column(String, ForeignKey("questions.id", ondelete="CASCADE"), primary_key=True)
+
+    # Estado serializado do TextSketch (count-min + candidatos top-k)
+    documents = Column(Integer, default=0, nullable=False)
+    sketch = Column(JSON, nullable=False)
+
+    # 🕐 TIMESTAMPS
+    updated_at = Column(DateTime, default=datetime.utcnow, onupdate=datetime.utcnow)
+
+
+class QuestionTextSummaryDelta(Base):
+    """Resposta de texto livre aguardando o merge no sketch (append-only, consumida em background)"""
+    __tablename__ = "question_text_summary_deltas"
+
+    id = Column(BigInteger, primary_key=True, autoincrement=True)
+    question_id = Column(String, ForeignKey("questions.id", ondelete="CASCADE"), nullable=False)
+    value = Column(Text, nullable=True)  # Valor armazenado da resposta (JSON string)
+    created_at = Column(DateTime, default=datetime.utcnow, nullable=False)
+
+
+class UserDashboardStats(Base):
+    """Resumo do dashboard por usuário, mantido incrementalmente (uma linha por usuário)"""
+    __tablename__ = "user_dashboard_stats"
+
+    user_id = Column(Integer, ForeignKey("users.id", ondelete="CASCADE"), primary_key=True)
+
+    # Contadores de formulários
+    total_forms = Column(Integer, default=0, nullable=False)
+    active_forms = Column(Integer, default=0, nullable=False)
+
+    # Contadores de respostas (janelas de calendário rolam quando o início muda)
+    total_responses = Column(Integer, default=0, nullable=False)
+    month_start = Column(DateTime, nullable=False)
+    responses_this_month = Column(Integer, default=0, nullable=False)
+    week_start = Column(DateTime, nullable=False)
+    responses_this_week = Column(Integer, default=0, nullable=False)
+
+    # Formulário com mais respostas
+    most_popular_form_id = Column(String, ForeignKey("forms.id", ondelete="SET NULL"), nullable=True)
+    most_popular_count = Column(Integer, default=0, nullable=False)
+
+    # 🕐 TIMESTAMPS
+    updated_at = Column(DateTime, default=datetime.utcnow, onupdate=datetime.utcnow)
+
+
+class ActivityEvent(Base):
+    """Evento do feed de atividades (append-only; respostas em rajada são agrupadas)"""
+    __tablename__ = "activity_events"
+
+    id = Column(BigInteger, primary_key=True, autoincrement=True)
+    user_id = Column(Integer, ForeignKey("users.id", ondelete="CASCADE"), nullable=False)
+
+    # Sem FK: o histórico sobrevive à remoção do formulário
+    form_id = Column(String, nullable=True)
+    form_title = Column(String(255), nullable=True)
+
+    # form_created, form_published, form_closed, form_response
+    type = Column(String(50), nullable=False)
+
+    # Quantidade de eventos agrupados (ex: 37 novas respostas)
+    count = Column(Integer, default=1, nullable=False)
+
+    # 🕐 TIMESTAMPS
+    created_at = Column(DateTime, default=datetime.utcnow, nullable=False)
+    last_event_at = Column(DateTime, default=datetime.utcnow, nullable=False)
+
+
+# Feed paginado por (last_event_at, id) decrescente
+Index("ix_activity_events_user_last_event", ActivityEvent.user_id, ActivityEvent.last_event_at.desc(), ActivityEvent.id.desc())
+
+
+class ExportJob(Base):
+    """Exportação de respostas processada em background, retomável a partir do checkpoint"""
+    __tablename__ = "export_jobs"
+
+    id = Column(String, primary_key=True, default=lambda: str(uuid.uuid4()))
+    form_id = Column(String, ForeignKey("forms.id", ondelete="CASCADE"), nullable=False, index=True)
+    user_id = Column(Integer, ForeignKey("users.id", ondelete="CASCADE"), nullable=False, index=True)
+
+    format = Column(String(10), nullable=False, default="csv")
+
+    # queued, running, completed, failed
+    status = Column(String(20), nullable=False, default="queued")
+
+    # Progresso
+    total_sessions = Column(Integer, default=0, nullable=False)
+    processed_sessions = Column(Integer, default=0, nullable=False)
+
+    # Checkpoint: cursor keyset da última sessão escrita e tamanho do arquivo
+    # naquele ponto (bytes além disso são descartados ao retomar)
+    checkpoint = Column(String, nullable=True)
+    bytes_written = Column(BigInteger, default=0, nullable=False)
+
+    # Perguntas (ids) fixadas na primeira execução, para colunas estáveis ao retomar
+    columns = Column(JSON, nullable=True)
+
+    storage_key = Column(String(500), nullable=True)
+    error = Column(Text, nullable=True)
+    attempts = Column(Integer, default=0, nullable=False)
+
+    # Lease do worker: job "running" sem heartbeat recente pode ser retomado
+    worker_id = Column(String(100), nullable=True)
+    heartbeat_at = Column(DateTime, nullable=True)
+
+    # 🕐 TIMESTAMPS
+    created_at = Column(DateTime, default=datetime.utcnow, nullable=False)
+    started_at = Column(DateTime, nullable=True)
+    finished_at = Column(DateTime, nullable=True)
+
+
+# Fila: jobs pendentes ORDER BY created_at (os concluídos ficam fora do índice)
+Index(
+    "ix_export_jobs_pending", ExportJob.created_at,
+    postgresql_where=ExportJob.status.in_(["queued", "running"])
+)
+
+# Limpeza por retenção: jobs encerrados ORDER BY finished_at
+Index(
+    "ix_export_jobs_finished", ExportJob.finished_at,
+    postgresql_where=ExportJob.status.in_(["completed", "failed"])
+)
+
+
+class ExportChunk(Base):
+    """Bloco de um arquivo exportado (um por append; ver DatabaseExportStorage)"""
+    __tablename__ = "export_chunks"
+
+    # Job dono do arquivo (a chave de storage é o id do job) e posição do bloco no arquivo
+    job_id = Column(String, ForeignKey("export_jobs.id", ondelete="CASCADE"), primary_key=True)
+    offset = Column(BigInteger, primary_key=True)
+
+    data = Column(LargeBinary, nullable=False)
+
+
+class RevokedToken(Base):
+    """
+    Revogação de JWT, sincronizada por todas as réplicas
+
+    Linha com `jti`: token individual (logout). Linha com `generation`: todos
+    os tokens do usuário emitidos antes dessa geração (troca de role).
+    Mantida até `expires_at` (o exp do token / da última geração revogada).
+    """
+    __tablename__ = "revoked_tokens"
+
+    id = Column(BigInteger, primary_key=True, autoincrement=True)
+    jti = Column(String(32), nullable=True, unique=True)
+    github_id = Column(Integer, nullable=True)
+    generation = Column(Integer, nullable=True)
+
+    revoked_at = Column(DateTime, default=datetime.utcnow, nullable=False, index=True)
+    expires_at = Column(DateTime, nullable=False, index=True)
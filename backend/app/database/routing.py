@@ -0,0 +1,155 @@
+"""
+Roteamento de Leituras - Réplica com Fallback
+============================================
+
+Leituras pesadas (dashboard, analytics, formulário público) podem ir para a
+réplica (DATABASE_REPLICA_URL); escritas continuam no primário via get_db.
+
+- get_read_db: dependency de leitura; usa a réplica quando ela está
+  configurada, saudável e com lag até REPLICA_MAX_LAG_SECONDS
+- Read-your-writes: após uma requisição de escrita bem-sucedida, o cliente
+  recebe o cookie READ_YOUR_WRITES_COOKIE por READ_YOUR_WRITES_SECONDS;
+  enquanto ele vale, as leituras desse cliente vão ao primário (o próprio
+  usuário vê o que acabou de gravar, mesmo com a réplica atrasada)
+- ReplicaMonitor: mede o lag em background; réplica inacessível ou
+  atrasada desvia todas as leituras para o primário até se recuperar
+
+Autor: Equipe de Desenvolvimento
+"""
+
+import asyncio
+import logging
+import math
+import time
+from typing import Optional
+
+from fastapi import Request
+from sqlalchemy import text
+from sqlalchemy.ext.asyncio import async_sessionmaker
+
+from app.config import settings
+from app.database.connection import ReplicaSessionLocal, replica_engine, session_factories
+
+logger = logging.getLogger(__name__)
+
+READ_YOUR_WRITES_COOKIE = "formerr_ryw"
+
+WRITE_METHODS = {"POST", "PUT", "PATCH", "DELETE"}
+
+# Em uma réplica sem atividade replay_timestamp fica parado; WAL recebido == aplicado é lag zero.
+# Fora de recovery (ex: segundo Postgres local em testes) as funções retornam NULL -> lag zero.
+_LAG_SQL = text(
+    "SELECT CASE WHEN pg_last_wal_receive_lsn() = pg_last_wal_replay_lsn() THEN 0 "
+    "ELSE COALESCE(EXTRACT(EPOCH FROM now() - pg_last_xact_replay_timestamp()), 0) END"
+)
+
+
+class ReplicaMonitor:
+    """Lag e disponibilidade da réplica, medidos em background"""
+
+    def __init__(self):
+        self.lag_seconds: Optional[float] = None
+        self.reachable = False
+        self._task: Optional["asyncio.Task[None]"] = None
+        self.stats = {"replica_reads": 0, "primary_reads": 0, "sticky_reads": 0, "fallback_reads": 0}
+
+    @property
+    def configured(self) -> bool:
+        return replica_engine is not None
+
+    @property
+    def healthy(self) -> bool:
+        return (
+            self.configured
+            and self.reachable
+            and self.lag_seconds is not None
+            and self.lag_seconds <= settings.REPLICA_MAX_LAG_SECONDS
+        )
+
+    async def check(self) -> None:
+        try:
+            async with replica_engine.connect() as conn:
+                self.lag_seconds = float(await conn.scalar(_LAG_SQL) or 0)
+            self.reachable = True
+        except Exception as e:
+            if self.reachable:
+                logger.warning(f"Réplica indisponível, leituras no primário: {e}")
+            self.reachable = False
+
+    def start(self) -> None:
+        if self.configured:
+            self._task = asyncio.create_task(self._run())
+
+    async def stop(self) -> None:
+        if self._task is not None:
+            self._task.cancel()
+            await asyncio.gather(self._task, return_exceptions=True)
+            self._task = None
+
+    async def _run(self) -> None:
+        while True:
+            await self.check()
+            await asyncio.sleep(settings.REPLICA_LAG_CHECK_SECONDS)
+
+
+def wrote_recently(request: Request) -> bool:
+    """Cliente dentro da janela de read-your-writes"""
+    value = request.cookies.get(READ_YOUR_WRITES_COOKIE)
+    try:
+        return value is not None and float(value) > time.time()
+    except ValueError:
+        return False
+
+
+def read_sessionmaker(request: Request, pool: str = "interactive") -> async_sessionmaker:
+    """Session factory para leituras desta requisição (réplica ou o pool indicado do primário)"""
+    if not replica_monitor.configured:
+        replica_monitor.stats["primary_reads"] += 1
+        return session_factories[pool]
+    if wrote_recently(request):
+        replica_monitor.stats["sticky_reads"] += 1
+        return session_factories[pool]
+    if not replica_monitor.healthy:
+        replica_monitor.stats["fallback_reads"] += 1
+        return session_factories[pool]
+    replica_monitor.stats["replica_reads"] += 1
+    return ReplicaSessionLocal
+
+
+async def get_read_db(request: Request):
+    """Database dependency para rotas somente leitura"""
+    async with read_sessionmaker(request)() as session:
+        try:
+            yield session
+        finally:
+            await session.close()
+
+
+async def get_analytics_read_db(request: Request):
+    """Leitura pesada (agregações, busca): réplica ou o pool analytics do primário"""
+    async with read_sessionmaker(request, "analytics")() as session:
+        try:
+            yield session
+        finally:
+            await session.close()
+
+
+async def read_your_writes_middleware(request: Request, call_next):
+    """Marca o cliente após uma escrita bem-sucedida para ler do primário por alguns segundos"""
+    response = await call_next(request)
+    if replica_monitor.configured and request.method in WRITE_METHODS and response.status_code < 400:
+        # A janela cobre pelo menos o lag atual da réplica
+        window = max(settings.READ_YOUR_WRITES_SECONDS, math.ceil(replica_monitor.lag_seconds or 0) + 1)
+        response.set_cookie(
+            READ_YOUR_WRITES_COOKIE,
+            str(time.time() + window),
+            max_age=window,
+            httponly=True,
+            secure=settings.ENVIRONMENT != "development",
+            samesite="none" if settings.ENVIRONMENT != "development" else "lax",
+        )
+    return response
+
+
+# Instances
+replica_monitor = ReplicaMonitor()
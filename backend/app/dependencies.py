@@ -6,6 +6,7 @@ Este arquivo contém as dependências reutilizáveis do FastAPI para:
 - Autenticação de usuários
 - Verificação de permissões
 - Validação de tokens JWT
+- Resolução de identidade e posse de formulários (com cache)
 
 Dependencies são funções que podem ser injetadas automaticamente
 nas rotas do FastAPI usando o sistema de Dependency Injection.
@@ -15,8 +16,15 @@ Autor: Equipe de Desenvolvimento
 
 from typing import Dict, Any, Optional
 from fastapi import Depends, HTTPException, Request, status
+from sqlalchemy import select
+from sqlalchemy.ext.asyncio import AsyncSession
 from app.auth.service import verify_jwt_token, check_permission
 from app.auth.models import Permission
+from app.auth.revocation import revocation_registry
+from app.auth.token_cache import token_cache
+from app.core.cache import form_owner_cache, user_id_cache
+from app.database.connection import get_db
+from app.database.models import Form, User
 
 
 async def get_current_user(request: Request) -> Dict[str, Any]:
@@ -56,8 +64,19 @@ async def get_current_user(request: Request) -> Dict[str, Any]:
     # Extrai o token do header (remove "Bearer ")
     token = auth_header.split(" ")[1]
     
-    # Verifica a validade do token
-    user_data = verify_jwt_token(token)
+    # Tokens já verificados vêm do cache (revogação checada no hit)
+    user_data = token_cache.get(token)
+    if user_data is None:
+        # Verifica a validade do token
+        user_data = verify_jwt_token(token)
+        if user_data and token_cache.is_revoked(token):
+            user_data = None
+        if user_data:
+            token_cache.put(token, user_data)
+
+    # Logout / troca de role em qualquer réplica (dict em memória; sem banco por requisição)
+    if user_data and await revocation_registry.is_revoked(user_data):
+        user_data = None
 
     if not user_data:
         raise HTTPException(
@@ -177,4 +196,70 @@ def require_admin_permission():
     - Acessar métricas globais
     - Configurar permissões
     """
-    return require_permission(Permission.MANAGE_USERS)
\ No newline at end of file
+    return require_permission(Permission.MANAGE_USERS)
+
+
+# ==========================================
+# IDENTIDADE E POSSE
+# ==========================================
+
+async def resolve_user_id(db: AsyncSession, current_user: Dict[str, Any]) -> int:
+    """
+    Retorna o id interno (users.id) do usuário autenticado
+
+    Usa a claim `uid` do token quando presente; tokens antigos caem no
+    cache github_id -> user_id e, por último, no banco.
+
+    Raises:
+        HTTPException: 404 se o usuário não existir no banco
+    """
+    user_id = current_user.get("uid")
+    if user_id is not None:
+        return user_id
+
+    github_id = current_user["github_id"]
+    user_id = user_id_cache.get(github_id)
+    if user_id is None:
+        result = await db.execute(select(User.id).where(User.github_id == github_id))
+        user_id = result.scalar_one_or_none()
+        if user_id is None:
+            raise HTTPException(status_code=404, detail="Usuário não encontrado")
+        user_id_cache.set(github_id, user_id)
+    return user_id
+
+
+async def get_current_user_id(
+    current_user: Dict[str, Any] = Depends(get_current_user),
+    db: AsyncSession = Depends(get_db)
+) -> int:
+    """
+    Dependency com o id interno do usuário autenticado
+
+    Exemplo de uso:
+        @app.get("/meus-formularios")
+        async def my_forms(user_id: int = Depends(get_current_user_id)):
+            ...
+    """
+    return await resolve_user_id(db, current_user)
+
+
+async def ensure_form_owner(db: AsyncSession, form_id: str, user_id: int) -> None:
+    """
+    Garante que o formulário existe e pertence ao usuário
+
+    O dono de cada formulário fica em cache (form_id -> owner_id), então a
+    verificação normalmente não vai ao banco. Remover ou transferir um
+    formulário deve invalidar form_owner_cache.
+
+    Raises:
+        HTTPException: 404 se o formulário não existir ou não for do usuário
+    """
+    owner_id = form_owner_cache.get(form_id)
+    if owner_id is None:
+        result = await db.execute(select(Form.user_id).where(Form.id == form_id))
+        owner_id = result.scalar_one_or_none()
+        if owner_id is None:
+            raise HTTPException(status_code=404, detail="Formulário não encontrado")
+        form_owner_cache.set(form_id, owner_id)
+    if owner_id != user_id:
+        raise HTTPException(status_code=404, detail="Formulário não encontrado")
@@ -0,0 +1,141 @@
+"""
+Fila de E-mails - Envio Assíncrono em Lotes
+==========================================
+
+A requisição apenas enfileira (put_nowait, sem I/O); o envio acontece em
+workers iniciados no startup da API:
+
+- Cada worker pega a primeira mensagem disponível e junta as que já estão
+  na fila até o limite de lote do sink (Mailjet aceita 50 por chamada)
+- Falhas transitórias são repetidas com backoff exponencial + jitter
+  (EMAIL_MAX_RETRIES); falhas definitivas (ex: 4xx do provedor) descartam
+  o lote e são registradas em log
+- Lote recusado por mensagens inválidas (EmailBatchRejected): só as
+  recusadas são descartadas, as demais são reenviadas em seguida
+- Fila limitada (EMAIL_QUEUE_MAX_SIZE): sob abuso as mensagens excedentes
+  são descartadas em vez de crescer a memória
+- No shutdown os workers drenam o que restou na fila (com timeout)
+
+Autor: Equipe de Desenvolvimento
+"""
+
+import asyncio
+import logging
+import random
+from typing import List, Optional
+
+from app.config import settings
+from app.email.sinks import EmailBatchRejected, EmailMessage, EmailSendError, EmailSink, create_email_sink
+
+logger = logging.getLogger(__name__)
+
+# Backoff entre tentativas: BASE * 2^(tentativa-1), limitado a MAX
+RETRY_BASE_SECONDS = 0.5
+RETRY_MAX_SECONDS = 30.0
+
+# Tempo máximo para drenar a fila no shutdown
+SHUTDOWN_DRAIN_SECONDS = 10.0
+
+
+class EmailQueue:
+    """Fila em memória com pool de workers de envio"""
+
+    def __init__(self, concurrency: int, max_size: int, max_retries: int):
+        self.concurrency = concurrency
+        self.max_retries = max_retries
+        self._queue: "asyncio.Queue[EmailMessage]" = asyncio.Queue(maxsize=max_size)
+        self._sink: Optional[EmailSink] = None
+        self._tasks: List["asyncio.Task[None]"] = []
+        self.stats = {"enqueued": 0, "sent": 0, "failed": 0, "retried": 0, "dropped": 0, "batches": 0}
+
+    @property
+    def depth(self) -> int:
+        return self._queue.qsize()
+
+    @property
+    def capacity(self) -> int:
+        return self._queue.maxsize
+
+    def enqueue(self, message: EmailMessage) -> bool:
+        """Enfileira sem bloquear; False se a fila estiver cheia"""
+        try:
+            self._queue.put_nowait(message)
+        except asyncio.QueueFull:
+            self.stats["dropped"] += 1
+            logger.warning(f"Fila de e-mail cheia; mensagem para {message.to_email} descartada")
+            return False
+        self.stats["enqueued"] += 1
+        return True
+
+    def start(self, sink: Optional[EmailSink] = None) -> None:
+        self._sink = sink or create_email_sink()
+        for index in range(self.concurrency):
+            self._tasks.append(asyncio.create_task(self._run(index)))
+        logger.info(f"{self.concurrency} worker(s) de e-mail iniciados ({type(self._sink).__name__})")
+
+    async def stop(self) -> None:
+        if not self._tasks:
+            return
+        try:
+            await asyncio.wait_for(self._queue.join(), timeout=SHUTDOWN_DRAIN_SECONDS)
+        except asyncio.TimeoutError:
+            logger.warning(f"Shutdown com {self.depth} e-mail(s) ainda na fila")
+        for task in self._tasks:
+            task.cancel()
+        await asyncio.gather(*self._tasks, return_exceptions=True)
+        self._tasks = []
+        await self._sink.close()
+
+    def _next_batch(self, first: EmailMessage) -> List[EmailMessage]:
+        batch = [first]
+        while len(batch) < self._sink.max_batch_size:
+            try:
+                batch.append(self._queue.get_nowait())
+            except asyncio.QueueEmpty:
+                break
+        return batch
+
+    async def _run(self, index: int) -> None:
+        while True:
+            batch = self._next_batch(await self._queue.get())
+            # _send_with_retry remove daqui as mensagens recusadas individualmente
+            pending = list(batch)
+            try:
+                await self._send_with_retry(pending)
+            except asyncio.CancelledError:
+                raise
+            except Exception as e:
+                self.stats["failed"] += len(pending)
+                logger.error(f"Worker de e-mail {index}: lote de {len(pending)} descartado: {e}")
+            finally:
+                for _ in batch:
+                    self._queue.task_done()
+
+    async def _send_with_retry(self, batch: List[EmailMessage]) -> None:
+        attempt = 1
+        while batch:
+            try:
+                await self._sink.send_batch(batch)
+                self.stats["sent"] += len(batch)
+                self.stats["batches"] += 1
+                return
+            except EmailBatchRejected as e:
+                rejected = set(e.rejected)
+                self.stats["failed"] += len(rejected)
+                logger.error(
+                    f"E-mail recusado pelo provedor para "
+                    f"{', '.join(batch[i].to_email for i in sorted(rejected))}: {e}"
+                )
+                batch[:] = [m for i, m in enumerate(batch) if i not in rejected]
+            except EmailSendError as e:
+                if not e.retryable or attempt > self.max_retries:
+                    raise
+                delay = min(RETRY_MAX_SECONDS, RETRY_BASE_SECONDS * 2 ** (attempt - 1))
+                self.stats["retried"] += 1
+                logger.warning(f"Envio de e-mail falhou (tentativa {attempt}): {e}; nova tentativa em {delay:.1f}s")
+                await asyncio.sleep(delay * random.uniform(0.5, 1.0))
+                attempt += 1
+
+
+# Instances
+email_queue = EmailQueue(settings.EMAIL_WORKERS, settings.EMAIL_QUEUE_MAX_SIZE, settings.EMAIL_MAX_RETRIES)
@@ -0,0 +1,90 @@
+"""
+Serviço de E-mail - Códigos de Acesso e Notificações
+===================================================
+
+Monta as mensagens e as entrega à fila de envio (app/email/queue.py). Os
+métodos são síncronos e não fazem I/O: o custo na requisição é apenas o
+put_nowait na fila, e a latência do provedor fica nos workers.
+
+Autor: Equipe de Desenvolvimento
+"""
+
+import html
+import secrets
+from typing import Any, Dict, Optional
+
+from app.email.queue import email_queue
+from app.email.sinks import EmailMessage
+
+# Dígitos do código de acesso
+AUTH_CODE_LENGTH = 6
+
+
+class EmailService:
+    """Composição de e-mails transacionais"""
+
+    @staticmethod
+    def generate_auth_code() -> str:
+        """Código numérico gerado com fonte criptográfica"""
+        return "".join(secrets.choice("0123456789") for _ in range(AUTH_CODE_LENGTH))
+
+    @staticmethod
+    def send(message: EmailMessage) -> Dict[str, Any]:
+        """Enfileira uma mensagem; `success` indica apenas que foi aceita na fila"""
+        queued = email_queue.enqueue(message)
+        return {"success": queued, "queued": queued, "to": message.to_email}
+
+    def send_auth_code(
+            self,
+            to_email: str,
+            to_name: str,
+            auth_code: str,
+            form_title: str,
+            expires_in_minutes: int
+    ) -> Dict[str, Any]:
+        """Código de acesso a um formulário"""
+        subject = f"Seu código de acesso: {auth_code}"
+        text = (
+            f"Olá, {to_name}!\n\n"
+            f"Use o código {auth_code} para acessar o formulário \"{form_title}\".\n"
+            f"O código expira em {expires_in_minutes} minutos.\n\n"
+            "Se você não solicitou este código, ignore este e-mail."
+        )
+        body = (
+            f"<p>Olá, {html.escape(to_name)}!</p>"
+            f"<p>Use o código abaixo para acessar o formulário <strong>{html.escape(form_title)}</strong>:</p>"
+            f"<p style=\"font-size:28px;letter-spacing:6px;font-weight:bold\">{auth_code}</p>"
+            f"<p>O código expira em {expires_in_minutes} minutos.</p>"
+            "<p>Se você não solicitou este código, ignore este e-mail.</p>"
+        )
+        return self.send(EmailMessage(
+            to_email=to_email,
+            to_name=to_name,
+            subject=subject,
+            text=text,
+            html=body,
+            tags={"type": "auth_code"},
+        ))
+
+    def send_notification(
+            self,
+            to_email: str,
+            to_name: str,
+            subject: str,
+            text: str,
+            html_body: Optional[str] = None,
+            notification_type: str = "notification"
+    ) -> Dict[str, Any]:
+        """Notificação genérica (ex: nova resposta, exportação concluída)"""
+        return self.send(EmailMessage(
+            to_email=to_email,
+            to_name=to_name,
+            subject=subject,
+            text=text,
+            html=html_body,
+            tags={"type": notification_type},
+        ))
+
+
+# Instances
+email_service = EmailService()
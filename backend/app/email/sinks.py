@@ -0,0 +1,197 @@
+"""
+Destinos de E-mail - Provedores de Envio
+=======================================
+
+Cada sink envia um lote de mensagens; selecionado por EMAIL_BACKEND:
+
+- "mailjet": API v3.1 do Mailjet (até 50 mensagens por chamada) sobre um
+  httpx.AsyncClient reaproveitado entre lotes (keep-alive). Uma mensagem
+  inválida faz o Mailjet recusar o lote inteiro: o status por mensagem
+  (Messages[].Status) indica quais reenviar (EmailBatchRejected)
+- "smtp": servidor SMTP (ex: MailHog/Mailpit em desenvolvimento); uma
+  conexão por lote
+- "file": grava as mensagens como JSON lines em EMAIL_FILE_PATH, para
+  testes e ambientes sem provedor (recusado com ENVIRONMENT=production)
+
+Autor: Equipe de Desenvolvimento
+"""
+
+import asyncio
+import json
+import smtplib
+from abc import ABC, abstractmethod
+from dataclasses import asdict, dataclass, field
+from datetime import datetime
+from email.message import EmailMessage as MimeMessage
+from pathlib import Path
+from typing import Dict, List, Optional
+
+import httpx
+
+from app.config import settings
+
+
+@dataclass
+class EmailMessage:
+    to_email: str
+    to_name: str
+    subject: str
+    text: str
+    html: Optional[str] = None
+    tags: Dict[str, str] = field(default_factory=dict)
+
+
+class EmailSendError(Exception):
+    """Falha no envio; `retryable` indica se vale tentar novamente"""
+
+    def __init__(self, message: str, retryable: bool = True):
+        super().__init__(message)
+        self.retryable = retryable
+
+
+class EmailBatchRejected(EmailSendError):
+    """Lote recusado por causa de mensagens inválidas; as demais podem ser reenviadas"""
+
+    def __init__(self, message: str, rejected: List[int]):
+        super().__init__(message, retryable=False)
+        # Índices (no lote) das mensagens recusadas
+        self.rejected = rejected
+
+
+class EmailSink(ABC):
+    """Destino de um lote de mensagens"""
+
+    # Mensagens por chamada ao provedor
+    max_batch_size: int = 1
+
+    @abstractmethod
+    async def send_batch(self, messages: List[EmailMessage]) -> None:
+        """Envia o lote inteiro ou levanta EmailSendError"""
+
+    async def close(self) -> None:
+        pass
+
+
+class MailjetSink(EmailSink):
+    """Mailjet Send API v3.1 (lote nativo, conexão HTTP reaproveitada)"""
+
+    max_batch_size = 50
+    SEND_URL = "https://api.mailjet.com/v3.1/send"
+
+    def __init__(self, api_key: str, api_secret: str, from_email: str, from_name: str, timeout: float = 10.0):
+        self.from_address = {"Email": from_email, "Name": from_name}
+        self._client = httpx.AsyncClient(auth=(api_key, api_secret), timeout=timeout)
+
+    async def send_batch(self, messages: List[EmailMessage]) -> None:
+        payload = {"Messages": [
+            {
+                "From": self.from_address,
+                "To": [{"Email": m.to_email, "Name": m.to_name}],
+                "Subject": m.subject,
+                "TextPart": m.text,
+                **({"HTMLPart": m.html} if m.html else {}),
+                **({"EventPayload": json.dumps(m.tags)} if m.tags else {}),
+            }
+            for m in messages
+        ]}
+        try:
+            response = await self._client.post(self.SEND_URL, json=payload)
+        except httpx.HTTPError as e:
+            raise EmailSendError(f"Mailjet indisponível: {e}") from e
+        if response.status_code >= 400:
+            rejected = self._rejected_messages(response, len(messages))
+            if rejected:
+                raise EmailBatchRejected(
+                    f"Mailjet recusou {len(rejected)} de {len(messages)} mensagem(ns): {response.text[:200]}",
+                    rejected
+                )
+            # 429 e 5xx são transitórios; os demais 4xx não mudam com nova tentativa
+            retryable = response.status_code == 429 or response.status_code >= 500
+            raise EmailSendError(f"Mailjet respondeu {response.status_code}: {response.text[:200]}", retryable)
+
+    @staticmethod
+    def _rejected_messages(response: httpx.Response, batch_size: int) -> List[int]:
+        """Índices com Status "error" no corpo do 400 (vazio se o corpo não trouxer o status por mensagem)"""
+        if response.status_code != 400:
+            return []
+        try:
+            results = response.json().get("Messages")
+        except ValueError:
+            return []
+        if not isinstance(results, list) or len(results) != batch_size:
+            return []
+        return [index for index, result in enumerate(results) if result.get("Status") != "success"]
+
+    async def close(self) -> None:
+        await self._client.aclose()
+
+
+class SmtpSink(EmailSink):
+    """Servidor SMTP; o lote é enviado em uma única conexão"""
+
+    max_batch_size = 20
+
+    def __init__(self, host: str, port: int, from_email: str, from_name: str,
+                 username: str = "", password: str = "", use_tls: bool = False):
+        self.host, self.port = host, port
+        self.from_header = f"{from_name} <{from_email}>"
+        self.username, self.password, self.use_tls = username, password, use_tls
+
+    def _send_sync(self, messages: List[EmailMessage]) -> None:
+        with smtplib.SMTP(self.host, self.port, timeout=10) as smtp:
+            if self.use_tls:
+                smtp.starttls()
+            if self.username:
+                smtp.login(self.username, self.password)
+            for m in messages:
+                mime = MimeMessage()
+                mime["From"] = self.from_header
+                mime["To"] = f"{m.to_name} <{m.to_email}>"
+                mime["Subject"] = m.subject
+                mime.set_content(m.text)
+                if m.html:
+                    mime.add_alternative(m.html, subtype="html")
+                smtp.send_message(mime)
+
+    async def send_batch(self, messages: List[EmailMessage]) -> None:
+        try:
+            await asyncio.to_thread(self._send_sync, messages)
+        except (smtplib.SMTPException, OSError) as e:
+            raise EmailSendError(f"Falha SMTP: {e}") from e
+
+
+class FileSink(EmailSink):
+    """Grava as mensagens em JSON lines (substituto local do provedor)"""
+
+    max_batch_size = 100
+
+    def __init__(self, path: str):
+        self.path = Path(path)
+
+    def _append(self, messages: List[EmailMessage]) -> None:
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        sent_at = datetime.utcnow().isoformat()
+        with self.path.open("a", encoding="utf-8") as f:
+            for m in messages:
+                f.write(json.dumps({"sent_at": sent_at, **asdict(m)}, ensure_ascii=False) + "\n")
+
+    async def send_batch(self, messages: List[EmailMessage]) -> None:
+        await asyncio.to_thread(self._append, messages)
+
+
+def create_email_sink() -> EmailSink:
+    """Sink configurado em EMAIL_BACKEND"""
+    backend = settings.EMAIL_BACKEND
+    if backend == "file" and settings.ENVIRONMENT == "production":
+        raise ValueError("EMAIL_BACKEND=file em produção: configure 'mailjet' ou 'smtp'")
+    if backend == "mailjet":
+        if not (settings.MAILJET_API_KEY and settings.MAILJET_API_SECRET):
+            raise ValueError("EMAIL_BACKEND=mailjet requer MAILJET_API_KEY e MAILJET_API_SECRET")
+        return MailjetSink(settings.MAILJET_API_KEY, settings.MAILJET_API_SECRET,
+                           settings.EMAIL_FROM, settings.EMAIL_FROM_NAME)
+    if backend == "smtp":
+        return SmtpSink(settings.SMTP_HOST, settings.SMTP_PORT, settings.EMAIL_FROM, settings.EMAIL_FROM_NAME,
+                        settings.SMTP_USERNAME, settings.SMTP_PASSWORD, settings.SMTP_USE_TLS)
+    if backend == "file":
+        return FileSink(settings.EMAIL_FILE_PATH)
+    raise ValueError(f"EMAIL_BACKEND inválido: {backend!r} (use 'mailjet', 'smtp' ou 'file')")
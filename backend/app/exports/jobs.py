@@ -0,0 +1,395 @@
+"""
+Jobs de Exportação - Fila, Workers e Checkpoint
+==============================================
+
+Exportações grandes rodam fora da requisição HTTP:
+
+- POST /forms/{form_id}/exports enfileira um ExportJob (status "queued")
+- Workers (iniciados no startup da API) reservam jobs com
+  FOR UPDATE SKIP LOCKED, respeitando um limite de jobs simultâneos por dono
+- O job avança em blocos keyset-ordenados por (submitted_at, id); após cada
+  bloco o arquivo é estendido e o checkpoint (cursor + bytes escritos) é
+  gravado na mesma atualização do progresso
+- Um worker que cai deixa de renovar o heartbeat; após o lease o job volta a
+  ser reservável e é retomado do checkpoint (o arquivo é truncado para
+  bytes_written, descartando um bloco parcialmente escrito). Se o arquivo
+  tiver menos bytes que o checkpoint (perdido ou em outro storage), o job
+  recomeça do zero
+- Cada bloco só é gravado com o lease confirmado e exatamente na posição
+  bytes_written: um worker que travou e perdeu o lease não acrescenta linhas
+  ao arquivo de quem retomou o job (ExportStorageConflict encerra o worker
+  antigo como lease perdido)
+- Jobs concluídos ou falhos há mais de EXPORT_RETENTION_DAYS são removidos
+  pelos workers junto com o arquivo (no storage em banco, os blocos saem em
+  cascata com o job); remover o formulário remove seus jobs e arquivos
+
+Autor: Equipe de Desenvolvimento
+"""
+
+import asyncio
+import logging
+import os
+import socket
+import time
+import uuid
+from datetime import datetime, timedelta
+from typing import Dict, List, Optional, Tuple
+
+from sqlalchemy import and_, delete, func, or_, select, text, tuple_, update
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.config import settings
+from app.core.pagination import decode_cursor, encode_cursor
+from app.database.connection import session_factories
+from app.database.models import ExportJob, Form, Question, Response, ResponseSession, Section
+from app.exports.service import FIXED_COLUMNS, format_answer
+from app.exports.storage import ExportStorageConflict, export_storage
+from app.exports.writers import CsvExportWriter
+
+logger = logging.getLogger(__name__)
+
+BackgroundSessionLocal = session_factories["background"]
+
+# Sessões por bloco (uma transação curta por bloco)
+JOB_CHUNK_SIZE = 1000
+
+# Job "running" sem heartbeat por este tempo é considerado abandonado
+JOB_LEASE_SECONDS = 120
+
+# Tentativas antes de marcar o job como "failed"
+JOB_MAX_ATTEMPTS = 3
+
+# Intervalo de polling da fila quando não há jobs
+POLL_INTERVAL_SECONDS = 2.0
+
+# Intervalo (por worker) da limpeza de jobs expirados e jobs removidos por rodada
+PURGE_INTERVAL_SECONDS = 600
+PURGE_BATCH_SIZE = 100
+
+
+class ExportJobService:
+    """Operações de fila e processamento dos jobs"""
+
+    @staticmethod
+    async def enqueue(db: AsyncSession, form: Form, export_format: str = "csv") -> ExportJob:
+        """Cria um job para o formulário (commit fica a cargo do chamador)"""
+        job_id = str(uuid.uuid4())
+        job = ExportJob(
+            id=job_id,
+            form_id=form.id,
+            user_id=form.user_id,
+            format=export_format,
+            total_sessions=form.total_responses or 0,
+            storage_key=export_storage.key_for(form.id, job_id, export_format),
+        )
+        db.add(job)
+        return job
+
+    @staticmethod
+    async def claim_next(db: AsyncSession, worker_id: str) -> Optional[ExportJob]:
+        """
+        Reserva o próximo job disponível (ou abandonado) respeitando o limite por dono
+
+        O filtro por dono na consulta evita escolher jobs de donos saturados; a
+        recontagem sob advisory lock por dono fecha a corrida entre workers.
+        """
+        now = datetime.utcnow()
+        lease_cutoff = now - timedelta(seconds=JOB_LEASE_SECONDS)
+        max_per_owner = settings.EXPORT_MAX_JOBS_PER_OWNER
+
+        running = ExportJob.__table__.alias("running")
+        running_for_owner = (
+            select(func.count())
+            .select_from(running)
+            .where(
+                running.c.user_id == ExportJob.user_id,
+                running.c.status == "running",
+                running.c.heartbeat_at >= lease_cutoff,
+            )
+            .scalar_subquery()
+        )
+
+        result = await db.execute(
+            select(ExportJob)
+            .where(
+                or_(
+                    ExportJob.status == "queued",
+                    and_(ExportJob.status == "running", ExportJob.heartbeat_at < lease_cutoff),
+                ),
+                running_for_owner < max_per_owner,
+            )
+            .order_by(ExportJob.created_at)
+            .limit(1)
+            .with_for_update(skip_locked=True, of=ExportJob)
+        )
+        job = result.scalar_one_or_none()
+        if job is None:
+            await db.rollback()
+            return None
+
+        await db.execute(
+            text("SELECT pg_advisory_xact_lock(hashtext(:key))"),
+            {"key": f"export_jobs:{job.user_id}"}
+        )
+        running_now = await db.scalar(
+            select(func.count()).select_from(ExportJob).where(
+                ExportJob.user_id == job.user_id,
+                ExportJob.status == "running",
+                ExportJob.heartbeat_at >= lease_cutoff,
+                ExportJob.id != job.id,
+            )
+        )
+        if running_now >= max_per_owner:
+            await db.rollback()
+            return None
+
+        job.status = "running"
+        job.worker_id = worker_id
+        job.heartbeat_at = now
+        job.started_at = job.started_at or now
+        job.attempts += 1
+        await db.commit()
+        return job
+
+    @staticmethod
+    async def purge_expired(db: AsyncSession) -> int:
+        """
+        Remove jobs encerrados além da retenção e seus arquivos
+
+        SKIP LOCKED deixa workers de outras réplicas limparem lotes diferentes.
+        O arquivo sai antes da linha: se a remoção falhar no meio, o job
+        continua visível e a próxima rodada tenta de novo.
+        """
+        cutoff = datetime.utcnow() - timedelta(days=settings.EXPORT_RETENTION_DAYS)
+        result = await db.execute(
+            select(ExportJob.id, ExportJob.storage_key)
+            .where(ExportJob.status.in_(["completed", "failed"]), ExportJob.finished_at < cutoff)
+            .order_by(ExportJob.finished_at)
+            .limit(PURGE_BATCH_SIZE)
+            .with_for_update(skip_locked=True)
+        )
+        expired = result.all()
+        for job in expired:
+            if job.storage_key:
+                await export_storage.delete(job.storage_key)
+        if expired:
+            await db.execute(delete(ExportJob).where(ExportJob.id.in_([job.id for job in expired])))
+        await db.commit()
+        return len(expired)
+
+    @staticmethod
+    async def storage_keys_for_form(db: AsyncSession, form_id: str) -> List[str]:
+        """Arquivos dos jobs do formulário (removidos após apagar o formulário)"""
+        result = await db.execute(
+            select(ExportJob.storage_key).where(ExportJob.form_id == form_id, ExportJob.storage_key.isnot(None))
+        )
+        return list(result.scalars())
+
+    @staticmethod
+    async def delete_files(storage_keys: List[str]) -> None:
+        """Remove arquivos de jobs já apagados; falhas só são registradas"""
+        for key in storage_keys:
+            try:
+                await export_storage.delete(key)
+            except Exception as e:
+                logger.error(f"Erro ao remover arquivo de exportação {key}: {e}")
+
+    @staticmethod
+    async def _load_columns(db: AsyncSession, form_id: str) -> List[Dict[str, str]]:
+        result = await db.execute(
+            select(Question.id, Question.title)
+            .join(Section, Question.section_id == Section.id)
+            .where(Section.form_id == form_id)
+            .order_by(Section.order, Question.order, Question.id)
+        )
+        return [{"id": row.id, "title": row.title} for row in result]
+
+    @staticmethod
+    async def _fetch_chunk(
+            db: AsyncSession,
+            form_id: str,
+            checkpoint: Optional[str],
+            question_ids: List[str]
+    ) -> Tuple[List[List[str]], Optional[str]]:
+        """Próximo bloco de sessões após o checkpoint, pivotado em linhas, e o novo checkpoint"""
+        stmt = (
+            select(ResponseSession.id, ResponseSession.submitted_at, ResponseSession.respondent_email)
+            .where(ResponseSession.form_id == form_id)
+            .order_by(ResponseSession.submitted_at, ResponseSession.id)
+            .limit(JOB_CHUNK_SIZE)
+        )
+        if checkpoint:
+            submitted_at, session_id = decode_cursor(checkpoint, 2)
+            stmt = stmt.where(
+                tuple_(ResponseSession.submitted_at, ResponseSession.id) > tuple_(submitted_at, session_id)
+            )
+        sessions = (await db.execute(stmt)).all()
+        if not sessions:
+            return [], checkpoint
+
+        answers: Dict[str, Dict[str, Optional[str]]] = {s.id: {} for s in sessions}
+        result = await db.execute(
+            select(Response.session_id, Response.question_id, Response.value)
+            .where(Response.session_id.in_(list(answers)))
+        )
+        for row in result:
+            answers[row.session_id][row.question_id] = row.value
+
+        rows = [
+            [s.id, s.submitted_at.isoformat() if s.submitted_at else "", s.respondent_email or ""]
+            + [format_answer(answers[s.id].get(question_id)) for question_id in question_ids]
+            for s in sessions
+        ]
+        return rows, encode_cursor(sessions[-1].submitted_at, sessions[-1].id)
+
+    @staticmethod
+    async def _save_progress(db: AsyncSession, job_id: str, worker_id: str, **values) -> bool:
+        """Atualiza o job se o lease ainda for deste worker"""
+        result = await db.execute(
+            update(ExportJob)
+            .where(ExportJob.id == job_id, ExportJob.worker_id == worker_id, ExportJob.status == "running")
+            .values(heartbeat_at=datetime.utcnow(), **values)
+        )
+        await db.commit()
+        return result.rowcount == 1
+
+    @classmethod
+    async def _append(
+            cls, db: AsyncSession, job_id: str, worker_id: str, storage_key: str, offset: int, data: bytes
+    ) -> bool:
+        """Grava o bloco em `offset` se o lease ainda for deste worker"""
+        if not await cls._save_progress(db, job_id, worker_id):
+            return False
+        try:
+            await export_storage.append(storage_key, offset, data)
+        except ExportStorageConflict as e:
+            logger.warning(f"Arquivo do job de exportação {job_id} alterado por outro worker: {e}")
+            return False
+        return True
+
+    @classmethod
+    async def process(cls, job_id: str, worker_id: str) -> None:
+        """Executa (ou retoma) um job reservado por este worker"""
+        async with BackgroundSessionLocal() as db:
+            job = await db.get(ExportJob, job_id)
+            if job is None:
+                return
+            form_id, storage_key, attempts = job.form_id, job.storage_key, job.attempts
+            checkpoint, bytes_written, processed = job.checkpoint, job.bytes_written, job.processed_sessions
+            columns = job.columns
+
+            try:
+                writer = CsvExportWriter()
+                if bytes_written and await export_storage.size(storage_key) < bytes_written:
+                    logger.warning(f"Arquivo do job de exportação {job_id} menor que o checkpoint; recomeçando do zero")
+                    checkpoint, bytes_written, processed, columns = None, 0, 0, None
+                await export_storage.truncate(storage_key, bytes_written)
+
+                if columns is None:
+                    columns = await cls._load_columns(db, form_id)
+                    header = writer.header(FIXED_COLUMNS + [c["title"] for c in columns])
+                    if not await cls._append(db, job_id, worker_id, storage_key, 0, header):
+                        logger.warning(f"Job de exportação {job_id} perdeu o lease; interrompendo")
+                        return
+                    bytes_written = len(header)
+                    if not await cls._save_progress(
+                            db, job_id, worker_id,
+                            columns=columns,
+                            checkpoint=checkpoint,
+                            bytes_written=bytes_written,
+                            processed_sessions=processed,
+                    ):
+                        return
+                question_ids = [c["id"] for c in columns]
+
+                while True:
+                    rows, checkpoint = await cls._fetch_chunk(db, form_id, checkpoint, question_ids)
+                    if not rows:
+                        break
+                    data = writer.rows(rows)
+                    if not await cls._append(db, job_id, worker_id, storage_key, bytes_written, data):
+                        logger.warning(f"Job de exportação {job_id} perdeu o lease; interrompendo")
+                        return
+                    bytes_written += len(data)
+                    processed += len(rows)
+                    if not await cls._save_progress(
+                            db, job_id, worker_id,
+                            checkpoint=checkpoint,
+                            bytes_written=bytes_written,
+                            processed_sessions=processed,
+                    ):
+                        logger.warning(f"Job de exportação {job_id} perdeu o lease; interrompendo")
+                        return
+
+                await cls._save_progress(
+                    db, job_id, worker_id,
+                    status="completed",
+                    finished_at=datetime.utcnow(),
+                    total_sessions=processed,
+                    error=None,
+                )
+                logger.info(f"Job de exportação {job_id} concluído: {processed} sessões")
+
+            except Exception as e:
+                await db.rollback()
+                failed = attempts >= JOB_MAX_ATTEMPTS
+                logger.error(f"Falha no job de exportação {job_id} (tentativa {attempts}): {e}")
+                await cls._save_progress(
+                    db, job_id, worker_id,
+                    status="failed" if failed else "queued",
+                    finished_at=datetime.utcnow() if failed else None,
+                    error=str(e),
+                )
+
+
+class ExportWorkerPool:
+    """Workers em background que consomem a fila de exportação"""
+
+    def __init__(self, concurrency: int):
+        self.concurrency = concurrency
+        self.worker_prefix = f"{socket.gethostname()}:{os.getpid()}"
+        self._tasks: List["asyncio.Task[None]"] = []
+        self._stopping = asyncio.Event()
+
+    def start(self) -> None:
+        self._stopping.clear()
+        for index in range(self.concurrency):
+            worker_id = f"{self.worker_prefix}:{index}:{uuid.uuid4().hex[:8]}"
+            self._tasks.append(asyncio.create_task(self._run(worker_id)))
+        logger.info(f"{self.concurrency} worker(s) de exportação iniciados")
+
+    async def stop(self) -> None:
+        self._stopping.set()
+        for task in self._tasks:
+            task.cancel()
+        await asyncio.gather(*self._tasks, return_exceptions=True)
+        self._tasks = []
+
+    async def _run(self, worker_id: str) -> None:
+        next_purge = 0.0
+        while not self._stopping.is_set():
+            try:
+                if time.monotonic() >= next_purge:
+                    next_purge = time.monotonic() + PURGE_INTERVAL_SECONDS
+                    async with BackgroundSessionLocal() as db:
+                        purged = await ExportJobService.purge_expired(db)
+                    if purged:
+                        logger.info(f"{purged} job(s) de exportação expirado(s) removido(s)")
+                async with BackgroundSessionLocal() as db:
+                    job = await ExportJobService.claim_next(db, worker_id)
+                if job is not None:
+                    await ExportJobService.process(job.id, worker_id)
+                    continue
+            except asyncio.CancelledError:
+                raise
+            except Exception as e:
+                logger.error(f"Erro no worker de exportação {worker_id}: {e}")
+
+            try:
+                await asyncio.wait_for(self._stopping.wait(), timeout=POLL_INTERVAL_SECONDS)
+            except asyncio.TimeoutError:
+                pass
+
+
+# Instances
+export_workers = ExportWorkerPool(settings.EXPORT_WORKERS)
@@ -0,0 +1,234 @@
+"""
+Exportação Colunar - Parquet Particionado para o Warehouse
+=========================================================
+
+Gera as respostas de um formulário em Parquet no formato longo (uma linha
+por sessão e pergunta), particionado por data de submissão no layout Hive:
+
+    {EXPORT_DIR}/parquet/form_id=<id>/submitted_date=YYYY-MM-DD/part-0.parquet
+    {EXPORT_DIR}/parquet/form_id=<id>/_watermark.json
+
+- Incremental: o watermark guarda o último dia já exportado; cada execução
+  escreve apenas os dias completos (anteriores a hoje, UTC) posteriores a ele.
+  Partições existentes nunca são reescritas
+- Leitura em lotes a partir do cursor no servidor (mesmo snapshot da
+  exportação CSV/XLSX), convertida em RecordBatches do Arrow
+- Schema fixo, igual para todos os formulários e execuções (perguntas
+  criadas, removidas ou com tipo alterado não mudam as colunas): o valor
+  vem como texto em `value`, e também tipado em `value_numeric` (perguntas
+  numéricas) e `values` (múltipla seleção). Sessões sem respostas geram uma
+  linha com as colunas da pergunta nulas
+- Mudança de SCHEMA_VERSION descarta as partições antigas e reexporta o
+  histórico do formulário no schema novo
+
+O diretório pode ser lido diretamente, sem reexportar o histórico:
+    pyarrow.dataset.dataset(path, partitioning="hive")
+
+pyarrow é importado sob demanda, apenas quando a exportação roda.
+
+Autor: Equipe de Desenvolvimento
+"""
+
+import json
+import logging
+import os
+import shutil
+from datetime import date, datetime, time, timedelta
+from pathlib import Path
+from typing import Any, Dict, List, Optional, Sequence, Tuple
+
+from app.config import settings
+from app.exports.service import format_answer, get_export_questions, iter_sessions, snapshot_connection
+
+logger = logging.getLogger(__name__)
+
+# Sessões por RecordBatch
+PARQUET_BATCH_SIZE = 10_000
+
+WATERMARK_FILE = "_watermark.json"
+
+# Versão do layout das partições (gravada no watermark)
+SCHEMA_VERSION = 2
+
+NUMERIC_QUESTION_TYPES = {"number"}
+MULTI_VALUE_QUESTION_TYPES = {"checkbox", "multiple-selection"}
+
+
+def _import_pyarrow():
+    try:
+        import pyarrow
+        import pyarrow.parquet
+    except ImportError as e:
+        raise RuntimeError("Exportação Parquet requer o pacote 'pyarrow' (pip install pyarrow)") from e
+    return pyarrow, pyarrow.parquet
+
+
+def convert_answer(value: Optional[str], question_type: str) -> Tuple[str, Optional[float], Optional[List[str]]]:
+    """Valor armazenado (JSON array de strings) como (texto, número, lista) das colunas de valor"""
+    if not value:
+        return "", None, None
+    try:
+        parsed = json.loads(value)
+    except (TypeError, ValueError):
+        parsed = [value]
+    items = [str(item) for item in parsed if item is not None] if isinstance(parsed, list) else [str(parsed)]
+
+    numeric = None
+    if question_type in NUMERIC_QUESTION_TYPES and items:
+        try:
+            numeric = float(items[0])
+        except ValueError:
+            pass
+    multi = items if question_type in MULTI_VALUE_QUESTION_TYPES else None
+    return format_answer(value), numeric, multi
+
+
+def export_schema():
+    """Schema fixo da exportação (formato longo: uma linha por sessão e pergunta)"""
+    pa, _ = _import_pyarrow()
+    return pa.schema([
+        pa.field("session_id", pa.string(), nullable=False),
+        pa.field("submitted_at", pa.timestamp("us")),
+        pa.field("respondent_email", pa.string()),
+        pa.field("question_id", pa.string()),
+        pa.field("question_title", pa.string()),
+        pa.field("question_type", pa.string()),
+        pa.field("value", pa.string()),
+        pa.field("value_numeric", pa.float64()),
+        pa.field("values", pa.list_(pa.string())),
+    ], metadata={"schema_version": str(SCHEMA_VERSION)})
+
+
+def read_watermark(form_dir: Path) -> Optional[date]:
+    """Último dia exportado do formulário (None se nunca exportado ou em outro SCHEMA_VERSION)"""
+    path = form_dir / WATERMARK_FILE
+    if not path.exists():
+        return None
+    data = json.loads(path.read_text())
+    if data.get("schema_version", 1) != SCHEMA_VERSION:
+        return None
+    return date.fromisoformat(data["last_exported_date"])
+
+
+def drop_partitions(form_dir: Path) -> None:
+    """Remove as partições do formulário (antes de reexportar o histórico)"""
+    for partition_dir in form_dir.glob("submitted_date=*"):
+        shutil.rmtree(partition_dir)
+
+
+def write_watermark(form_dir: Path, day: date) -> None:
+    path = form_dir / WATERMARK_FILE
+    tmp_path = path.with_suffix(".tmp")
+    tmp_path.write_text(json.dumps({
+        "schema_version": SCHEMA_VERSION,
+        "last_exported_date": day.isoformat(),
+        "updated_at": datetime.utcnow().isoformat(),
+    }))
+    os.replace(tmp_path, path)
+
+
+class _PartitionWriter:
+    """Escreve uma partição (um dia) em lotes; publica o arquivo só ao fechar"""
+
+    def __init__(self, form_dir: Path, day: date, schema, batch_size: int):
+        pa, pq = _import_pyarrow()
+        self._pa = pa
+        self.day = day
+        self.schema = schema
+        self.batch_size = batch_size
+        self.rows = 0
+        self.sessions = 0
+        self._columns: List[List[Any]] = [[] for _ in schema]
+
+        partition_dir = form_dir / f"submitted_date={day.isoformat()}"
+        partition_dir.mkdir(parents=True, exist_ok=True)
+        self.path = partition_dir / "part-0.parquet"
+        self._tmp_path = partition_dir / ".part-0.parquet.tmp"
+        self._writer = pq.ParquetWriter(str(self._tmp_path), schema, compression="snappy")
+
+    def append(self, values: Sequence[Any]) -> None:
+        for column, value in zip(self._columns, values):
+            column.append(value)
+        if len(self._columns[0]) >= self.batch_size:
+            self._flush()
+
+    def _flush(self) -> None:
+        if not self._columns[0]:
+            return
+        arrays = [self._pa.array(column, type=field.type) for column, field in zip(self._columns, self.schema)]
+        self._writer.write_batch(self._pa.RecordBatch.from_arrays(arrays, schema=self.schema))
+        self.rows += len(self._columns[0])
+        self._columns = [[] for _ in self.schema]
+
+    def close(self) -> None:
+        self._flush()
+        self._writer.close()
+        os.replace(self._tmp_path, self.path)
+
+
+async def export_form_parquet(
+        form_id: str,
+        base_dir: Optional[str] = None,
+        batch_size: int = PARQUET_BATCH_SIZE
+) -> Dict[str, Any]:
+    """
+    Exporta os dias completos ainda não exportados de um formulário
+
+    Returns:
+        Resumo com partições escritas, sessões exportadas e novo watermark
+    """
+    form_dir = Path(base_dir or os.path.join(settings.EXPORT_DIR, "parquet")) / f"form_id={form_id}"
+    form_dir.mkdir(parents=True, exist_ok=True)
+
+    watermark = read_watermark(form_dir)
+    if watermark is None:
+        drop_partitions(form_dir)
+    last_complete_day = datetime.utcnow().date() - timedelta(days=1)
+    summary = {"form_id": form_id, "partitions": [], "sessions": 0, "watermark": watermark}
+
+    if watermark is not None and watermark >= last_complete_day:
+        return summary
+
+    since = datetime.combine(watermark + timedelta(days=1), time.min) if watermark else None
+    until = datetime.combine(last_complete_day + timedelta(days=1), time.min)
+
+    async with snapshot_connection() as conn:
+        questions = await get_export_questions(conn, form_id)
+        schema = export_schema()
+        partition: Optional[_PartitionWriter] = None
+
+        async for session_id, submitted_at, email, answers in iter_sessions(conn, form_id, since, until):
+            if submitted_at is None:
+                continue
+            day = submitted_at.date()
+            if partition is None or partition.day != day:
+                if partition is not None:
+                    partition.close()
+                    summary["partitions"].append(partition.day.isoformat())
+                    summary["sessions"] += partition.sessions
+                    # Sessões chegam em ordem de data: o dia fechado está completo
+                    write_watermark(form_dir, partition.day)
+                partition = _PartitionWriter(form_dir, day, schema, batch_size)
+
+            answered = [question for question in questions if question[0] in answers]
+            if not answered:
+                partition.append([session_id, submitted_at, email, None, None, None, None, None, None])
+            for question_id, title, question_type in answered:
+                partition.append(
+                    [session_id, submitted_at, email, question_id, title, question_type]
+                    + list(convert_answer(answers[question_id], question_type))
+                )
+            partition.sessions += 1
+
+        if partition is not None:
+            partition.close()
+            summary["partitions"].append(partition.day.isoformat())
+            summary["sessions"] += partition.sessions
+
+    write_watermark(form_dir, last_complete_day)
+    summary["watermark"] = last_complete_day
+    logger.info(
+        f"Parquet do formulário {form_id}: {len(summary['partitions'])} partições, "
+        f"{summary['sessions']} sessões (watermark {last_complete_day.isoformat()})"
+    )
+    return summary
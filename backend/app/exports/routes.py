@@ -0,0 +1,174 @@
+"""
+Rotas de Exportação - Download de Respostas
+==========================================
+
+- GET /forms/{form_id}/export?format=csv|xlsx - Exporta todas as sessões
+  do formulário (uma coluna por pergunta) em streaming
+- POST /forms/{form_id}/exports - Enfileira uma exportação em background
+- GET /exports/{job_id} - Progresso do job de exportação
+- GET /exports/{job_id}/download - Arquivo do job concluído
+
+Requer autenticação e permissão de exportação (Permission.EXPORT_DATA).
+Apenas o dono do formulário pode exportar.
+
+Autor: Equipe de Desenvolvimento
+"""
+
+import re
+from datetime import datetime
+from typing import Any, Dict, List, Optional
+
+from fastapi import APIRouter, Depends, HTTPException, Query
+from fastapi.responses import StreamingResponse
+from pydantic import BaseModel
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.future import select
+
+from app.database.connection import get_db
+from app.database.models import ExportJob, Form
+from app.dependencies import ensure_form_owner, require_export_permission, resolve_user_id
+from app.exports.jobs import ExportJobService
+from app.exports.service import stream_form_export
+from app.exports.storage import export_storage
+from app.exports.writers import EXPORT_WRITERS
+from app.forms.filters import compile_filters
+
+router = APIRouter()
+
+
+class ExportJobStatus(BaseModel):
+    id: str
+    form_id: str
+    format: str
+    status: str
+    total_sessions: int
+    processed_sessions: int
+    progress: float
+    bytes_written: int
+    error: Optional[str] = None
+    download_url: Optional[str] = None
+    created_at: datetime
+    started_at: Optional[datetime] = None
+    finished_at: Optional[datetime] = None
+
+
+def _job_status(job: ExportJob) -> ExportJobStatus:
+    total = max(job.total_sessions or 0, job.processed_sessions or 0)
+    progress = 1.0 if job.status == "completed" else (job.processed_sessions / total if total else 0.0)
+    return ExportJobStatus(
+        id=job.id,
+        form_id=job.form_id,
+        format=job.format,
+        status=job.status,
+        total_sessions=total,
+        processed_sessions=job.processed_sessions,
+        progress=round(progress, 4),
+        bytes_written=job.bytes_written,
+        error=job.error,
+        download_url=f"/exports/{job.id}/download" if job.status == "completed" else None,
+        created_at=job.created_at,
+        started_at=job.started_at,
+        finished_at=job.finished_at,
+    )
+
+
+async def _get_owned_job(db: AsyncSession, job_id: str, current_user: Dict[str, Any]) -> ExportJob:
+    result = await db.execute(
+        select(ExportJob)
+        .where(ExportJob.id == job_id, ExportJob.user_id == await resolve_user_id(db, current_user))
+    )
+    job = result.scalar_one_or_none()
+    if not job:
+        raise HTTPException(status_code=404, detail="Exportação não encontrada")
+    return job
+
+
+@router.get("/forms/{form_id}/export", summary="Exporta as respostas do formulário em CSV ou XLSX")
+async def export_form_responses(
+    form_id: str,
+    format: str = Query("csv", pattern="^(csv|xlsx)$"),
+    where: List[str] = Query([], description="Filtros por resposta question_id:op:valor"),
+    current_user: Dict[str, Any] = Depends(require_export_permission()),
+    db: AsyncSession = Depends(get_db)
+):
+    """
+    O arquivo é gerado em blocos a partir de um cursor no servidor, com
+    memória constante independentemente do número de sessões.
+    """
+    await ensure_form_owner(db, form_id, await resolve_user_id(db, current_user))
+    title = await db.scalar(select(Form.title).where(Form.id == form_id))
+    session_filter = await compile_filters(db, form_id, where)
+
+    # Libera a conexão da requisição antes do streaming (que usa conexão própria)
+    await db.close()
+
+    writer_class = EXPORT_WRITERS[format]
+    slug = re.sub(r"[^A-Za-z0-9_-]+", "-", title).strip("-")[:60] or "formulario"
+    filename = f"{slug}-{datetime.utcnow().strftime('%Y%m%d-%H%M%S')}.{writer_class.extension}"
+
+    return StreamingResponse(
+        stream_form_export(form_id, format, session_filter),
+        media_type=writer_class.media_type,
+        headers={
+            "Content-Disposition": f'attachment; filename="{filename}"',
+            "Cache-Control": "no-store",
+        }
+    )
+
+
+@router.post("/forms/{form_id}/exports", response_model=ExportJobStatus, status_code=202,
+             summary="Enfileira a exportação do formulário em background")
+async def create_export_job(
+    form_id: str,
+    format: str = Query("csv", pattern="^csv$"),
+    current_user: Dict[str, Any] = Depends(require_export_permission()),
+    db: AsyncSession = Depends(get_db)
+):
+    """
+    Para formulários grandes: o arquivo é gerado por workers em blocos, com
+    checkpoint, e fica disponível em /exports/{job_id}/download.
+    """
+    result = await db.execute(
+        select(Form).where(Form.id == form_id, Form.user_id == await resolve_user_id(db, current_user))
+    )
+    form = result.scalar_one_or_none()
+    if not form:
+        raise HTTPException(status_code=404, detail="Formulário não encontrado")
+
+    job = await ExportJobService.enqueue(db, form, format)
+    await db.commit()
+    await db.refresh(job)
+    return _job_status(job)
+
+
+@router.get("/exports/{job_id}", response_model=ExportJobStatus, summary="Progresso de uma exportação")
+async def get_export_job(
+    job_id: str,
+    current_user: Dict[str, Any] = Depends(require_export_permission()),
+    db: AsyncSession = Depends(get_db)
+):
+    return _job_status(await _get_owned_job(db, job_id, current_user))
+
+
+@router.get("/exports/{job_id}/download", summary="Download do arquivo de uma exportação concluída")
+async def download_export_job(
+    job_id: str,
+    current_user: Dict[str, Any] = Depends(require_export_permission()),
+    db: AsyncSession = Depends(get_db)
+):
+    job = await _get_owned_job(db, job_id, current_user)
+    if job.status != "completed":
+        raise HTTPException(status_code=409, detail=f"Exportação ainda não concluída (status: {job.status})")
+    if not await export_storage.exists(job.storage_key):
+        raise HTTPException(status_code=410, detail="Arquivo da exportação não está mais disponível")
+
+    writer_class = EXPORT_WRITERS[job.format]
+    filename = f"export-{job.form_id}-{job.id[:8]}.{writer_class.extension}"
+    return StreamingResponse(
+        export_storage.iter_bytes(job.storage_key),
+        media_type=writer_class.media_type,
+        headers={
+            "Content-Disposition": f'attachment; filename="{filename}"',
+            "Content-Length": str(job.bytes_written),
+        }
+    )
@@ -0,0 +1,174 @@
+"""
+Serviço de Exportação - Respostas em Streaming
+=============================================
+
+Gera a exportação de um formulário (uma linha por sessão, uma coluna por
+pergunta) com memória constante:
+
+- Conexão dedicada em transação REPEATABLE READ somente leitura, para que
+  todo o arquivo reflita o mesmo snapshot mesmo com submissões concorrentes
+- Cursor no servidor (conn.stream + yield_per): as linhas de `responses`
+  chegam ordenadas por sessão e são pivotadas à medida que são lidas
+- Blocos de tamanho fixo entregues ao writer (CSV/XLSX)
+
+Autor: Equipe de Desenvolvimento
+"""
+
+import json
+import logging
+from contextlib import asynccontextmanager
+from datetime import datetime
+from typing import AsyncIterator, Dict, List, Optional, Sequence, Tuple
+
+from sqlalchemy import select
+from sqlalchemy.ext.asyncio import AsyncConnection
+
+from app.database.connection import engines
+from app.database.models import Question, Response, ResponseSession, Section
+from app.exports.writers import get_writer
+from app.forms.filters import SessionFilter
+
+logger = logging.getLogger(__name__)
+
+# Sessões por bloco entregue ao cliente
+EXPORT_CHUNK_SIZE = 500
+
+# Linhas de `responses` buscadas por ida ao cursor
+EXPORT_FETCH_SIZE = 5000
+
+FIXED_COLUMNS = ["ID da Sessão", "Enviado em", "E-mail do Respondente"]
+
+
+def format_answer(value: Optional[str]) -> str:
+    """Valor armazenado (JSON array) como texto de célula; múltiplos valores separados por '; '"""
+    if not value:
+        return ""
+    try:
+        parsed = json.loads(value)
+    except (TypeError, ValueError):
+        return value
+    if isinstance(parsed, list):
+        return "; ".join(str(item) for item in parsed if item is not None)
+    return str(parsed)
+
+
+@asynccontextmanager
+async def snapshot_connection() -> AsyncIterator[AsyncConnection]:
+    """Conexão dedicada (pool background) em transação REPEATABLE READ somente leitura"""
+    async with engines["background"].connect() as conn:
+        conn = await conn.execution_options(isolation_level="REPEATABLE READ", postgresql_readonly=True)
+        async with conn.begin():
+            yield conn
+
+
+async def get_export_questions(conn: AsyncConnection, form_id: str) -> List[Tuple[str, str, str]]:
+    """(id, título, tipo) das perguntas na ordem de seção/pergunta"""
+    result = await conn.execute(
+        select(Question.id, Question.title, Question.type)
+        .join(Section, Question.section_id == Section.id)
+        .where(Section.form_id == form_id)
+        .order_by(Section.order, Question.order, Question.id)
+    )
+    return [(row.id, row.title, row.type) for row in result]
+
+
+async def iter_sessions(
+        conn: AsyncConnection,
+        form_id: str,
+        since: Optional[datetime] = None,
+        until: Optional[datetime] = None,
+        session_filter: Optional[SessionFilter] = None
+) -> AsyncIterator[Tuple[str, Optional[datetime], Optional[str], Dict[str, Optional[str]]]]:
+    """
+    Sessões do formulário com suas respostas, em ordem (submitted_at, id)
+
+    A ordenação mantém as respostas de uma sessão contíguas no cursor, então
+    só a sessão atual fica em memória. `since`/`until` delimitam
+    submitted_at em [since, until); `session_filter` restringe pelas respostas.
+
+    Yields:
+        (session_id, submitted_at, respondent_email, {question_id: valor armazenado})
+    """
+    stmt = (
+        select(
+            ResponseSession.id,
+            ResponseSession.submitted_at,
+            ResponseSession.respondent_email,
+            Response.question_id,
+            Response.value,
+        )
+        .outerjoin(Response, Response.session_id == ResponseSession.id)
+        .where(ResponseSession.form_id == form_id)
+        .order_by(ResponseSession.submitted_at, ResponseSession.id)
+        .execution_options(yield_per=EXPORT_FETCH_SIZE)
+    )
+    if since is not None:
+        stmt = stmt.where(ResponseSession.submitted_at >= since)
+    if until is not None:
+        stmt = stmt.where(ResponseSession.submitted_at < until)
+    if session_filter is not None:
+        stmt = stmt.where(session_filter.predicate)
+
+    current = None
+    result = await conn.stream(stmt)
+    async for partition in result.partitions():
+        for row in partition:
+            if current is None or row.id != current[0]:
+                if current is not None:
+                    yield current
+                current = (row.id, row.submitted_at, row.respondent_email, {})
+            if row.question_id is not None:
+                current[3][row.question_id] = row.value
+
+    if current is not None:
+        yield current
+
+
+async def iter_session_rows(
+        conn: AsyncConnection,
+        form_id: str,
+        question_ids: Sequence[str],
+        chunk_size: int = EXPORT_CHUNK_SIZE,
+        session_filter: Optional[SessionFilter] = None
+) -> AsyncIterator[List[List[str]]]:
+    """Sessões pivotadas em linhas de texto (uma coluna por pergunta), em blocos de `chunk_size`"""
+    chunk: List[List[str]] = []
+    async for session_id, submitted_at, email, answers in iter_sessions(conn, form_id, session_filter=session_filter):
+        chunk.append(
+            [session_id, submitted_at.isoformat() if submitted_at else "", email or ""]
+            + [format_answer(answers.get(question_id)) for question_id in question_ids]
+        )
+        if len(chunk) >= chunk_size:
+            yield chunk
+            chunk = []
+    if chunk:
+        yield chunk
+
+
+async def stream_form_export(
+        form_id: str,
+        export_format: str,
+        session_filter: Optional[SessionFilter] = None
+) -> AsyncIterator[bytes]:
+    """
+    Bytes do arquivo de exportação, gerados sob demanda
+
+    Usa uma conexão própria (não a sessão da requisição), que vive enquanto
+    o StreamingResponse estiver consumindo o gerador.
+    """
+    writer = get_writer(export_format)
+    sessions = 0
+
+    async with snapshot_connection() as conn:
+        questions = await get_export_questions(conn, form_id)
+        yield writer.header(FIXED_COLUMNS + [title for _, title, _ in questions])
+
+        question_ids = [question_id for question_id, _, _ in questions]
+        async for rows in iter_session_rows(conn, form_id, question_ids, session_filter=session_filter):
+            sessions += len(rows)
+            data = writer.rows(rows)
+            if data:
+                yield data
+
+    yield writer.close()
+    logger.info(f"Exportação {export_format} do formulário {form_id}: {sessions} sessões")
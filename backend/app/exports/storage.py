@@ -0,0 +1,241 @@
+"""
+Storage de Exportações
+=====================
+
+Interface mínima usada pelos jobs de exportação para escrever arquivos em
+blocos e retomar após falhas:
+
+- key_for(form_id, job_id, extension): chave do arquivo de um job
+  (export_jobs.storage_key)
+- size(key): bytes gravados (0 se o arquivo não existir)
+- truncate(key, size): descarta bytes além do último checkpoint
+- append(key, offset, data): grava um bloco exatamente em `offset`, que
+  precisa ser o fim atual do arquivo (durável ao retornar). Outro tamanho
+  ou um bloco já gravado na posição levanta ExportStorageConflict: outro
+  worker escreveu no arquivo, ou seja, este perdeu o lease do job
+- iter_bytes(key): leitura em streaming para download
+- delete(key): remove o arquivo (retenção e formulário removido)
+
+DatabaseExportStorage (padrão) grava os blocos na tabela export_chunks,
+com o id do job como chave (FK com ON DELETE CASCADE): o job pode ser
+retomado e o download servido por qualquer réplica da API.
+LocalExportStorage grava em disco (EXPORT_DIR/jobs) e só serve para uma
+réplica (ou um volume compartilhado entre elas). Um backend de object
+storage (ex: S3 multipart) pode implementar a mesma interface.
+
+Autor: Equipe de Desenvolvimento
+"""
+
+import asyncio
+import os
+from abc import ABC, abstractmethod
+from pathlib import Path
+from typing import AsyncIterator
+
+from sqlalchemy import Integer, cast, delete, func, select, update
+from sqlalchemy.exc import IntegrityError
+
+from app.config import settings
+from app.database.connection import session_factories
+from app.database.models import ExportChunk
+
+READ_CHUNK_SIZE = 64 * 1024
+
+
+class ExportStorageConflict(Exception):
+    """O arquivo não termina na posição esperada pelo append"""
+
+
+class ExportStorage(ABC):
+    """Interface de storage dos arquivos exportados"""
+
+    @abstractmethod
+    def key_for(self, form_id: str, job_id: str, extension: str) -> str:
+        """Chave do arquivo de um job"""
+
+    @abstractmethod
+    async def size(self, key: str) -> int:
+        """Bytes gravados (0 se o arquivo não existir)"""
+
+    @abstractmethod
+    async def truncate(self, key: str, size: int) -> None:
+        """Descarta os bytes além de `size` (cria o arquivo vazio se preciso)"""
+
+    @abstractmethod
+    async def append(self, key: str, offset: int, data: bytes) -> None:
+        """Grava o bloco em `offset` (o fim atual do arquivo) ou levanta ExportStorageConflict"""
+
+    @abstractmethod
+    async def exists(self, key: str) -> bool:
+        """Se o arquivo existe"""
+
+    @abstractmethod
+    def iter_bytes(self, key: str) -> AsyncIterator[bytes]:
+        """Conteúdo em blocos, para download em streaming"""
+
+    @abstractmethod
+    async def delete(self, key: str) -> None:
+        """Remove o arquivo (sem erro se não existir)"""
+
+
+class LocalExportStorage(ExportStorage):
+    """Arquivos em disco local; operações bloqueantes rodam em thread"""
+
+    def __init__(self, base_dir: str):
+        self.base_dir = Path(base_dir)
+
+    def _path(self, key: str) -> Path:
+        path = (self.base_dir / key).resolve()
+        if self.base_dir.resolve() not in path.parents:
+            raise ValueError(f"Chave de storage inválida: {key}")
+        return path
+
+    def key_for(self, form_id: str, job_id: str, extension: str) -> str:
+        return f"{form_id}/{job_id}.{extension}"
+
+    def _size(self, key: str) -> int:
+        path = self._path(key)
+        return path.stat().st_size if path.exists() else 0
+
+    def _truncate(self, key: str, size: int) -> None:
+        path = self._path(key)
+        path.parent.mkdir(parents=True, exist_ok=True)
+        with open(path, "ab") as f:
+            f.truncate(size)
+
+    def _append(self, key: str, offset: int, data: bytes) -> None:
+        with open(self._path(key), "ab") as f:
+            size = os.fstat(f.fileno()).st_size
+            if size != offset:
+                raise ExportStorageConflict(f"{key}: esperado fim em {offset}, arquivo tem {size} bytes")
+            f.write(data)
+            f.flush()
+            os.fsync(f.fileno())
+
+    def _delete(self, key: str) -> None:
+        path = self._path(key)
+        path.unlink(missing_ok=True)
+        # Diretório do formulário some junto com o último arquivo
+        try:
+            path.parent.rmdir()
+        except OSError:
+            pass
+
+    async def size(self, key: str) -> int:
+        return await asyncio.to_thread(self._size, key)
+
+    async def truncate(self, key: str, size: int) -> None:
+        await asyncio.to_thread(self._truncate, key, size)
+
+    async def append(self, key: str, offset: int, data: bytes) -> None:
+        await asyncio.to_thread(self._append, key, offset, data)
+
+    async def exists(self, key: str) -> bool:
+        return await asyncio.to_thread(self._path(key).exists)
+
+    async def iter_bytes(self, key: str) -> AsyncIterator[bytes]:
+        f = await asyncio.to_thread(open, self._path(key), "rb")
+        try:
+            while True:
+                chunk = await asyncio.to_thread(f.read, READ_CHUNK_SIZE)
+                if not chunk:
+                    break
+                yield chunk
+        finally:
+            f.close()
+
+    async def delete(self, key: str) -> None:
+        await asyncio.to_thread(self._delete, key)
+
+
+class DatabaseExportStorage(ExportStorage):
+    """
+    Arquivos na tabela export_chunks (um bloco por append, pela posição no arquivo)
+
+    Cada operação usa uma sessão curta do pool background; o download busca
+    um bloco por vez, sem manter conexão aberta entre os envios.
+    """
+
+    def __init__(self, session_factory):
+        self.session_factory = session_factory
+
+    def key_for(self, form_id: str, job_id: str, extension: str) -> str:
+        return job_id
+
+    async def size(self, key: str) -> int:
+        async with self.session_factory() as db:
+            result = await db.execute(
+                select(func.coalesce(func.sum(func.length(ExportChunk.data)), 0))
+                .where(ExportChunk.job_id == key)
+            )
+            return int(result.scalar_one())
+
+    async def truncate(self, key: str, size: int) -> None:
+        async with self.session_factory() as db:
+            await db.execute(
+                delete(ExportChunk).where(ExportChunk.job_id == key, ExportChunk.offset >= size)
+            )
+            # Bloco que atravessa o ponto de corte (appends não alinhados ao checkpoint)
+            await db.execute(
+                update(ExportChunk)
+                .where(
+                    ExportChunk.job_id == key,
+                    ExportChunk.offset + func.length(ExportChunk.data) > size
+                )
+                .values(data=func.substring(ExportChunk.data, 1, cast(size - ExportChunk.offset, Integer)))
+            )
+            await db.commit()
+
+    async def append(self, key: str, offset: int, data: bytes) -> None:
+        """A PK (job_id, offset) barra dois appends concorrentes na mesma posição"""
+        async with self.session_factory() as db:
+            result = await db.execute(
+                select(func.coalesce(func.sum(func.length(ExportChunk.data)), 0))
+                .where(ExportChunk.job_id == key)
+            )
+            size = int(result.scalar_one())
+            if size != offset:
+                raise ExportStorageConflict(f"{key}: esperado fim em {offset}, arquivo tem {size} bytes")
+            db.add(ExportChunk(job_id=key, offset=offset, data=data))
+            try:
+                await db.commit()
+            except IntegrityError as e:
+                raise ExportStorageConflict(f"{key}: bloco já gravado em {offset}") from e
+
+    async def exists(self, key: str) -> bool:
+        async with self.session_factory() as db:
+            result = await db.execute(
+                select(ExportChunk.offset).where(ExportChunk.job_id == key).limit(1)
+            )
+            return result.first() is not None
+
+    async def iter_bytes(self, key: str) -> AsyncIterator[bytes]:
+        async with self.session_factory() as db:
+            result = await db.execute(
+                select(ExportChunk.offset).where(ExportChunk.job_id == key).order_by(ExportChunk.offset)
+            )
+            offsets = list(result.scalars())
+        for offset in offsets:
+            async with self.session_factory() as db:
+                result = await db.execute(
+                    select(ExportChunk.data).where(ExportChunk.job_id == key, ExportChunk.offset == offset)
+                )
+                yield result.scalar_one()
+
+    async def delete(self, key: str) -> None:
+        async with self.session_factory() as db:
+            await db.execute(delete(ExportChunk).where(ExportChunk.job_id == key))
+            await db.commit()
+
+
+def get_export_storage() -> ExportStorage:
+    """Storage configurado em EXPORT_STORAGE (database, local)"""
+    if settings.EXPORT_STORAGE == "local":
+        return LocalExportStorage(os.path.join(settings.EXPORT_DIR, "jobs"))
+    if settings.EXPORT_STORAGE == "database":
+        return DatabaseExportStorage(session_factories["background"])
+    raise ValueError(f"EXPORT_STORAGE inválido: {settings.EXPORT_STORAGE!r}")
+
+
+# Instances
+export_storage: ExportStorage = get_export_storage()
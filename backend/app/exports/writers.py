@@ -0,0 +1,219 @@
+"""
+Writers de Exportação - CSV e XLSX em Streaming
+==============================================
+
+Serializam linhas em blocos de bytes, sem manter o arquivo inteiro em memória:
+
+- CsvExportWriter: CSV UTF-8 (com BOM para abrir corretamente no Excel);
+  células que o Excel/Sheets interpretariam como fórmula recebem o prefixo '
+- XlsxExportWriter: XLSX mínimo gerado à mão (SpreadsheetML com inlineStr),
+  escrito em um zip sem seek; cada chamada devolve apenas os bytes novos.
+  Células inlineStr nunca são avaliadas como fórmula, dispensando o prefixo
+
+Uso:
+    writer = get_writer("csv")
+    yield writer.header(columns)
+    for rows in chunks:
+        yield writer.rows(rows)
+    yield writer.close()
+
+Autor: Equipe de Desenvolvimento
+"""
+
+import csv
+import io
+import re
+import zipfile
+from typing import List, Sequence
+from xml.sax.saxutils import escape
+
+
+# Início de célula que planilhas avaliam como fórmula (CSV injection)
+_FORMULA_PREFIXES = ("=", "+", "-", "@", "\t", "\r")
+
+
+def _neutralize_formula(value) -> str:
+    """Prefixa com ' valores que seriam executados como fórmula (números ficam intactos)"""
+    text = "" if value is None else str(value)
+    if not text.startswith(_FORMULA_PREFIXES):
+        return text
+    try:
+        float(text)
+        return text
+    except ValueError:
+        return "'" + text
+
+
+class CsvExportWriter:
+    """CSV em UTF-8"""
+
+    media_type = "text/csv; charset=utf-8"
+    extension = "csv"
+
+    def __init__(self):
+        self._buffer = io.StringIO()
+        self._writer = csv.writer(self._buffer)
+
+    def _drain(self) -> bytes:
+        data = self._buffer.getvalue().encode("utf-8")
+        self._buffer.seek(0)
+        self._buffer.truncate(0)
+        return data
+
+    def header(self, columns: Sequence[str]) -> bytes:
+        self._writer.writerow([_neutralize_formula(c) for c in columns])
+        return "\ufeff".encode("utf-8") + self._drain()
+
+    def rows(self, rows: List[Sequence[str]]) -> bytes:
+        self._writer.writerows([_neutralize_formula(v) for v in row] for row in rows)
+        return self._drain()
+
+    def close(self) -> bytes:
+        return b""
+
+
+class _ChunkBuffer(io.RawIOBase):
+    """Stream só de escrita e sem seek: acumula bytes até serem drenados"""
+
+    def __init__(self):
+        super().__init__()
+        self._chunks = bytearray()
+
+    def writable(self) -> bool:
+        return True
+
+    def write(self, data) -> int:
+        self._chunks.extend(data)
+        return len(data)
+
+    def drain(self) -> bytes:
+        data = bytes(self._chunks)
+        self._chunks.clear()
+        return data
+
+
+# Caracteres de controle não são permitidos em XML 1.0
+_INVALID_XML_CHARS = re.compile("[\x00-\x08\x0b\x0c\x0e-\x1f]")
+
+_SHEET_HEADER = (
+    '<?xml version="1.0" encoding="UTF-8" standalone="yes"?>\n'
+    '<worksheet xmlns="http://schemas.openxmlformats.org/spreadsheetml/2006/main"><sheetData>'
+)
+_SHEET_FOOTER = "</sheetData></worksheet>"
+
+
+class XlsxExportWriter:
+    """
+    XLSX em streaming
+
+    As planilhas são escritas primeiro (o zip não exige ordem), e o
+    workbook/relacionamentos no fechamento, quando o número de abas é
+    conhecido. Ao atingir o limite de linhas do Excel, continua em uma
+    nova aba repetindo o cabeçalho.
+    """
+
+    media_type = "application/vnd.openxmlformats-officedocument.spreadsheetml.sheet"
+    extension = "xlsx"
+
+    MAX_ROWS_PER_SHEET = 1_048_576
+
+    def __init__(self):
+        self._buffer = _ChunkBuffer()
+        self._zip = zipfile.ZipFile(self._buffer, mode="w", compression=zipfile.ZIP_DEFLATED)
+        self._sheet = None
+        self._sheet_count = 0
+        self._sheet_rows = 0
+        self._columns: Sequence[str] = []
+
+    @staticmethod
+    def _row_xml(values: Sequence[str]) -> str:
+        cells = "".join(
+            f'<c t="inlineStr"><is><t xml:space="preserve">{escape(_INVALID_XML_CHARS.sub("", str(v)))}</t></is></c>'
+            if v not in (None, "") else "<c/>"
+            for v in values
+        )
+        return f"<row>{cells}</row>"
+
+    def _open_sheet(self) -> None:
+        if self._sheet is not None:
+            self._sheet.write(_SHEET_FOOTER.encode("utf-8"))
+            self._sheet.close()
+        self._sheet_count += 1
+        self._sheet = self._zip.open(f"xl/worksheets/sheet{self._sheet_count}.xml", mode="w", force_zip64=True)
+        self._sheet.write(_SHEET_HEADER.encode("utf-8"))
+        self._sheet.write(self._row_xml(self._columns).encode("utf-8"))
+        self._sheet_rows = 1
+
+    def header(self, columns: Sequence[str]) -> bytes:
+        self._columns = list(columns)
+        self._open_sheet()
+        return self._buffer.drain()
+
+    def rows(self, rows: List[Sequence[str]]) -> bytes:
+        for row in rows:
+            if self._sheet_rows >= self.MAX_ROWS_PER_SHEET:
+                self._open_sheet()
+            self._sheet.write(self._row_xml(row).encode("utf-8"))
+            self._sheet_rows += 1
+        return self._buffer.drain()
+
+    def close(self) -> bytes:
+        if self._sheet is None:
+            self._open_sheet()
+        self._sheet.write(_SHEET_FOOTER.encode("utf-8"))
+        self._sheet.close()
+
+        sheet_ids = range(1, self._sheet_count + 1)
+        self._zip.writestr("[Content_Types].xml", (
+            '<?xml version="1.0" encoding="UTF-8" standalone="yes"?>\n'
+            '<Types xmlns="http://schemas.openxmlformats.org/package/2006/content-types">'
+            '<Default Extension="rels" ContentType="application/vnd.openxmlformats-package.relationships+xml"/>'
+            '<Default Extension="xml" ContentType="application/xml"/>'
+            '<Override PartName="/xl/workbook.xml" '
+            'ContentType="application/vnd.openxmlformats-officedocument.spreadsheetml.sheet.main+xml"/>'
+            + "".join(
+                f'<Override PartName="/xl/worksheets/sheet{i}.xml" '
+                'ContentType="application/vnd.openxmlformats-officedocument.spreadsheetml.worksheet+xml"/>'
+                for i in sheet_ids
+            )
+            + "</Types>"
+        ))
+        self._zip.writestr("_rels/.rels", (
+            '<?xml version="1.0" encoding="UTF-8" standalone="yes"?>\n'
+            '<Relationships xmlns="http://schemas.openxmlformats.org/package/2006/relationships">'
+            '<Relationship Id="rId1" '
+            'Type="http://schemas.openxmlformats.org/officeDocument/2006/relationships/officeDocument" '
+            'Target="xl/workbook.xml"/>'
+            "</Relationships>"
+        ))
+        self._zip.writestr("xl/workbook.xml", (
+            '<?xml version="1.0" encoding="UTF-8" standalone="yes"?>\n'
+            '<workbook xmlns="http://schemas.openxmlformats.org/spreadsheetml/2006/main" '
+            'xmlns:r="http://schemas.openxmlformats.org/officeDocument/2006/relationships"><sheets>'
+            + "".join(f'<sheet name="Respostas {i}" sheetId="{i}" r:id="rId{i}"/>' for i in sheet_ids)
+            + "</sheets></workbook>"
+        ))
+        self._zip.writestr("xl/_rels/workbook.xml.rels", (
+            '<?xml version="1.0" encoding="UTF-8" standalone="yes"?>\n'
+            '<Relationships xmlns="http://schemas.openxmlformats.org/package/2006/relationships">'
+            + "".join(
+                f'<Relationship Id="rId{i}" '
+                'Type="http://schemas.openxmlformats.org/officeDocument/2006/relationships/worksheet" '
+                f'Target="worksheets/sheet{i}.xml"/>'
+                for i in sheet_ids
+            )
+            + "</Relationships>"
+        ))
+        self._zip.close()
+        return self._buffer.drain()
+
+
+EXPORT_WRITERS = {
+    "csv": CsvExportWriter,
+    "xlsx": XlsxExportWriter,
+}
+
+
+def get_writer(export_format: str):
+    """Instancia o writer do formato (csv, xlsx)"""
+    return EXPORT_WRITERS[export_format]()
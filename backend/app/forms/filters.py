@@ -0,0 +1,179 @@
+"""
+Filtros por Resposta - DSL de Facetas
+====================================
+
+Filtra sessões pelo valor das respostas, ex: "Q3 = Enterprise e Q7 ≥ 8":
+
+    ?where=<question_id>:eq:Enterprise&where=<question_id>:gte:8
+
+Operadores:
+- eq, ne: valor igual/diferente (resposta única)
+- in: um dos valores, separados por "|" (ex: in:Pro|Enterprise)
+- has: seleção múltipla contém o valor
+- gt, gte, lt, lte: comparação numérica (Response.value_numeric)
+- exists: a pergunta foi respondida
+
+Cada condição compila para um semi-join `session_id IN (SELECT session_id
+FROM responses WHERE question_id = ? AND ...)` servido pelos índices
+ix_responses_question_value (question_id, md5(value)) e
+ix_responses_question_numeric (question_id, value_numeric). As condições são
+combinadas com AND. O mesmo predicado compilado é usado na listagem, na
+exportação, nas facetas e no analytics filtrado.
+
+Autor: Equipe de Desenvolvimento
+"""
+
+import hashlib
+import json
+from dataclasses import dataclass
+from typing import Any, List, Optional, Sequence, Tuple
+
+from fastapi import HTTPException
+from sqlalchemy import and_, func, select
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.sql.elements import ColumnElement
+
+from app.database.models import Question, Response, ResponseSession, Section
+
+VALUE_OPERATORS = {"eq", "ne", "in", "has"}
+NUMERIC_OPERATORS = {"gt", "gte", "lt", "lte"}
+OPERATORS = VALUE_OPERATORS | NUMERIC_OPERATORS | {"exists"}
+
+# Limite de condições por consulta
+MAX_FILTER_CLAUSES = 10
+
+
+def numeric_answer(value: Any) -> Optional[float]:
+    """Valor numérico de uma resposta (número, texto numérico ou lista com um único item)"""
+    if isinstance(value, list):
+        return numeric_answer(value[0]) if len(value) == 1 else None
+    if isinstance(value, bool) or value is None:
+        return None
+    if isinstance(value, (int, float)):
+        return float(value)
+    try:
+        return float(str(value).strip().replace(",", "."))
+    except ValueError:
+        return None
+
+
+def _stored_forms(value: str) -> List[str]:
+    """Serializações possíveis de uma resposta única (texto ou lista com um item)"""
+    return [json.dumps(value), json.dumps([value])]
+
+
+def _md5(value: str) -> str:
+    return hashlib.md5(value.encode("utf-8")).hexdigest()
+
+
+def _value_in(values: Sequence[str]) -> ColumnElement:
+    """Igualdade pelo índice (question_id, md5(value)), conferindo o valor completo"""
+    stored = [form for value in values for form in _stored_forms(value)]
+    return and_(
+        func.md5(Response.value).in_([_md5(s) for s in stored]),
+        Response.value.in_(stored),
+    )
+
+
+@dataclass(frozen=True)
+class FilterClause:
+    question_id: str
+    op: str
+    value: str = ""
+
+    def condition(self) -> ColumnElement:
+        if self.op == "eq":
+            return _value_in([self.value])
+        if self.op == "in":
+            return _value_in(self.value.split("|"))
+        if self.op == "ne":
+            return ~_value_in([self.value])
+        if self.op == "has":
+            escaped = json.dumps(self.value).replace("\\", "\\\\").replace("%", "\\%").replace("_", "\\_")
+            return Response.value.like(f"%{escaped}%", escape="\\")
+        if self.op in NUMERIC_OPERATORS:
+            number = float(self.value)
+            column = Response.value_numeric
+            return {"gt": column > number, "gte": column >= number, "lt": column < number, "lte": column <= number}[self.op]
+        return Response.value.isnot(None)
+
+
+@dataclass(frozen=True)
+class SessionFilter:
+    """Predicado compilado sobre ResponseSession.id, com chave canônica para cache"""
+    clauses: Tuple[FilterClause, ...]
+
+    @property
+    def key(self) -> Tuple[Tuple[str, str, str], ...]:
+        return tuple((c.question_id, c.op, c.value) for c in self.clauses)
+
+    @property
+    def predicate(self) -> ColumnElement:
+        return and_(*[
+            ResponseSession.id.in_(
+                select(Response.session_id).where(Response.question_id == clause.question_id, clause.condition())
+            )
+            for clause in self.clauses
+        ])
+
+    def response_predicate(self) -> ColumnElement:
+        """O mesmo filtro aplicado a linhas de `responses` (pela sessão da resposta)"""
+        return Response.session_id.in_(select(ResponseSession.id).where(self.predicate))
+
+
+def parse_filters(where: Sequence[str]) -> List[FilterClause]:
+    """
+    Interpreta as expressões `question_id:op:valor`
+
+    Raises:
+        HTTPException: 400 se alguma expressão for inválida
+    """
+    if len(where) > MAX_FILTER_CLAUSES:
+        raise HTTPException(status_code=400, detail=f"Máximo de {MAX_FILTER_CLAUSES} filtros por consulta")
+
+    clauses = []
+    for expression in where:
+        question_id, _, rest = expression.partition(":")
+        op, _, value = rest.partition(":")
+        if not question_id or op not in OPERATORS:
+            raise HTTPException(
+                status_code=400,
+                detail=f"Filtro inválido: '{expression}'. Use question_id:op:valor com op em {sorted(OPERATORS)}"
+            )
+        if op in VALUE_OPERATORS and value == "":
+            raise HTTPException(status_code=400, detail=f"Filtro sem valor: '{expression}'")
+        if op in NUMERIC_OPERATORS:
+            try:
+                float(value)
+            except ValueError:
+                raise HTTPException(status_code=400, detail=f"Filtro numérico inválido: '{expression}'")
+        clauses.append(FilterClause(question_id=question_id, op=op, value=value))
+    return clauses
+
+
+async def compile_filters(db: AsyncSession, form_id: str, where: Optional[Sequence[str]]) -> Optional[SessionFilter]:
+    """
+    Valida as expressões contra as perguntas do formulário e compila o predicado
+
+    Returns:
+        SessionFilter, ou None se não houver filtros
+
+    Raises:
+        HTTPException: 400 se a expressão for inválida ou a pergunta não for do formulário
+    """
+    if not where:
+        return None
+    clauses = parse_filters(where)
+
+    question_ids = {clause.question_id for clause in clauses}
+    result = await db.execute(
+        select(Question.id)
+        .join(Section, Question.section_id == Section.id)
+        .where(Section.form_id == form_id, Question.id.in_(question_ids))
+    )
+    unknown = question_ids - set(result.scalars())
+    if unknown:
+        raise HTTPException(status_code=400, detail=f"Perguntas inexistentes no formulário: {sorted(unknown)}")
+
+    # Ordem canônica: filtros equivalentes compartilham a entrada de cache
+    return SessionFilter(clauses=tuple(sorted(set(clauses), key=lambda c: (c.question_id, c.op, c.value))))
@@ -1,16 +1,27 @@
-from fastapi import APIRouter, Depends, HTTPException
+from fastapi import APIRouter, Depends, HTTPException, Query
 from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy.future import select
-from pydantic import BaseModel
-from typing import Optional, Dict, Any, List
+from pydantic import BaseModel, Field
+from typing import Optional, Dict, Any, List, Tuple
 from app.auth.service import verify_jwt_token
-from app.database.connection import get_db
-from app.database.models import Form, FormStatus, Section, Question, ResponseSession, Response, User
-from app.dependencies import get_current_user
+from app.database.connection import get_db, get_submit_db
+from app.database.routing import get_analytics_read_db, get_read_db, read_sessionmaker
+from app.database.models import Form, FormStatus, Section, Question, ResponseSession, Response
+from app.dependencies import ensure_form_owner, get_current_user, resolve_user_id
+from app.analytics.service import TextSummaryService
+from app.analytics.text_sketch import TEXT_QUESTION_TYPES
+from app.config import settings
+from app.core.cache import analytics_cache, form_owner_cache, freshness_for, question_metadata_cache
+from app.core.metrics import record_submission
+from app.dashboard.service import DashboardStatsService, ActivityService
+from app.exports.jobs import ExportJobService
+from app.core.pagination import encode_cursor, decode_cursor
+from app.forms.search import ResponseSearchService
+from app.forms.filters import SessionFilter, compile_filters, numeric_answer
 from datetime import datetime
 from sqlalchemy.exc import SQLAlchemyError
 from fastapi import status as http_status
-from sqlalchemy import func, cast, Date, Column
+from sqlalchemy import func, cast, Date, Column, tuple_
 from fastapi import Request
 
 router = APIRouter()
@@ -99,6 +110,7 @@ class QuestionAnalyticsResponse(BaseModel):
     type: str
     total: int
     distribution: Optional[dict] = None
+    text_summary: Optional[dict] = None  # top-k termos/frases para texto livre
 
 class FormAnalyticsResponse(BaseModel):
     total_responses: int
@@ -113,6 +125,31 @@ class ResponseSessionSummary(BaseModel):
     respondent_ip: Optional[str]
     user_agent: Optional[str]
 
+class ResponseSessionPage(BaseModel):
+    items: List[ResponseSessionSummary]
+    next_cursor: Optional[str] = None
+    total: Optional[int] = None  # apenas sem filtros (vem do contador do formulário)
+
+class FacetCountsResponse(BaseModel):
+    total_sessions: int
+    facets: Dict[str, Dict[str, int]]  # question_id -> {valor armazenado: sessões}
+
+class SearchMatch(BaseModel):
+    question_id: str
+    question_title: str
+    snippet: str  # trecho com os termos encontrados entre <mark></mark>
+
+class SearchResult(BaseModel):
+    session_id: str
+    rank: float
+    submitted_at: Optional[datetime]
+    respondent_email: Optional[str]
+    matches: List[SearchMatch]
+
+class SearchResultPage(BaseModel):
+    items: List[SearchResult]
+    next_cursor: Optional[str] = None
+
 class AnswerDetail(BaseModel):
     question_id: str
     question_title: str
@@ -127,6 +164,17 @@ class ResponseSessionDetail(BaseModel):
     user_agent: Optional[str]
     answers: List[AnswerDetail]
 
+class ResponseBatchRequest(BaseModel):
+    # Sessões explícitas, ou uma página do formulário (form_id + cursor da listagem)
+    session_ids: Optional[List[str]] = Field(None, max_length=100)
+    form_id: Optional[str] = None
+    cursor: Optional[str] = None
+    limit: int = Field(50, ge=1, le=100)
+
+class ResponseBatchResponse(BaseModel):
+    items: List[ResponseSessionDetail]
+    next_cursor: Optional[str] = None
+
 class AnswerSubmitRequest(BaseModel):
     question_id: str
     value: List[str]  # Sempre array, mesmo para single choice
@@ -149,14 +197,7 @@ async def create_form(
     Cria um novo formulário com status de rascunho e retorna o formId.
     """
     try:
-        # Buscar o user_id correto baseado no github_id
-        result = await db.execute(
-            select(User.id).where(User.github_id == current_user["github_id"])
-        )
-        user_record = result.scalar_one_or_none()
-        
-        if not user_record:
-            raise HTTPException(status_code=404, detail="Usuário não encontrado no banco de dados")
+        user_record = await resolve_user_id(db, current_user)
         
         new_form = Form(
             user_id=user_record,
@@ -169,6 +210,9 @@ async def create_form(
             updated_at=datetime.utcnow(),
         )
         db.add(new_form)
+        await db.flush()  # Garante new_form.id
+        await DashboardStatsService.on_form_created(db, user_record)
+        await ActivityService.record(db, user_record, "form_created", str(new_form.id), new_form.title)
         await db.commit()
         await db.refresh(new_form)
         return FormCreateResponse(formId=str(new_form.id))
@@ -187,6 +231,8 @@ async def create_section_with_questions(
     Cria uma nova seção (e suas perguntas) para um formulário.
     """
     try:
+        await ensure_form_owner(db, form_id, await resolve_user_id(db, current_user))
+
         # Cria a seção
         new_section = Section(
             form_id=form_id,
@@ -198,6 +244,7 @@ async def create_section_with_questions(
         await db.flush()  # Garante que new_section.id está disponível
 
         # Cria as perguntas
+        new_questions = []
         for q in section_data.questions:
             new_question = Question(
                 section_id=new_section.id,
@@ -210,8 +257,14 @@ async def create_section_with_questions(
                 order=q.order
             )
             db.add(new_question)
+            new_questions.append(new_question)
+        await db.flush()
+        # Resumo de texto livre nasce com a pergunta (o merge só atualiza)
+        await TextSummaryService.create_for(db, new_questions)
 
         await db.commit()
+        analytics_cache.invalidate(("form", form_id))
+        question_metadata_cache.invalidate(form_id)
         await db.refresh(new_section)
         return SectionCreateResponse(sectionId=str(new_section.id))
     except SQLAlchemyError as e:
@@ -234,6 +287,7 @@ async def update_section_and_questions(
         section = result.scalar_one_or_none()
         if not section:
             raise HTTPException(status_code=404, detail="Seção não encontrada")
+        await ensure_form_owner(db, str(section.form_id), await resolve_user_id(db, current_user))
 
         # Atualiza dados da seção
         section.title = section_data.title  # type: ignore
@@ -254,6 +308,7 @@ async def update_section_and_questions(
             await db.delete(existing_questions[qid])
 
         # Atualizar ou criar perguntas
+        kept_questions = []
         for q in section_data.questions:
             if q.id and q.id in existing_questions:
                 # Atualizar existente
@@ -266,6 +321,7 @@ async def update_section_and_questions(
                 question.validation = q.validation  # type: ignore
                 question.order = q.order  # type: ignore
                 question.updated_at = datetime.utcnow()  # type: ignore
+                kept_questions.append(question)
             else:
                 # Criar nova
                 new_question = Question(
@@ -279,8 +335,14 @@ async def update_section_and_questions(
                     order=q.order
                 )
                 db.add(new_question)
+                kept_questions.append(new_question)
+        await db.flush()
+        # Perguntas novas ou que passaram a ser de texto livre ganham o resumo vazio
+        await TextSummaryService.create_for(db, kept_questions)
 
         await db.commit()
+        analytics_cache.invalidate(("form", str(section.form_id)))
+        question_metadata_cache.invalidate(str(section.form_id))
         return {"message": "Seção e perguntas atualizadas com sucesso"}
     except SQLAlchemyError as e:
         await db.rollback()
@@ -300,8 +362,12 @@ async def delete_section(
         section = result.scalar_one_or_none()
         if not section:
             raise HTTPException(status_code=404, detail="Seção não encontrada")
+        form_id = str(section.form_id)
+        await ensure_form_owner(db, form_id, await resolve_user_id(db, current_user))
         await db.delete(section)
         await db.commit()
+        analytics_cache.invalidate(("form", form_id))
+        question_metadata_cache.invalidate(form_id)
         return {"message": "Seção removida com sucesso"}
     except SQLAlchemyError as e:
         await db.rollback()
@@ -320,7 +386,7 @@ async def publish_form(
     try:
         result = await db.execute(select(Form).where(Form.id == form_id))
         form = result.scalar_one_or_none()
-        if not form:
+        if not form or form.user_id != await resolve_user_id(db, current_user):
             raise HTTPException(status_code=404, detail="Formulário não encontrado")
 
         if data.title is not None:
@@ -332,7 +398,10 @@ async def publish_form(
             if data.status not in FormStatus.__members__ and data.status not in [v.value for v in FormStatus]:
                 raise HTTPException(status_code=400, detail="Status inválido")
             # Permite tanto string quanto enum
+            old_status = form.status
             form.status = FormStatus[data.status.upper()] if data.status.upper() in FormStatus.__members__ else FormStatus(data.status)  # type: ignore
+            await DashboardStatsService.on_form_status_changed(db, form.user_id, old_status, form.status)
+            await ActivityService.record_status_change(db, form, old_status)
         form.updated_at = datetime.utcnow()  # type: ignore
 
         # Atualiza ordem das seções se fornecido
@@ -364,7 +433,7 @@ async def update_form(
     try:
         result = await db.execute(select(Form).where(Form.id == form_id))
         form = result.scalar_one_or_none()
-        if not form:
+        if not form or form.user_id != await resolve_user_id(db, current_user):
             raise HTTPException(status_code=404, detail="Formulário não encontrado")
 
         # Atualizar campos se fornecidos
@@ -377,7 +446,10 @@ async def update_form(
             valid_statuses = ['draft', 'public', 'closed', 'archived', 'private']
             if data.status not in valid_statuses:
                 raise HTTPException(status_code=400, detail=f"Status inválido. Use: {', '.join(valid_statuses)}")
+            old_status = form.status
             form.status = FormStatus(data.status)  # type: ignore
+            await DashboardStatsService.on_form_status_changed(db, form.user_id, old_status, form.status)
+            await ActivityService.record_status_change(db, form, old_status)
         
         form.updated_at = datetime.utcnow()  # type: ignore
 
@@ -392,7 +464,7 @@ async def update_form(
 @router.get("/forms/{form_id}/public", response_model=FormPublicResponse, summary="Exibe formulário público para preenchimento")
 async def get_public_form(
     form_id: str,
-    db: AsyncSession = Depends(get_db)
+    db: AsyncSession = Depends(get_read_db)
 ):
     """
     Retorna o formulário completo (se status for public), incluindo seções e perguntas ordenadas.
@@ -439,14 +511,56 @@ async def get_public_form(
 @router.get("/forms/{form_id}/analytics", response_model=FormAnalyticsResponse, summary="Estatísticas agregadas das respostas do formulário")
 async def get_form_analytics(
     form_id: str,
+    request: Request,
+    where: List[str] = Query([], description="Filtros question_id:op:valor (ver app/forms/filters.py)"),
     current_user: Dict[str, Any] = Depends(get_current_user),
-    db: AsyncSession = Depends(get_db)
+    db: AsyncSession = Depends(get_read_db)
 ):
     """
     Retorna estatísticas agregadas das respostas do formulário.
+
+    O resultado é cacheado por formulário (e por filtro) e invalidado pelo
+    contador de respostas (watermark); recálculos acontecem em background
+    (single-flight).
+    """
+    await ensure_form_owner(db, form_id, await resolve_user_id(db, current_user))
+    result = await db.execute(select(Form.total_responses).where(Form.id == form_id))
+    watermark = result.scalar_one_or_none()
+    if watermark is None:
+        raise HTTPException(status_code=404, detail="Formulário não encontrado")
+
+    session_filter = await compile_filters(db, form_id, where)
+    cache_key = ("form", form_id) if session_filter is None else ("form", form_id, session_filter.key)
+
+    # Recálculo na mesma base (réplica ou primário) escolhida para esta leitura
+    session_factory = read_sessionmaker(request, "analytics")
+
+    async def load_analytics():
+        async with session_factory() as session:
+            return await compute_form_analytics(session, form_id, session_filter)
+
+    return await analytics_cache.get_or_compute(
+        cache_key, watermark, load_analytics, fresh_for=freshness_for(current_user)
+    )
+
+async def compute_form_analytics(
+    db: AsyncSession,
+    form_id: str,
+    session_filter: Optional[SessionFilter] = None
+) -> FormAnalyticsResponse:
+    """
+    Calcula as estatísticas agregadas das respostas do formulário (sem cache).
+
+    Com `session_filter`, considera apenas as sessões que satisfazem o filtro.
     """
+    session_scope = [ResponseSession.form_id == form_id]
+    response_scope = []
+    if session_filter is not None:
+        session_scope.append(session_filter.predicate)
+        response_scope.append(session_filter.response_predicate())
+
     # Busca total de respostas
-    total_responses_query = select(func.count()).select_from(ResponseSession).where(ResponseSession.form_id == form_id)
+    total_responses_query = select(func.count()).select_from(ResponseSession).where(*session_scope)
     total_responses = (await db.execute(total_responses_query)).scalar() or 0
 
     # Respostas este mês e esta semana
@@ -457,13 +571,13 @@ async def get_form_analytics(
     start_of_week = start_of_week.replace(hour=0, minute=0, second=0, microsecond=0)
 
     responses_month_query = select(func.count()).select_from(ResponseSession).where(
-        ResponseSession.form_id == form_id,
+        *session_scope,
         ResponseSession.submitted_at >= start_of_month
     )
     responses_this_month = (await db.execute(responses_month_query)).scalar() or 0
 
     responses_week_query = select(func.count()).select_from(ResponseSession).where(
-        ResponseSession.form_id == form_id,
+        *session_scope,
         ResponseSession.submitted_at >= start_of_week
     )
     responses_this_week = (await db.execute(responses_week_query)).scalar() or 0
@@ -479,18 +593,29 @@ async def get_form_analytics(
             question_ids.append(q.id)
             questions_map[q.id] = q
 
+    # Perguntas de texto livre usam o resumo top-k em vez da distribuição por valor.
+    # O resumo cobre todas as respostas, então não é exibido com filtro.
+    text_question_ids = [qid for qid in question_ids if questions_map[qid].type in TEXT_QUESTION_TYPES]
+    text_summaries = {} if session_filter is not None else await TextSummaryService.get_summaries(db, text_question_ids)
+
     responses_per_question = []
     for qid in question_ids:
         q = questions_map[qid]
         # Total de respostas para a pergunta
-        total_q_query = select(func.count()).select_from(Response).where(Response.question_id == qid)
+        total_q_query = select(func.count()).select_from(Response).where(Response.question_id == qid, *response_scope)
         total_q = (await db.execute(total_q_query)).scalar() or 0
         
-        # Gerar distribuição para todos os tipos de pergunta
+        # Distribuição limitada aos valores mais frequentes
         distribution = None
-        if total_q > 0:
-            # Busca todas as respostas e conta a distribuição
-            dist_query = select(Response.value, func.count()).where(Response.question_id == qid).group_by(Response.value)
+        if total_q > 0 and qid not in text_question_ids:
+            count_col = func.count().label("count")
+            dist_query = (
+                select(Response.value, count_col)
+                .where(Response.question_id == qid, *response_scope)
+                .group_by(Response.value)
+                .order_by(count_col.desc())
+                .limit(settings.ANALYTICS_MAX_DISTRIBUTION_ENTRIES)
+            )
             dist_result = await db.execute(dist_query)
             distribution = {row[0]: row[1] for row in dist_result.all()}
         
@@ -499,7 +624,8 @@ async def get_form_analytics(
             title=q.title,
             type=q.type,
             total=total_q,
-            distribution=distribution
+            distribution=distribution,
+            text_summary=text_summaries.get(qid)
         ))
 
     return FormAnalyticsResponse(
@@ -509,29 +635,158 @@ async def get_form_analytics(
         responses_this_week=responses_this_week
     )
 
-@router.get("/forms/{form_id}/responses", response_model=List[ResponseSessionSummary], summary="Lista sessões de respostas do formulário")
+@router.get("/forms/{form_id}/responses", response_model=ResponseSessionPage, summary="Lista sessões de respostas do formulário")
 async def list_response_sessions(
     form_id: str,
+    limit: int = Query(50, ge=1, le=200, description="Quantidade de sessões por página"),
+    cursor: Optional[str] = Query(None, description="Cursor retornado em next_cursor"),
+    date_from: Optional[datetime] = Query(None, description="Submetidas a partir de (inclusive)"),
+    date_to: Optional[datetime] = Query(None, description="Submetidas antes de (exclusive)"),
+    respondent_email: Optional[str] = Query(None, description="E-mail exato do respondente"),
+    where: List[str] = Query([], description="Filtros por resposta question_id:op:valor (ex: <id>:gte:8)"),
+    include_total: bool = Query(False, description="Inclui o total de sessões (somente sem filtros)"),
     current_user: Dict[str, Any] = Depends(get_current_user),
-    db: AsyncSession = Depends(get_db)
+    db: AsyncSession = Depends(get_read_db)
 ):
     """
-    Lista sessões de respostas (envios) do formulário.
+    Lista sessões de respostas (envios) do formulário, da mais recente para a mais antiga.
+
+    Paginação keyset sobre (submitted_at, id), servida pelo índice
+    ix_response_sessions_form_submitted: o custo de uma página não depende
+    da profundidade. Envie o `next_cursor` para buscar a página seguinte.
     """
-    result = await db.execute(
-        select(ResponseSession).where(ResponseSession.form_id == form_id).order_by(ResponseSession.submitted_at.desc())
+    await ensure_form_owner(db, form_id, await resolve_user_id(db, current_user))
+    result = await db.execute(select(Form.total_responses).where(Form.id == form_id))
+    form_total = result.one_or_none()
+    if form_total is None:
+        raise HTTPException(status_code=404, detail="Formulário não encontrado")
+
+    query = select(
+        ResponseSession.id,
+        ResponseSession.submitted_at,
+        ResponseSession.respondent_email,
+        ResponseSession.respondent_ip,
+        ResponseSession.user_agent
+    ).where(ResponseSession.form_id == form_id)
+
+    filtered = False
+    if date_from is not None:
+        query = query.where(ResponseSession.submitted_at >= date_from)
+        filtered = True
+    if date_to is not None:
+        query = query.where(ResponseSession.submitted_at < date_to)
+        filtered = True
+    if respondent_email:
+        query = query.where(ResponseSession.respondent_email == respondent_email)
+        filtered = True
+    session_filter = await compile_filters(db, form_id, where)
+    if session_filter is not None:
+        query = query.where(session_filter.predicate)
+        filtered = True
+    if cursor:
+        cursor_submitted_at, cursor_id = decode_cursor(cursor, 2)
+        query = query.where(
+            tuple_(ResponseSession.submitted_at, ResponseSession.id) < tuple_(cursor_submitted_at, cursor_id)
+        )
+
+    query = query.order_by(ResponseSession.submitted_at.desc(), ResponseSession.id.desc()).limit(limit + 1)
+    rows = (await db.execute(query)).all()
+
+    next_cursor = None
+    if len(rows) > limit:
+        rows = rows[:limit]
+        next_cursor = encode_cursor(rows[-1].submitted_at, rows[-1].id)
+
+    return ResponseSessionPage(
+        items=[
+            ResponseSessionSummary(
+                id=str(s.id),
+                submitted_at=s.submitted_at if isinstance(s.submitted_at, datetime) else datetime.utcnow(),
+                respondent_email=s.respondent_email,
+                respondent_ip=s.respondent_ip,
+                user_agent=s.user_agent
+            ) for s in rows
+        ],
+        next_cursor=next_cursor,
+        total=(form_total[0] or 0) if include_total and not filtered else None
     )
-    sessions = result.scalars().all()
-    return [
-        ResponseSessionSummary(
-            id=str(s.id),
-            submitted_at=s.submitted_at if isinstance(s.submitted_at, datetime) else datetime.utcnow(),
-            respondent_email=str(s.respondent_email) if s.respondent_email is not None else None,
-            respondent_ip=str(s.respondent_ip) if s.respondent_ip is not None else None,
-            user_agent=str(s.user_agent) if s.user_agent is not None else None
-        ) for s in sessions
+
+@router.get("/forms/{form_id}/facets", response_model=FacetCountsResponse, summary="Contagem de valores por pergunta (facetas)")
+async def get_form_facets(
+    form_id: str,
+    question_id: List[str] = Query([], description="Perguntas das facetas (padrão: todas exceto texto livre)"),
+    where: List[str] = Query([], description="Filtros question_id:op:valor aplicados antes da contagem"),
+    current_user: Dict[str, Any] = Depends(get_current_user),
+    db: AsyncSession = Depends(get_analytics_read_db)
+):
+    """
+    Contagem dos valores mais frequentes de cada pergunta entre as sessões
+    filtradas, calculada em uma única consulta agrupada.
+    """
+    await ensure_form_owner(db, form_id, await resolve_user_id(db, current_user))
+
+    session_filter = await compile_filters(db, form_id, where)
+
+    questions_query = (
+        select(Question.id, Question.type)
+        .join(Section, Question.section_id == Section.id)
+        .where(Section.form_id == form_id)
+    )
+    if question_id:
+        questions_query = questions_query.where(Question.id.in_(question_id))
+    facet_ids = [
+        row.id for row in (await db.execute(questions_query)).all()
+        if question_id or row.type not in TEXT_QUESTION_TYPES
     ]
 
+    total_query = select(func.count()).select_from(ResponseSession).where(ResponseSession.form_id == form_id)
+    if session_filter is not None:
+        total_query = total_query.where(session_filter.predicate)
+    total_sessions = (await db.execute(total_query)).scalar() or 0
+
+    facets: Dict[str, Dict[str, int]] = {qid: {} for qid in facet_ids}
+    if facet_ids:
+        count_col = func.count().label("count")
+        counts = (
+            select(
+                Response.question_id,
+                Response.value,
+                count_col,
+                func.row_number().over(partition_by=Response.question_id, order_by=count_col.desc()).label("position"),
+            )
+            .where(Response.question_id.in_(facet_ids), Response.value.isnot(None))
+            .group_by(Response.question_id, Response.value)
+        )
+        if session_filter is not None:
+            counts = counts.where(session_filter.response_predicate())
+        counts = counts.subquery()
+        rows = await db.execute(
+            select(counts.c.question_id, counts.c.value, counts.c.count)
+            .where(counts.c.position <= settings.ANALYTICS_MAX_DISTRIBUTION_ENTRIES)
+        )
+        for row in rows:
+            facets[row.question_id][row.value] = row.count
+
+    return FacetCountsResponse(total_sessions=total_sessions, facets=facets)
+
+@router.get("/forms/{form_id}/search", response_model=SearchResultPage, summary="Busca textual nas respostas do formulário")
+async def search_form_responses(
+    form_id: str,
+    q: str = Query(..., min_length=1, max_length=200, description='Termos de busca (aceita "frases", OR e -exclusão)'),
+    limit: int = Query(20, ge=1, le=100, description="Quantidade de sessões por página"),
+    cursor: Optional[str] = Query(None, description="Cursor retornado em next_cursor"),
+    current_user: Dict[str, Any] = Depends(get_current_user),
+    db: AsyncSession = Depends(get_analytics_read_db)
+):
+    """
+    Sessões cujas respostas mencionam os termos, da mais relevante para a menos,
+    com trechos destacados. Usa o índice GIN de responses.search_vector.
+    """
+    await ensure_form_owner(db, form_id, await resolve_user_id(db, current_user))
+
+    items, next_cursor = await ResponseSearchService.search(db, form_id, q, limit, cursor)
+    return SearchResultPage(items=[SearchResult(**item) for item in items], next_cursor=next_cursor)
+
 @router.get("/responses/{answer_session_id}", response_model=ResponseSessionDetail, summary="Detalha uma sessão de resposta individual")
 async def get_response_session_detail(
     answer_session_id: str,
@@ -546,6 +801,7 @@ async def get_response_session_detail(
     session = result.scalar_one_or_none()
     if not session:
         raise HTTPException(status_code=404, detail="Sessão de resposta não encontrada")
+    await ensure_form_owner(db, str(session.form_id), await resolve_user_id(db, current_user))
     # Busca respostas
     result = await db.execute(select(Response).where(Response.session_id == answer_session_id))
     answers = result.scalars().all()
@@ -572,12 +828,121 @@ async def get_response_session_detail(
         ]
     )
 
+async def get_question_metadata(db: AsyncSession, form_ids: List[str]) -> Dict[str, Tuple[str, str]]:
+    """Mapa question_id -> (título, tipo) dos formulários, via question_metadata_cache"""
+    metadata: Dict[str, Tuple[str, str]] = {}
+    missing = []
+    for form_id in set(form_ids):
+        cached = question_metadata_cache.get(form_id)
+        if cached is None:
+            missing.append(form_id)
+        else:
+            metadata.update(cached)
+
+    if missing:
+        result = await db.execute(
+            select(Section.form_id, Question.id, Question.title, Question.type)
+            .join(Section, Question.section_id == Section.id)
+            .where(Section.form_id.in_(missing))
+        )
+        loaded: Dict[str, Dict[str, Tuple[str, str]]] = {form_id: {} for form_id in missing}
+        for row in result:
+            loaded[row.form_id][row.id] = (row.title or "", row.type or "")
+        for form_id, questions in loaded.items():
+            question_metadata_cache.set(form_id, questions)
+            metadata.update(questions)
+    return metadata
+
+@router.post("/responses/batch", response_model=ResponseBatchResponse, summary="Detalha várias sessões de resposta de uma vez")
+async def get_response_sessions_batch(
+    data: ResponseBatchRequest,
+    current_user: Dict[str, Any] = Depends(get_current_user),
+    db: AsyncSession = Depends(get_db)
+):
+    """
+    Retorna as sessões com suas respostas em uma única consulta (sessões +
+    respostas, com a verificação de dono embutida no join). Os metadados das
+    perguntas vêm de cache.
+
+    Envie `session_ids` (até 100) ou `form_id` com o `cursor` da listagem
+    (mesma ordem de /forms/{form_id}/responses).
+    """
+    if not data.session_ids and not data.form_id:
+        raise HTTPException(status_code=400, detail="Informe session_ids ou form_id")
+
+    sessions = (
+        select(
+            ResponseSession.id,
+            ResponseSession.form_id,
+            ResponseSession.submitted_at,
+            ResponseSession.respondent_email,
+            ResponseSession.respondent_ip,
+            ResponseSession.user_agent
+        )
+        .join(Form, ResponseSession.form_id == Form.id)
+        .where(Form.user_id == await resolve_user_id(db, current_user))
+    )
+    if data.session_ids:
+        sessions = sessions.where(ResponseSession.id.in_(data.session_ids))
+    else:
+        sessions = sessions.where(ResponseSession.form_id == data.form_id)
+        if data.cursor:
+            cursor_submitted_at, cursor_id = decode_cursor(data.cursor, 2)
+            sessions = sessions.where(
+                tuple_(ResponseSession.submitted_at, ResponseSession.id) < tuple_(cursor_submitted_at, cursor_id)
+            )
+        sessions = sessions.order_by(ResponseSession.submitted_at.desc(), ResponseSession.id.desc()).limit(data.limit + 1)
+    sessions = sessions.subquery()
+
+    rows = (await db.execute(
+        select(sessions, Response.question_id, Response.value)
+        .outerjoin(Response, Response.session_id == sessions.c.id)
+        .order_by(sessions.c.submitted_at.desc(), sessions.c.id.desc())
+    )).all()
+
+    ordered: Dict[str, Any] = {}
+    answers: Dict[str, List[Tuple[str, str]]] = {}
+    for row in rows:
+        if row.id not in ordered:
+            ordered[row.id] = row
+            answers[row.id] = []
+        if row.question_id is not None:
+            answers[row.id].append((row.question_id, row.value))
+
+    session_rows = list(ordered.values())
+    next_cursor = None
+    if not data.session_ids and len(session_rows) > data.limit:
+        session_rows = session_rows[:data.limit]
+        next_cursor = encode_cursor(session_rows[-1].submitted_at, session_rows[-1].id)
+
+    questions = await get_question_metadata(db, [s.form_id for s in session_rows])
+    return ResponseBatchResponse(
+        items=[
+            ResponseSessionDetail(
+                id=str(s.id),
+                submitted_at=s.submitted_at if isinstance(s.submitted_at, datetime) else datetime.utcnow(),
+                respondent_email=s.respondent_email,
+                respondent_ip=s.respondent_ip,
+                user_agent=s.user_agent,
+                answers=[
+                    AnswerDetail(
+                        question_id=str(question_id),
+                        question_title=questions.get(question_id, ("", ""))[0],
+                        question_type=questions.get(question_id, ("", ""))[1],
+                        value=str(value)
+                    ) for question_id, value in answers[s.id]
+                ]
+            ) for s in session_rows
+        ],
+        next_cursor=next_cursor
+    )
+
 @router.post("/forms/{form_id}/submit", response_model=SubmitFormResponse, summary="Submissão pública de respostas do formulário")
 async def submit_form_response(
     form_id: str,
     data: SubmitFormRequest,
     request: Request,  # Usa o tipo correto do starlette
-    db: AsyncSession = Depends(get_db)
+    db: AsyncSession = Depends(get_submit_db)
 ):
     """
     Submissão pública de respostas do formulário. Cria ResponseSession e Responses.
@@ -597,15 +962,25 @@ async def submit_form_response(
         db.add(session)
         await db.flush()  # Garante session.id
         # Cria respostas
+        stored_values = {}
         for ans in data.answers:
             value_json = dumps(ans.value)  # Sempre serializa como JSON string
             response = Response(
                 session_id=session.id,
                 question_id=ans.question_id,
-                value=value_json
+                value=value_json,
+                value_numeric=numeric_answer(ans.value)
             )
             db.add(response)
+            stored_values[ans.question_id] = value_json
+        # Respostas de texto livre entram nos resumos top-k pelo merge em background
+        await TextSummaryService.ingest(db, stored_values)
+        # Contadores do formulário (watermark do cache de analytics) e do dashboard do dono
+        owner = await DashboardStatsService.on_submission(db, form_id)
+        if owner is not None:
+            await ActivityService.record_submission(db, owner[0], form_id, owner[1])
         await db.commit()
+        record_submission(len(data.answers))
         await db.refresh(session)
         return SubmitFormResponse(session_id=str(session.id), submitted_at=session.submitted_at if isinstance(session.submitted_at, datetime) else datetime.utcnow())
     except Exception as e:
@@ -633,14 +1008,7 @@ async def delete_form(
         print(f"🔍 DEBUG - Tentando deletar formulário: {form_id}")
         print(f"🔍 DEBUG - Current user github_id: {current_user['github_id']}")
         
-        # Buscar o user_id correto baseado no github_id
-        result = await db.execute(
-            select(User.id).where(User.github_id == current_user["github_id"])
-        )
-        user_record = result.scalar_one_or_none()
-        
-        if not user_record:
-            raise HTTPException(status_code=404, detail="Usuário não encontrado no banco de dados")
+        user_record = await resolve_user_id(db, current_user)
         
         print(f"🔍 DEBUG - User ID encontrado: {user_record}")
         
@@ -665,8 +1033,12 @@ async def delete_form(
         
         print(f"🔍 DEBUG - Tentando deletar formulário do banco...")
         # Remove o formulário (cascade irá remover seções, perguntas e respostas)
+        await DashboardStatsService.on_form_deleted(db, form)
+        export_keys = await ExportJobService.storage_keys_for_form(db, form_id)
         await db.delete(form)
         await db.commit()
+        form_owner_cache.invalidate(form_id)
+        await ExportJobService.delete_files(export_keys)
         print(f"🔍 DEBUG - Formulário deletado com sucesso!")
         
         return {"message": "Formulário removido com sucesso"}
@@ -694,22 +1066,7 @@ async def get_form_sections(
     Retorna todas as seções de um formulário com suas perguntas.
     """
     try:
-        # Verificar se o usuário tem acesso ao formulário
-        user_result = await db.execute(
-            select(User.id).where(User.github_id == current_user["github_id"])
-        )
-        user_record = user_result.scalar_one_or_none()
-        
-        if not user_record:
-            raise HTTPException(status_code=404, detail="Usuário não encontrado")
-        
-        form_result = await db.execute(
-            select(Form).where(Form.id == form_id, Form.user_id == user_record)
-        )
-        form = form_result.scalar_one_or_none()
-        
-        if not form:
-            raise HTTPException(status_code=404, detail="Formulário não encontrado")
+        await ensure_form_owner(db, form_id, await resolve_user_id(db, current_user))
         
         # Buscar seções com perguntas
         sections_result = await db.execute(
@@ -766,14 +1123,7 @@ async def get_form(
     Busca os dados básicos de um formulário específico.
     """
     try:
-        # Verificar se o usuário tem acesso ao formulário
-        user_result = await db.execute(
-            select(User.id).where(User.github_id == current_user["github_id"])
-        )
-        user_record = user_result.scalar_one_or_none()
-        
-        if not user_record:
-            raise HTTPException(status_code=404, detail="Usuário não encontrado")
+        user_record = await resolve_user_id(db, current_user)
         
         form_result = await db.execute(
             select(Form).where(Form.id == form_id, Form.user_id == user_record)
@@ -818,22 +1168,7 @@ async def get_section(
         if not section:
             raise HTTPException(status_code=404, detail="Seção não encontrada")
         
-        # Verificar se o usuário tem acesso ao formulário da seção
-        user_result = await db.execute(
-            select(User.id).where(User.github_id == current_user["github_id"])
-        )
-        user_record = user_result.scalar_one_or_none()
-        
-        if not user_record:
-            raise HTTPException(status_code=404, detail="Usuário não encontrado")
-        
-        form_result = await db.execute(
-            select(Form).where(Form.id == section.form_id, Form.user_id == user_record)
-        )
-        form = form_result.scalar_one_or_none()
-        
-        if not form:
-            raise HTTPException(status_code=404, detail="Formulário não encontrado ou não autorizado")
+        await ensure_form_owner(db, section.form_id, await resolve_user_id(db, current_user))
         
         # Buscar perguntas da seção
         questions_result = await db.execute(
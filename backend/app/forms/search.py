@@ -0,0 +1,150 @@
+"""
+Busca Textual nas Respostas - Full-Text Search
+=============================================
+
+Busca "todas as respostas que mencionam reembolso" dentro de um formulário:
+
+- Response.search_vector: coluna gerada (to_tsvector na configuração
+  SEARCH_LANGUAGE sobre o JSON decodificado, então acentos casam) mantida
+  pelo próprio Postgres a cada INSERT/UPDATE
+- Índice GIN ix_responses_search_vector: a consulta `@@` não lê as respostas
+  que não casam
+- Ranking por sessão (maior ts_rank_cd entre as respostas da sessão) com
+  paginação keyset sobre (rank, session_id)
+- Trechos destacados (ts_headline) calculados apenas para a página atual
+
+A consulta aceita a sintaxe de websearch_to_tsquery: palavras, "frases
+entre aspas", OR e -exclusão.
+
+Autor: Equipe de Desenvolvimento
+"""
+
+import html
+from typing import Any, Dict, List, Optional, Tuple
+
+from sqlalchemy import and_, cast, func, literal, or_, select, text
+from sqlalchemy.dialects.postgresql import REGCONFIG
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.analytics.text_sketch import answer_text
+from app.config import settings
+from app.core.pagination import decode_cursor, encode_cursor
+from app.database.models import Question, Response, ResponseSession
+
+# Respostas destacadas por sessão no resultado
+MAX_SNIPPETS_PER_SESSION = 3
+
+HEADLINE_OPTIONS = "StartSel=<mark>, StopSel=</mark>, MaxWords=30, MinWords=10, MaxFragments=2"
+
+_HEADLINE_SQL = text(
+    "SELECT ts_headline(CAST(:config AS regconfig), t, websearch_to_tsquery(CAST(:config AS regconfig), :q), :options) "
+    "FROM unnest(CAST(:texts AS text[])) WITH ORDINALITY AS u(t, ord) ORDER BY ord"
+)
+
+
+class ResponseSearchService:
+    """Busca ranqueada de sessões por texto das respostas"""
+
+    @staticmethod
+    async def search(
+            db: AsyncSession,
+            form_id: str,
+            q: str,
+            limit: int,
+            cursor: Optional[str] = None
+    ) -> Tuple[List[Dict[str, Any]], Optional[str]]:
+        """
+        Sessões do formulário cujas respostas casam com `q`, da mais relevante para a menos
+
+        Returns:
+            (resultados, next_cursor)
+        """
+        config = cast(literal(settings.SEARCH_LANGUAGE), REGCONFIG)
+        tsquery = func.websearch_to_tsquery(config, q)
+
+        matches = (
+            select(
+                Response.session_id.label("session_id"),
+                func.max(func.ts_rank_cd(Response.search_vector, tsquery)).label("rank"),
+            )
+            .join(ResponseSession, Response.session_id == ResponseSession.id)
+            .where(ResponseSession.form_id == form_id, Response.search_vector.op("@@")(tsquery))
+            .group_by(Response.session_id)
+            .subquery()
+        )
+
+        query = (
+            select(
+                matches.c.session_id,
+                matches.c.rank,
+                ResponseSession.submitted_at,
+                ResponseSession.respondent_email,
+            )
+            .join(ResponseSession, ResponseSession.id == matches.c.session_id)
+        )
+        if cursor:
+            cursor_rank, cursor_id = decode_cursor(cursor, 2)
+            query = query.where(or_(
+                matches.c.rank < cursor_rank,
+                and_(matches.c.rank == cursor_rank, matches.c.session_id > cursor_id),
+            ))
+        query = query.order_by(matches.c.rank.desc(), matches.c.session_id).limit(limit + 1)
+        rows = (await db.execute(query)).all()
+
+        next_cursor = None
+        if len(rows) > limit:
+            rows = rows[:limit]
+            next_cursor = encode_cursor(rows[-1].rank, rows[-1].session_id)
+        if not rows:
+            return [], None
+
+        snippets = await ResponseSearchService._snippets(db, [r.session_id for r in rows], q, tsquery)
+        results = [
+            {
+                "session_id": r.session_id,
+                "rank": r.rank,
+                "submitted_at": r.submitted_at,
+                "respondent_email": r.respondent_email,
+                "matches": snippets.get(r.session_id, []),
+            }
+            for r in rows
+        ]
+        return results, next_cursor
+
+    @staticmethod
+    async def _snippets(db: AsyncSession, session_ids: List[str], q: str, tsquery) -> Dict[str, List[Dict[str, str]]]:
+        """Trechos destacados das respostas que casam, somente para as sessões da página"""
+        result = await db.execute(
+            select(Response.session_id, Response.question_id, Question.title, Response.value)
+            .join(Question, Question.id == Response.question_id)
+            .where(Response.session_id.in_(session_ids), Response.search_vector.op("@@")(tsquery))
+            .order_by(Response.session_id, func.ts_rank_cd(Response.search_vector, tsquery).desc())
+        )
+        answers: List[Tuple[str, str, str, str]] = []
+        per_session: Dict[str, int] = {}
+        for row in result:
+            if per_session.get(row.session_id, 0) >= MAX_SNIPPETS_PER_SESSION:
+                continue
+            per_session[row.session_id] = per_session.get(row.session_id, 0) + 1
+            answers.append((row.session_id, row.question_id, row.title, html.escape(answer_text(row.value), quote=False)))
+
+        if not answers:
+            return {}
+
+        # ts_headline sobre o texto decodificado (sem a serialização JSON) e já escapado,
+        # para que o único HTML do trecho seja o <mark>; uma única ida ao banco
+        headlines = (await db.execute(_HEADLINE_SQL, {
+            "config": settings.SEARCH_LANGUAGE,
+            "q": q,
+            "options": HEADLINE_OPTIONS,
+            "texts": [answer[3] for answer in answers],
+        })).scalars().all()
+
+        snippets: Dict[str, List[Dict[str, str]]] = {}
+        for (session_id, question_id, title, _), headline in zip(answers, headlines):
+            snippets.setdefault(session_id, []).append({
+                "question_id": question_id,
+                "question_title": title,
+                "snippet": headline,
+            })
+        return snippets
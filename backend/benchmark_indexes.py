@@ -0,0 +1,197 @@
+#!/usr/bin/env python3
+"""
+Benchmark de índices - planos antes/depois da migração 0003
+===========================================================
+
+Roda EXPLAIN (ANALYZE, BUFFERS) das consultas quentes duas vezes no mesmo
+banco e com os mesmos dados:
+
+- depois: com os índices atuais (migração 0003 aplicada)
+- antes: dentro de uma transação que remove os índices da 0003 e recria os
+  de coluna única que ela substituiu; a transação é desfeita no fim
+
+Cada consulta roda uma vez para aquecer o cache e a segunda execução é a
+medida. Os ids usados (usuário, formulário, seção, pergunta) são os de maior
+volume no banco.
+
+⚠️ O cenário "antes" faz DROP/CREATE INDEX dentro de transação: as tabelas
+ficam bloqueadas até o rollback. Use em staging ou numa cópia do banco.
+
+Uso:
+    python benchmark_indexes.py                    # imprime no terminal
+    python benchmark_indexes.py --output plans.md  # grava os planos em markdown
+
+Autor: Equipe de Desenvolvimento
+"""
+
+import argparse
+import asyncio
+import importlib.util
+import os
+import re
+import sys
+from typing import Dict, List, Optional, Tuple
+
+from sqlalchemy import text
+from sqlalchemy.ext.asyncio import AsyncConnection, create_async_engine
+from sqlalchemy.pool import NullPool
+
+from app.config import settings
+from app.database.connection import ssl_context
+
+MIGRATION_PATH = os.path.join(
+    os.path.dirname(os.path.abspath(__file__)), "migrations", "versions", "0003_query_pattern_indexes.py"
+)
+
+SAMPLE_SQL = {
+    "user_id": "SELECT user_id FROM forms GROUP BY user_id ORDER BY count(*) DESC LIMIT 1",
+    "form_id": "SELECT form_id FROM response_sessions GROUP BY form_id ORDER BY count(*) DESC LIMIT 1",
+    "section_id": "SELECT section_id FROM questions GROUP BY section_id ORDER BY count(*) DESC LIMIT 1",
+    "question_id": "SELECT question_id FROM responses GROUP BY question_id ORDER BY count(*) DESC LIMIT 1",
+    "numeric_question_id": (
+        "SELECT question_id FROM responses WHERE value_numeric IS NOT NULL "
+        "GROUP BY question_id ORDER BY count(*) DESC LIMIT 1"
+    ),
+}
+
+# (nome, SQL equivalente ao gerado pelas rotas, parâmetros usados)
+QUERIES: List[Tuple[str, str, Tuple[str, ...]]] = [
+    ("Painel: formulários do usuário",
+     "SELECT id, title, status, created_at, updated_at FROM forms "
+     "WHERE user_id = :user_id ORDER BY updated_at DESC LIMIT 50",
+     ("user_id",)),
+    ("Seções do formulário em ordem",
+     'SELECT * FROM sections WHERE form_id = :form_id ORDER BY "order"',
+     ("form_id",)),
+    ("Perguntas da seção em ordem",
+     'SELECT * FROM questions WHERE section_id = :section_id ORDER BY "order"',
+     ("section_id",)),
+    ("Página de respostas do formulário",
+     "SELECT id, submitted_at FROM response_sessions WHERE form_id = :form_id "
+     "ORDER BY submitted_at DESC, id DESC LIMIT 50",
+     ("form_id",)),
+    ("Analytics: respostas da pergunta em sessões filtradas",
+     "SELECT count(*) FROM responses WHERE question_id = :question_id AND session_id IN ("
+     "SELECT id FROM response_sessions WHERE form_id = :form_id "
+     "AND submitted_at >= now() - interval '30 days')",
+     ("question_id", "form_id")),
+    ("Analytics: distribuição de valores da pergunta",
+     "SELECT value, count(*) AS n FROM responses WHERE question_id = :question_id "
+     "GROUP BY value ORDER BY n DESC LIMIT 20",
+     ("question_id",)),
+    ("Filtro numérico (value_numeric >= 5)",
+     "SELECT session_id FROM responses WHERE question_id = :numeric_question_id AND value_numeric >= 5",
+     ("numeric_question_id",)),
+    ("Fila de exportação",
+     "SELECT id FROM export_jobs WHERE status = 'queued' "
+     "OR (status = 'running' AND heartbeat_at < now() - interval '5 minutes') "
+     "ORDER BY created_at LIMIT 1",
+     ()),
+]
+
+_EXECUTION_TIME = re.compile(r"Execution Time: ([\d.]+) ms")
+_BUFFERS = re.compile(r"Buffers: shared(?: hit=(\d+))?(?: read=(\d+))?")
+
+
+def load_migration():
+    spec = importlib.util.spec_from_file_location("migration_0003", MIGRATION_PATH)
+    module = importlib.util.module_from_spec(spec)
+    spec.loader.exec_module(module)
+    return module
+
+
+async def pick_samples(conn: AsyncConnection) -> Dict[str, Optional[str]]:
+    return {name: await conn.scalar(text(sql)) for name, sql in SAMPLE_SQL.items()}
+
+
+async def explain(conn: AsyncConnection, sql: str, params: Dict[str, Optional[str]]) -> str:
+    statement = text(f"EXPLAIN (ANALYZE, BUFFERS, FORMAT TEXT) {sql}")
+    await conn.execute(statement, params)  # aquece o cache
+    rows = await conn.execute(statement, params)
+    return "\n".join(row[0] for row in rows)
+
+
+def summarize(plan: str) -> str:
+    time_match = _EXECUTION_TIME.search(plan)
+    buffers = _BUFFERS.search(plan)
+    hit = int(buffers.group(1) or 0) if buffers else 0
+    read = int(buffers.group(2) or 0) if buffers else 0
+    return f"{time_match.group(1) if time_match else '?'} ms, {hit + read} buffers"
+
+
+async def collect_plans(conn: AsyncConnection, samples: Dict[str, Optional[str]]) -> Dict[str, str]:
+    plans = {}
+    for name, sql, needed in QUERIES:
+        if any(samples.get(key) is None for key in needed):
+            plans[name] = "(sem dados para esta consulta)"
+            continue
+        plans[name] = await explain(conn, sql, {key: samples[key] for key in needed})
+    return plans
+
+
+async def run(output: Optional[str]) -> None:
+    migration = load_migration()
+    engine = create_async_engine(
+        settings.DATABASE_URL,
+        poolclass=NullPool,
+        connect_args={"ssl": ssl_context, "server_settings": {"application_name": "formerr_index_benchmark"}},
+    )
+    try:
+        async with engine.connect() as conn:
+            samples = await pick_samples(conn)
+            after = await collect_plans(conn, samples)
+            await conn.rollback()
+
+            # Estado anterior à 0003, desfeito no rollback
+            async with conn.begin() as transaction:
+                for name, _ in migration.INDEXES:
+                    await conn.execute(text(f"DROP INDEX IF EXISTS {name}"))
+                for name, definition in migration.REDUNDANT_INDEXES:
+                    await conn.execute(text(f"CREATE INDEX IF NOT EXISTS {name} ON {definition}"))
+                before = await collect_plans(conn, samples)
+                await transaction.rollback()
+    finally:
+        await engine.dispose()
+
+    lines = ["# Planos antes/depois da migração 0003", ""]
+    for name, _, _ in QUERIES:
+        lines += [
+            f"## {name}",
+            "",
+            f"Antes: {summarize(before[name])} | Depois: {summarize(after[name])}",
+            "",
+            "Antes:",
+            "```",
+            before[name],
+            "```",
+            "",
+            "Depois:",
+            "```",
+            after[name],
+            "```",
+            "",
+        ]
+    report = "\n".join(lines)
+
+    if output:
+        with open(output, "w", encoding="utf-8") as file:
+            file.write(report)
+        print(f"📄 Planos gravados em {output}")
+    else:
+        print(report)
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Planos EXPLAIN antes/depois dos índices da migração 0003")
+    parser.add_argument("--output", help="Arquivo markdown de saída")
+    parser.add_argument("--force", action="store_true", help="Permite rodar com ENVIRONMENT=production")
+    args = parser.parse_args()
+
+    if settings.ENVIRONMENT == "production" and not args.force:
+        print("❌ O cenário 'antes' bloqueia as tabelas; rode em staging ou use --force")
+        sys.exit(1)
+    asyncio.run(run(args.output))
+
+
+if __name__ == "__main__":
+    main()
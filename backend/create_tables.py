@@ -1,63 +1,48 @@
 #!/usr/bin/env python3
 """
-Script para criar/recriar todas as tabelas do banco de dados
-============================================================
+Script para criar/atualizar as tabelas do banco de dados
+========================================================
 
-Este script cria todas as tabelas necessárias para o funcionamento da aplicação.
-Execute quando precisar resetar o banco ou criar as tabelas pela primeira vez.
+Aplica as migrações do Alembic (migrations/) até a última revisão. Não apaga
+dados: bancos novos recebem o schema completo e bancos existentes apenas as
+migrações pendentes.
 
-Uso: python create_tables.py
+Banco criado pelo antigo create_tables.py (drop_all + create_all), ainda sem
+a tabela alembic_version: marque a revisão correspondente antes do upgrade
+(0001, ou 0002 se os scripts 003–010 de backup/database/migrations já rodaram).
+
+Uso:
+    python create_tables.py                # alembic upgrade head
+    python create_tables.py --stamp 0001   # schema original, sem migrações aplicadas
+    python create_tables.py --sql          # só imprime o SQL
 """
 
-import asyncio
-from sqlalchemy.ext.asyncio import create_async_engine
-from app.config import settings
-from app.database.connection import Base
-from app.database.models import *  # Importa todos os models
-import ssl
-
-async def create_tables():
-    """Cria todas as tabelas no banco de dados"""
-    
-    print("🔨 Criando tabelas do banco de dados...")
-    
-    # SSL context para DigitalOcean
-    ssl_context = ssl.create_default_context()
-    ssl_context.check_hostname = False
-    ssl_context.verify_mode = ssl.CERT_NONE
-    
-    # Engine para criação das tabelas
-    engine = create_async_engine(
-        settings.DATABASE_URL,
-        echo=True,  # Mostra os SQLs executados
-        connect_args={
-            "ssl": ssl_context,
-            "server_settings": {
-                "application_name": "formerr_table_creation",
-            }
-        }
-    )
-    
-    try:
-        async with engine.begin() as conn:
-            # Drop all tables (cuidado!)
-            print("⚠️  Removendo tabelas existentes...")
-            await conn.run_sync(Base.metadata.drop_all)
-            
-            # Create all tables
-            print("✅ Criando novas tabelas...")
-            await conn.run_sync(Base.metadata.create_all)
-            
-        print("🎉 Tabelas criadas com sucesso!")
-        print("\nTabelas criadas:")
-        for table_name in Base.metadata.tables.keys():
-            print(f"  - {table_name}")
-            
-    except Exception as e:
-        print(f"❌ Erro ao criar tabelas: {e}")
-        raise
-    finally:
-        await engine.dispose()
+import argparse
+import os
+
+from alembic import command
+from alembic.config import Config
+
+ALEMBIC_INI = os.path.join(os.path.dirname(os.path.abspath(__file__)), "alembic.ini")
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Aplica as migrações do banco de dados")
+    parser.add_argument("--stamp", metavar="REVISION", help="Marca a revisão atual sem executar migrações")
+    parser.add_argument("--sql", action="store_true", help="Imprime o SQL em vez de executar")
+    args = parser.parse_args()
+
+    config = Config(ALEMBIC_INI)
+    config.set_main_option("script_location", os.path.join(os.path.dirname(ALEMBIC_INI), "migrations"))
+
+    if args.stamp:
+        print(f"🏷️  Marcando o banco na revisão {args.stamp}...")
+        command.stamp(config, args.stamp)
+    print("🔨 Aplicando migrações...")
+    command.upgrade(config, "head", sql=args.sql)
+    if not args.sql:
+        print("🎉 Banco de dados atualizado!")
+
 
 if __name__ == "__main__":
-    asyncio.run(create_tables())
+    main()
@@ -0,0 +1,48 @@
+#!/usr/bin/env python3
+"""
+Script de exportação incremental em Parquet para o warehouse
+===========================================================
+
+Exporta, para cada formulário, os dias completos ainda não exportados
+(ver app/exports/parquet.py). Pode rodar todas as noites: partições já
+escritas não são refeitas.
+
+Uso:
+    python export_parquet.py                  # todos os formulários com respostas
+    python export_parquet.py <form_id> ...    # formulários específicos
+    python export_parquet.py --output-dir /data/formerr
+"""
+
+import argparse
+import asyncio
+
+from sqlalchemy import select
+
+from app.database.connection import AsyncSessionLocal, close_db
+from app.database.models import ResponseSession
+from app.exports.parquet import export_form_parquet
+
+
+async def run(form_ids, output_dir):
+    if not form_ids:
+        async with AsyncSessionLocal() as db:
+            # Direto das sessões: forms.total_responses é um contador e pode estar defasado
+            result = await db.execute(select(ResponseSession.form_id).distinct().order_by(ResponseSession.form_id))
+            form_ids = list(result.scalars())
+
+    print(f"📦 Exportando {len(form_ids)} formulário(s) em Parquet...")
+    try:
+        for form_id in form_ids:
+            summary = await export_form_parquet(form_id, base_dir=output_dir)
+            print(f"✅ {form_id}: {len(summary['partitions'])} partição(ões), "
+                  f"{summary['sessions']} sessões, watermark {summary['watermark']}")
+    finally:
+        await close_db()
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Exportação incremental de respostas em Parquet")
+    parser.add_argument("form_ids", nargs="*", help="IDs dos formulários (padrão: todos com respostas)")
+    parser.add_argument("--output-dir", default=None, help="Diretório base (padrão: EXPORT_DIR/parquet)")
+    args = parser.parse_args()
+    asyncio.run(run(args.form_ids, args.output_dir))
@@ -22,7 +22,6 @@ github_user_mock = {
 # Criar payload do usuário
 user_payload = create_user_payload(
     github_user=github_user_mock,
-    primary_email="test@example.com",
     user_role=UserRole.FREE
 )
 
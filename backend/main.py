@@ -13,13 +13,25 @@ Fresh start! Sistema limpo focado em:
 
 from fastapi import FastAPI
 from fastapi.middleware.cors import CORSMiddleware
+from fastapi.responses import JSONResponse
 from starlette.middleware.sessions import SessionMiddleware
 from app.core.middleware import error_handler_middleware, request_middleware
+from app.core.health import health_monitor
+from app.core.metrics import metrics_middleware, metrics_response, metrics_sampler
 from app.auth.routes import router as auth_router
 from app.dashboard.routes import router as dashboard_router
 from app.forms.routes import router as forms_router
+from app.exports.routes import router as exports_router
+from app.exports.jobs import export_workers
+from app.analytics.service import text_summary_merger
+from app.email.queue import email_queue
+from app.auth.github import github_client
+from app.auth.auth_codes import auth_code_manager
+from app.auth.revocation import revocation_registry
+from app.database.routing import read_your_writes_middleware, replica_monitor
+from app.database.instrumentation import query_tracking_middleware
 from app.config import settings
-from app.database.connection import engine
+from app.database.connection import engine, pool_stats
 from sqlalchemy import text
 
 # Criar a aplicação FastAPI
@@ -48,37 +60,48 @@ app.add_middleware(
 
 # Adicionar middlewares personalizados
 app.middleware("http")(error_handler_middleware)
+app.middleware("http")(read_your_writes_middleware)
+app.middleware("http")(query_tracking_middleware)
+app.middleware("http")(metrics_middleware)
 
-# Health check endpoint for Docker/Kubernetes
+# Health checks for Docker/Kubernetes: no I/O per probe, state refreshed in background (app/core/health.py)
 @app.get("/health")
 async def health_check():
     """
-    Health check endpoint for monitoring and load balancers
+    Health check endpoint for monitoring and load balancers (503 if the database is unreachable)
     """
-    try:
-        # Test database connection
-        async with engine.begin() as conn:
-            await conn.execute(text("SELECT 1"))
-        
-        return {
-            "status": "healthy",
+    return JSONResponse(
+        status_code=200 if health_monitor.db_ok else 503,
+        content={
+            "status": "healthy" if health_monitor.db_ok else "unhealthy",
             "service": "formerr-api",
             "version": "1.0.0",
-            "database": "connected"
-        }
-    except Exception as e:
-        return {
-            "status": "unhealthy", 
-            "service": "formerr-api",
-            "version": "1.0.0",
-            "database": "disconnected",
-            "error": str(e)
+            "database": "connected" if health_monitor.db_ok else "disconnected",
+            "error": health_monitor.db_error
         }
+    )
+
+@app.get("/health/live")
+async def liveness_check():
+    """Liveness probe: the process and its event loop respond"""
+    return {"status": "alive", "uptime_seconds": health_monitor.uptime_seconds}
+
+@app.get("/health/ready")
+async def readiness_check():
+    """Readiness probe: 503 while the pod should not receive traffic"""
+    ready, details = health_monitor.readiness()
+    return JSONResponse(status_code=200 if ready else 503, content=details)
+
+# Prometheus scrape endpoint (app/core/metrics.py)
+@app.get("/metrics", include_in_schema=False)
+async def metrics():
+    return metrics_response()
 
 # Incluir rotas
 app.include_router(auth_router, prefix="/auth", tags=["auth"])
 app.include_router(dashboard_router, prefix="/dashboard", tags=["dashboard"])
 app.include_router(forms_router, tags=["forms"])
+app.include_router(exports_router, tags=["exports"])
 
 @app.get("/")
 async def root():
@@ -94,24 +117,21 @@ async def root():
 @app.get("/status_check")
 async def status_check():
     """Status detalhado da API e recursos principais"""
-    db_status = "unknown"
-    try:
-        async with engine.connect() as conn:
-            await conn.execute(text("SELECT 1"))
-            db_status = "connected"
-    except Exception as e:
-        db_status = f"error: {str(e)}"
+    ready, readiness = health_monitor.readiness()
+    db_status = "connected" if health_monitor.db_ok else f"error: {health_monitor.db_error}"
     # Esconde senha do database_url
     db_url_safe = settings.DATABASE_URL
     if "@" in db_url_safe:
         db_url_safe = db_url_safe.split("@", 1)[-1]
         db_url_safe = "***@" + db_url_safe
     return {
-        "status": "ok",
+        "status": "ok" if ready else "degraded",
         "version": settings.APP_VERSION,
         "environment": getattr(settings, "ENVIRONMENT", "unknown"),
         "database_url": db_url_safe,
         "database_status": db_status,
+        "database_pools": pool_stats(),
+        "readiness": readiness,
         "resources": [
             "/auth/*",
             "/dashboard/*",
@@ -154,6 +174,32 @@ async def startup_report():
     print("   /forms/{form_id}/submit")
     print("==============================\n")
 
+@app.on_event("startup")
+async def start_background_workers():
+    health_monitor.start()
+    metrics_sampler.start()
+    github_client.start()
+    revocation_registry.start()
+    replica_monitor.start()
+    text_summary_merger.start()
+    if settings.EXPORT_WORKERS > 0:
+        export_workers.start()
+    if settings.EMAIL_WORKERS > 0:
+        email_queue.start()
+
+@app.on_event("shutdown")
+async def stop_background_workers():
+    health_monitor.begin_drain()
+    await export_workers.stop()
+    await email_queue.stop()
+    await text_summary_merger.stop()
+    await github_client.close()
+    await auth_code_manager.close()
+    await revocation_registry.stop()
+    await replica_monitor.stop()
+    await health_monitor.stop()
+    await metrics_sampler.stop()
+
 if __name__ == "__main__":
     import uvicorn
     uvicorn.run(app, host="0.0.0.0", port=8000)
@@ -0,0 +1,73 @@
+"""
+Ambiente do Alembic - Migrações Assíncronas
+==========================================
+
+Usa o mesmo DATABASE_URL (asyncpg) e o mesmo SSL da aplicação. Cada revisão
+roda na sua própria transação; índices criados com CONCURRENTLY ficam em
+op.get_context().autocommit_block().
+
+Autor: Equipe de Desenvolvimento
+"""
+
+import asyncio
+from logging.config import fileConfig
+
+from alembic import context
+from sqlalchemy.engine import Connection
+from sqlalchemy.ext.asyncio import create_async_engine
+from sqlalchemy.pool import NullPool
+
+from app.config import settings
+from app.database.connection import Base, ssl_context
+from app.database import models  # noqa: F401  (registra as tabelas em Base.metadata)
+
+config = context.config
+
+if config.config_file_name is not None:
+    fileConfig(config.config_file_name)
+
+target_metadata = Base.metadata
+
+
+def run_migrations_offline() -> None:
+    """Gera o SQL sem conectar (alembic upgrade head --sql)"""
+    context.configure(
+        url=settings.DATABASE_URL,
+        target_metadata=target_metadata,
+        literal_binds=True,
+        dialect_opts={"paramstyle": "named"},
+        transaction_per_migration=True,
+    )
+    with context.begin_transaction():
+        context.run_migrations()
+
+
+def do_run_migrations(connection: Connection) -> None:
+    context.configure(
+        connection=connection,
+        target_metadata=target_metadata,
+        transaction_per_migration=True,
+    )
+    with context.begin_transaction():
+        context.run_migrations()
+
+
+async def run_migrations_online() -> None:
+    # Sem statement_timeout: backfills e índices em tabelas grandes levam minutos
+    engine = create_async_engine(
+        settings.DATABASE_URL,
+        poolclass=NullPool,
+        connect_args={
+            "ssl": ssl_context,
+            "server_settings": {"application_name": "formerr_migrations"},
+        },
+    )
+    async with engine.connect() as connection:
+        await connection.run_sync(do_run_migrations)
+    await engine.dispose()
+
+
+if context.is_offline_mode():
+    run_migrations_offline()
+else:
+    asyncio.run(run_migrations_online())
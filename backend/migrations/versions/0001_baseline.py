@@ -0,0 +1,121 @@
+"""Schema inicial (o que o antigo create_tables.py criava)
+
+Bancos já criados pelo create_tables.py devem ser marcados com
+`alembic stamp 0001` antes do primeiro `alembic upgrade head`.
+
+Revision ID: 0001
+Revises:
+Create Date: 2025-10-06
+"""
+
+from alembic import op
+import sqlalchemy as sa
+
+revision = "0001"
+down_revision = None
+branch_labels = None
+depends_on = None
+
+
+user_role = sa.Enum("FREE", "PRO", "ENTERPRISE", "ADMIN", name="userrole")
+form_status = sa.Enum("DRAFT", "PUBLIC", "CLOSED", "ARCHIVED", "PRIVATE", name="formstatus")
+
+
+def upgrade() -> None:
+    op.create_table(
+        "users",
+        sa.Column("id", sa.Integer(), primary_key=True),
+        sa.Column("github_id", sa.Integer(), nullable=False),
+        sa.Column("username", sa.String(255), nullable=False),
+        sa.Column("name", sa.String(255)),
+        sa.Column("email", sa.String(255)),
+        sa.Column("avatar_url", sa.Text()),
+        sa.Column("github_url", sa.Text()),
+        sa.Column("role", user_role, nullable=False),
+        sa.Column("subscription_expires", sa.DateTime(), nullable=True),
+        sa.Column("is_active", sa.Boolean()),
+        sa.Column("monthly_submissions_used", sa.Integer()),
+        sa.Column("monthly_reset_date", sa.DateTime()),
+        sa.Column("team_id", sa.String(255), nullable=True),
+        sa.Column("invited_by", sa.Integer(), sa.ForeignKey("users.id"), nullable=True),
+        sa.Column("created_at", sa.DateTime(), nullable=False),
+        sa.Column("updated_at", sa.DateTime()),
+        sa.Column("last_login", sa.DateTime()),
+    )
+    op.create_index("ix_users_id", "users", ["id"])
+    op.create_index("ix_users_github_id", "users", ["github_id"], unique=True)
+    op.create_index("ix_users_username", "users", ["username"], unique=True)
+
+    op.create_table(
+        "forms",
+        sa.Column("id", sa.String(), primary_key=True),
+        sa.Column("user_id", sa.Integer(), sa.ForeignKey("users.id", ondelete="CASCADE"), nullable=False),
+        sa.Column("title", sa.String(255), nullable=False),
+        sa.Column("description", sa.Text(), nullable=True),
+        sa.Column("icon", sa.String(10), nullable=True),
+        sa.Column("folder_color", sa.String(20), nullable=True),
+        sa.Column("status", form_status),
+        sa.Column("max_responses", sa.Integer(), nullable=True),
+        sa.Column("preview_url", sa.String(500), nullable=True),
+        sa.Column("total_responses", sa.Integer()),
+        sa.Column("created_at", sa.DateTime(), nullable=False),
+        sa.Column("updated_at", sa.DateTime()),
+    )
+    op.create_index("ix_forms_user_id", "forms", ["user_id"])
+
+    op.create_table(
+        "sections",
+        sa.Column("id", sa.String(), primary_key=True),
+        sa.Column("form_id", sa.String(), sa.ForeignKey("forms.id", ondelete="CASCADE"), nullable=False),
+        sa.Column("title", sa.String(255), nullable=False),
+        sa.Column("description", sa.Text(), nullable=True),
+        sa.Column("order", sa.Integer(), nullable=False),
+        sa.Column("created_at", sa.DateTime()),
+        sa.Column("updated_at", sa.DateTime()),
+    )
+    op.create_index("ix_sections_form_id", "sections", ["form_id"])
+
+    op.create_table(
+        "questions",
+        sa.Column("id", sa.String(), primary_key=True),
+        sa.Column("section_id", sa.String(), sa.ForeignKey("sections.id", ondelete="CASCADE"), nullable=False),
+        sa.Column("type", sa.String(50), nullable=False),
+        sa.Column("title", sa.String(500), nullable=False),
+        sa.Column("description", sa.Text(), nullable=True),
+        sa.Column("required", sa.Boolean()),
+        sa.Column("options", sa.JSON(), nullable=True),
+        sa.Column("validation", sa.JSON(), nullable=True),
+        sa.Column("order", sa.Integer(), nullable=False),
+        sa.Column("created_at", sa.DateTime()),
+        sa.Column("updated_at", sa.DateTime()),
+    )
+    op.create_index("ix_questions_section_id", "questions", ["section_id"])
+
+    op.create_table(
+        "response_sessions",
+        sa.Column("id", sa.String(), primary_key=True),
+        sa.Column("form_id", sa.String(), sa.ForeignKey("forms.id", ondelete="CASCADE"), nullable=False),
+        sa.Column("respondent_email", sa.String(255), nullable=True),
+        sa.Column("respondent_ip", sa.String(45), nullable=True),
+        sa.Column("user_agent", sa.Text(), nullable=True),
+        sa.Column("submitted_at", sa.DateTime()),
+    )
+    op.create_index("ix_response_sessions_form_id", "response_sessions", ["form_id"])
+
+    op.create_table(
+        "responses",
+        sa.Column("id", sa.String(), primary_key=True),
+        sa.Column("session_id", sa.String(), sa.ForeignKey("response_sessions.id", ondelete="CASCADE"), nullable=False),
+        sa.Column("question_id", sa.String(), sa.ForeignKey("questions.id", ondelete="CASCADE"), nullable=False),
+        sa.Column("value", sa.Text(), nullable=True),
+        sa.Column("created_at", sa.DateTime()),
+    )
+    op.create_index("ix_responses_session_id", "responses", ["session_id"])
+    op.create_index("ix_responses_question_id", "responses", ["question_id"])
+
+
+def downgrade() -> None:
+    for table in ("responses", "response_sessions", "questions", "sections", "forms", "users"):
+        op.drop_table(table)
+    form_status.drop(op.get_bind(), checkfirst=True)
+    user_role.drop(op.get_bind(), checkfirst=True)
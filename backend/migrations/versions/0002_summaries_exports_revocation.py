@@ -0,0 +1,152 @@
+"""Tabelas de resumo, exportações e revogação; colunas de busca e filtros
+
+- responses.value_numeric (backfill a partir de value) e responses.search_vector
+  (coluna gerada sobre o texto cru, aceita valores legados que não são JSON;
+  a 0007 troca pelo JSON decodificado. O ADD COLUMN reescreve a tabela,
+  rodar fora do pico)
+- users.token_generation
+- question_text_summaries, user_dashboard_stats e activity_events (preenchidas
+  sob demanda pela aplicação, sem backfill)
+- export_jobs e revoked_tokens
+- forms.total_responses recalculado (watermark do cache de analytics)
+
+Os índices das tabelas que já existiam ficam na 0003 (CONCURRENTLY).
+
+Substitui os scripts 003–010 de backup/database/migrations: banco que já
+rodou todos eles é marcado nesta revisão (create_tables.py --stamp 0002).
+
+Revision ID: 0002
+Revises: 0001
+Create Date: 2025-10-06
+"""
+
+from alembic import op
+import sqlalchemy as sa
+from sqlalchemy.dialects.postgresql import TSVECTOR
+
+from app.database.models import SEARCH_CONFIG
+
+revision = "0002"
+down_revision = "0001"
+branch_labels = None
+depends_on = None
+
+
+# Mesmo critério de app/forms/filters.py:numeric_answer para valores JSON
+# armazenados como número, texto numérico ou lista com um único item
+NUMERIC_BACKFILL_SQL = r"""
+UPDATE responses
+SET value_numeric = replace(btrim(value, '[]" '), ',', '.')::double precision
+WHERE value_numeric IS NULL
+  AND btrim(value, '[]" ') ~ '^[+-]?([0-9]+([.,][0-9]*)?|[.,][0-9]+)([eE][+-]?[0-9]+)?$'
+"""
+
+TOTAL_RESPONSES_BACKFILL_SQL = """
+UPDATE forms f
+SET total_responses = counts.total
+FROM (
+    SELECT f2.id, count(rs.id) AS total
+    FROM forms f2
+    LEFT JOIN response_sessions rs ON rs.form_id = f2.id
+    GROUP BY f2.id
+) counts
+WHERE counts.id = f.id AND f.total_responses IS DISTINCT FROM counts.total
+"""
+
+
+def upgrade() -> None:
+    op.add_column("users", sa.Column("token_generation", sa.Integer(), server_default="0", nullable=False))
+
+    op.add_column("responses", sa.Column("value_numeric", sa.Float(), nullable=True))
+    op.add_column("responses", sa.Column(
+        "search_vector",
+        TSVECTOR(),
+        sa.Computed(f"to_tsvector('{SEARCH_CONFIG}'::regconfig, coalesce(value, ''))", persisted=True),
+        nullable=True,
+    ))
+    op.execute(NUMERIC_BACKFILL_SQL)
+    op.execute(TOTAL_RESPONSES_BACKFILL_SQL)
+
+    op.create_table(
+        "question_text_summaries",
+        sa.Column("question_id", sa.String(), sa.ForeignKey("questions.id", ondelete="CASCADE"), primary_key=True),
+        sa.Column("documents", sa.Integer(), nullable=False),
+        sa.Column("sketch", sa.JSON(), nullable=False),
+        sa.Column("updated_at", sa.DateTime()),
+    )
+
+    op.create_table(
+        "user_dashboard_stats",
+        sa.Column("user_id", sa.Integer(), sa.ForeignKey("users.id", ondelete="CASCADE"), primary_key=True),
+        sa.Column("total_forms", sa.Integer(), nullable=False),
+        sa.Column("active_forms", sa.Integer(), nullable=False),
+        sa.Column("total_responses", sa.Integer(), nullable=False),
+        sa.Column("month_start", sa.DateTime(), nullable=False),
+        sa.Column("responses_this_month", sa.Integer(), nullable=False),
+        sa.Column("week_start", sa.DateTime(), nullable=False),
+        sa.Column("responses_this_week", sa.Integer(), nullable=False),
+        sa.Column("most_popular_form_id", sa.String(), sa.ForeignKey("forms.id", ondelete="SET NULL"), nullable=True),
+        sa.Column("most_popular_count", sa.Integer(), nullable=False),
+        sa.Column("updated_at", sa.DateTime()),
+    )
+
+    op.create_table(
+        "activity_events",
+        sa.Column("id", sa.BigInteger(), primary_key=True, autoincrement=True),
+        sa.Column("user_id", sa.Integer(), sa.ForeignKey("users.id", ondelete="CASCADE"), nullable=False),
+        sa.Column("form_id", sa.String(), nullable=True),
+        sa.Column("form_title", sa.String(255), nullable=True),
+        sa.Column("type", sa.String(50), nullable=False),
+        sa.Column("count", sa.Integer(), nullable=False),
+        sa.Column("created_at", sa.DateTime(), nullable=False),
+        sa.Column("last_event_at", sa.DateTime(), nullable=False),
+    )
+    op.create_index(
+        "ix_activity_events_user_created", "activity_events",
+        ["user_id", sa.text("created_at DESC"), sa.text("id DESC")],
+    )
+
+    op.create_table(
+        "export_jobs",
+        sa.Column("id", sa.String(), primary_key=True),
+        sa.Column("form_id", sa.String(), sa.ForeignKey("forms.id", ondelete="CASCADE"), nullable=False),
+        sa.Column("user_id", sa.Integer(), sa.ForeignKey("users.id", ondelete="CASCADE"), nullable=False),
+        sa.Column("format", sa.String(10), nullable=False),
+        sa.Column("status", sa.String(20), nullable=False),
+        sa.Column("total_sessions", sa.Integer(), nullable=False),
+        sa.Column("processed_sessions", sa.Integer(), nullable=False),
+        sa.Column("checkpoint", sa.String(), nullable=True),
+        sa.Column("bytes_written", sa.BigInteger(), nullable=False),
+        sa.Column("columns", sa.JSON(), nullable=True),
+        sa.Column("storage_key", sa.String(500), nullable=True),
+        sa.Column("error", sa.Text(), nullable=True),
+        sa.Column("attempts", sa.Integer(), nullable=False),
+        sa.Column("worker_id", sa.String(100), nullable=True),
+        sa.Column("heartbeat_at", sa.DateTime(), nullable=True),
+        sa.Column("created_at", sa.DateTime(), nullable=False),
+        sa.Column("started_at", sa.DateTime(), nullable=True),
+        sa.Column("finished_at", sa.DateTime(), nullable=True),
+    )
+    op.create_index("ix_export_jobs_form_id", "export_jobs", ["form_id"])
+    op.create_index("ix_export_jobs_user_id", "export_jobs", ["user_id"])
+    op.create_index("ix_export_jobs_status_created", "export_jobs", ["status", "created_at"])
+
+    op.create_table(
+        "revoked_tokens",
+        sa.Column("id", sa.BigInteger(), primary_key=True, autoincrement=True),
+        sa.Column("jti", sa.String(32), nullable=True, unique=True),
+        sa.Column("github_id", sa.Integer(), nullable=True),
+        sa.Column("generation", sa.Integer(), nullable=True),
+        sa.Column("revoked_at", sa.DateTime(), nullable=False),
+        sa.Column("expires_at", sa.DateTime(), nullable=False),
+    )
+    op.create_index("ix_revoked_tokens_revoked_at", "revoked_tokens", ["revoked_at"])
+    op.create_index("ix_revoked_tokens_expires_at", "revoked_tokens", ["expires_at"])
+
+
+def downgrade() -> None:
+    for table in ("revoked_tokens", "export_jobs", "activity_events", "user_dashboard_stats", "question_text_summaries"):
+        op.drop_table(table)
+    op.drop_column("responses", "search_vector")
+    op.drop_column("responses", "value_numeric")
+    op.drop_column("users", "token_generation")
@@ -0,0 +1,88 @@
+"""Índices compostos, cobrindo e parciais para as consultas quentes
+
+Todos criados com CREATE INDEX CONCURRENTLY (sem bloquear escritas), fora de
+transação. Um CONCURRENTLY interrompido deixa o índice INVALID: ele é
+removido e recriado na próxima execução, assim como um índice de mesmo nome
+sem o WHERE atual (ex: o numérico criado pelo script 009, antes parcial). Os índices de coluna única cobertos
+pelo prefixo de um composto são removidos depois (menos custo por INSERT).
+
+Planos antes/depois: python benchmark_indexes.py (resultado em docs/INDEX_PLANS_0003.md)
+
+Revision ID: 0003
+Revises: 0002
+Create Date: 2025-10-06
+"""
+
+from alembic import op
+import sqlalchemy as sa
+
+revision = "0003"
+down_revision = "0002"
+branch_labels = None
+depends_on = None
+
+
+# (nome, definição) na ordem de criação
+INDEXES = [
+    # Listagem do painel: WHERE user_id = ? ORDER BY updated_at DESC, só colunas leves (index-only scan)
+    ("ix_forms_user_updated",
+     "forms (user_id, updated_at DESC) INCLUDE (id, title, status, created_at)"),
+    # Seções e perguntas em ordem: WHERE form_id = ? ORDER BY "order"
+    ("ix_sections_form_order", 'sections (form_id, "order")'),
+    ("ix_questions_section_order", 'questions (section_id, "order")'),
+    # Respostas por formulário: WHERE form_id = ? [AND submitted_at >= ?] ORDER BY submitted_at DESC, id DESC
+    ("ix_response_sessions_form_submitted", "response_sessions (form_id, submitted_at, id)"),
+    # Contagens por pergunta restritas a sessões filtradas (session_id IN ...): index-only
+    ("ix_responses_question_session", "responses (question_id, session_id)"),
+    # Filtros eq/in por valor; md5 porque respostas longas excedem o limite de chave do btree
+    ("ix_responses_question_value", "responses (question_id, md5(value))"),
+    # Filtros numéricos: só respostas numéricas (comparações implicam NOT NULL)
+    ("ix_responses_question_numeric",
+     "responses (question_id, value_numeric) WHERE value_numeric IS NOT NULL"),
+    ("ix_responses_search_vector", "responses USING gin (search_vector)"),
+    # Fila de exportação: só jobs pendentes, que são poucos perto dos concluídos
+    ("ix_export_jobs_pending", "export_jobs (created_at) WHERE status IN ('queued', 'running')"),
+]
+
+# Cobertos pelos compostos acima (mesma coluna inicial)
+REDUNDANT_INDEXES = [
+    ("ix_forms_user_id", "forms (user_id)"),
+    ("ix_sections_form_id", "sections (form_id)"),
+    ("ix_questions_section_id", "questions (section_id)"),
+    ("ix_response_sessions_form_id", "response_sessions (form_id)"),
+    ("ix_responses_question_id", "responses (question_id)"),
+    ("ix_export_jobs_status_created", "export_jobs (status, created_at)"),
+]
+
+
+def _drop_if_stale(name: str, definition: str) -> None:
+    if op.get_context().as_sql:
+        return
+    row = op.get_bind().execute(
+        sa.text("SELECT indisvalid, indpred IS NOT NULL FROM pg_index WHERE indexrelid = to_regclass(:name)"),
+        {"name": name},
+    ).first()
+    if row is not None and (not row[0] or row[1] != (" WHERE " in definition)):
+        op.execute(f"DROP INDEX CONCURRENTLY IF EXISTS {name}")
+
+
+def _create(name: str, definition: str) -> None:
+    _drop_if_stale(name, definition)
+    op.execute(f"CREATE INDEX CONCURRENTLY IF NOT EXISTS {name} ON {definition}")
+
+
+def upgrade() -> None:
+    with op.get_context().autocommit_block():
+        for name, definition in INDEXES:
+            _create(name, definition)
+        for name, _ in REDUNDANT_INDEXES:
+            op.execute(f"DROP INDEX CONCURRENTLY IF EXISTS {name}")
+        op.execute("ANALYZE forms, sections, questions, response_sessions, responses, export_jobs")
+
+
+def downgrade() -> None:
+    with op.get_context().autocommit_block():
+        for name, definition in REDUNDANT_INDEXES:
+            _create(name, definition)
+        for name, _ in reversed(INDEXES):
+            op.execute(f"DROP INDEX CONCURRENTLY IF EXISTS {name}")
@@ -0,0 +1,62 @@
+"""Deltas append-only dos resumos de texto livre
+
+- question_text_summary_deltas: respostas de texto gravadas na submissão e
+  incorporadas aos sketches em background (TextSummaryMerger)
+- Perguntas de texto livre sem resumo (antes criado na primeira leitura do
+  analytics) recebem o resumo vazio e o histórico de respostas como deltas;
+  o merge processa esse backlog em lotes depois do deploy
+
+Revision ID: 0004
+Revises: 0003
+Create Date: 2025-10-13
+"""
+
+from alembic import op
+import sqlalchemy as sa
+
+from app.analytics.text_sketch import TEXT_QUESTION_TYPES
+
+revision = "0004"
+down_revision = "0003"
+branch_labels = None
+depends_on = None
+
+
+TEXT_TYPES_SQL = ", ".join(f"'{question_type}'" for question_type in sorted(TEXT_QUESTION_TYPES))
+
+MISSING_SUMMARY_SQL = (
+    f"q.type IN ({TEXT_TYPES_SQL}) "
+    "AND NOT EXISTS (SELECT 1 FROM question_text_summaries s WHERE s.question_id = q.id)"
+)
+
+BACKLOG_SQL = f"""
+INSERT INTO question_text_summary_deltas (question_id, value, created_at)
+SELECT r.question_id, r.value, now()
+FROM responses r
+JOIN questions q ON q.id = r.question_id
+WHERE {MISSING_SUMMARY_SQL}
+"""
+
+EMPTY_SUMMARIES_SQL = f"""
+INSERT INTO question_text_summaries (question_id, documents, sketch, updated_at)
+SELECT q.id, 0, '{{}}'::json, now()
+FROM questions q
+WHERE {MISSING_SUMMARY_SQL}
+"""
+
+
+def upgrade() -> None:
+    op.create_table(
+        "question_text_summary_deltas",
+        sa.Column("id", sa.BigInteger(), primary_key=True, autoincrement=True),
+        sa.Column("question_id", sa.String(), sa.ForeignKey("questions.id", ondelete="CASCADE"), nullable=False),
+        sa.Column("value", sa.Text(), nullable=True),
+        sa.Column("created_at", sa.DateTime(), nullable=False),
+    )
+    # Backlog antes dos resumos vazios: os dois usam "pergunta sem resumo"
+    op.execute(BACKLOG_SQL)
+    op.execute(EMPTY_SUMMARIES_SQL)
+
+
+def downgrade() -> None:
+    op.drop_table("question_text_summary_deltas")
@@ -0,0 +1,37 @@
+"""Backfill do feed de atividades
+
+Formulários criados antes do log activity_events recebem o evento
+form_created (antes semeado na primeira leitura do feed, e só para
+usuários ainda sem nenhum evento).
+
+Revision ID: 0005
+Revises: 0004
+Create Date: 2025-10-14
+"""
+
+from alembic import op
+
+revision = "0005"
+down_revision = "0004"
+branch_labels = None
+depends_on = None
+
+
+BACKFILL_SQL = """
+INSERT INTO activity_events (user_id, form_id, form_title, type, count, created_at, last_event_at)
+SELECT f.user_id, f.id, f.title, 'form_created', 1, f.created_at, f.created_at
+FROM forms f
+WHERE NOT EXISTS (
+    SELECT 1 FROM activity_events e
+    WHERE e.form_id = f.id AND e.type = 'form_created'
+)
+"""
+
+
+def upgrade() -> None:
+    op.execute(BACKFILL_SQL)
+
+
+def downgrade() -> None:
+    # Eventos semeados são indistinguíveis dos gravados pela aplicação
+    pass
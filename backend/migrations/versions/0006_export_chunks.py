@@ -0,0 +1,40 @@
+"""Storage das exportações no banco
+
+- export_chunks: blocos dos arquivos dos jobs de exportação, legíveis por
+  qualquer réplica da API (EXPORT_STORAGE=database). Presos ao job com
+  ON DELETE CASCADE: somem com o job (expirado ou do formulário removido).
+  Arquivos já gerados em disco local continuam disponíveis apenas com
+  EXPORT_STORAGE=local
+- ix_export_jobs_finished: jobs concluídos/falhos por finished_at, para a
+  limpeza por retenção (EXPORT_RETENTION_DAYS)
+
+Revision ID: 0006
+Revises: 0005
+Create Date: 2025-10-14
+"""
+
+from alembic import op
+import sqlalchemy as sa
+
+revision = "0006"
+down_revision = "0005"
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    op.create_table(
+        "export_chunks",
+        sa.Column("job_id", sa.String(), sa.ForeignKey("export_jobs.id", ondelete="CASCADE"), primary_key=True),
+        sa.Column("offset", sa.BigInteger(), primary_key=True),
+        sa.Column("data", sa.LargeBinary(), nullable=False),
+    )
+    op.create_index(
+        "ix_export_jobs_finished", "export_jobs", ["finished_at"],
+        postgresql_where=sa.text("status IN ('completed', 'failed')"),
+    )
+
+
+def downgrade() -> None:
+    op.drop_index("ix_export_jobs_finished", table_name="export_jobs")
+    op.drop_table("export_chunks")
@@ -0,0 +1,89 @@
+"""search_vector sobre o JSON decodificado
+
+responses.value guarda o JSON serializado com escapes ASCII ("n\\u00e3o"),
+e o to_tsvector sobre o texto cru nunca casava palavras acentuadas. A
+coluna gerada passa a usar to_tsvector(config, value::jsonb), que indexa
+cada string do array já decodificada.
+
+- Valores legados que não são JSON válido viram string JSON antes (o cast
+  falharia na coluna gerada)
+- A coluna é recriada (o ADD COLUMN reescreve a tabela, rodar fora do
+  pico) e o índice GIN volta com CONCURRENTLY
+- A 0002 cria a coluna sobre o texto cru justamente para que esta
+  normalização rode antes do cast; bancos em que a coluna já usa o JSON
+  decodificado não têm nada a fazer
+
+Revision ID: 0007
+Revises: 0006
+Create Date: 2025-10-15
+"""
+
+from alembic import op
+import sqlalchemy as sa
+from sqlalchemy.dialects.postgresql import TSVECTOR
+
+from app.database.models import SEARCH_CONFIG
+
+revision = "0007"
+down_revision = "0006"
+branch_labels = None
+depends_on = None
+
+
+DECODED_EXPRESSION = f"to_tsvector('{SEARCH_CONFIG}'::regconfig, coalesce(value, '[]')::jsonb)"
+RAW_EXPRESSION = f"to_tsvector('{SEARCH_CONFIG}'::regconfig, coalesce(value, ''))"
+
+CURRENT_EXPRESSION_SQL = """
+SELECT pg_get_expr(d.adbin, d.adrelid)
+FROM pg_attrdef d
+JOIN pg_attribute a ON a.attrelid = d.adrelid AND a.attnum = d.adnum
+WHERE d.adrelid = 'responses'::regclass AND a.attname = 'search_vector'
+"""
+
+# Função temporária (some ao fim da sessão): o cast text -> jsonb não tem versão "try"
+IS_JSON_FUNCTION_SQL = """
+CREATE FUNCTION pg_temp.formerr_is_json(t text) RETURNS boolean AS $$
+BEGIN
+    PERFORM t::jsonb;
+    RETURN true;
+EXCEPTION WHEN others THEN
+    RETURN false;
+END
+$$ LANGUAGE plpgsql
+"""
+
+NORMALIZE_LEGACY_SQL = """
+UPDATE responses SET value = to_json(value)::text
+WHERE value IS NOT NULL AND NOT pg_temp.formerr_is_json(value)
+"""
+
+
+def _recreate(expression: str) -> None:
+    op.drop_column("responses", "search_vector")  # leva junto o índice GIN
+    op.add_column("responses", sa.Column(
+        "search_vector", TSVECTOR(), sa.Computed(expression, persisted=True), nullable=True
+    ))
+
+
+def _create_index() -> None:
+    with op.get_context().autocommit_block():
+        op.execute(
+            "CREATE INDEX CONCURRENTLY IF NOT EXISTS ix_responses_search_vector "
+            "ON responses USING gin (search_vector)"
+        )
+
+
+def upgrade() -> None:
+    if not op.get_context().as_sql:
+        current = op.get_bind().execute(sa.text(CURRENT_EXPRESSION_SQL)).scalar()
+        if current is not None and "jsonb" in current:
+            return
+    op.execute(IS_JSON_FUNCTION_SQL)
+    op.execute(NORMALIZE_LEGACY_SQL)
+    _recreate(DECODED_EXPRESSION)
+    _create_index()
+
+
+def downgrade() -> None:
+    _recreate(RAW_EXPRESSION)
+    _create_index()
@@ -0,0 +1,36 @@
+"""Feed de atividades ordenado pela última atividade
+
+O feed exibe last_event_at (uma rajada de respostas agrupada continua
+crescendo), então passa a ser ordenado e paginado por (last_event_at, id):
+ix_activity_events_user_last_event substitui ix_activity_events_user_created.
+Ambos com CONCURRENTLY, fora de transação.
+
+Revision ID: 0008
+Revises: 0007
+Create Date: 2025-10-16
+"""
+
+from alembic import op
+
+revision = "0008"
+down_revision = "0007"
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    with op.get_context().autocommit_block():
+        op.execute(
+            "CREATE INDEX CONCURRENTLY IF NOT EXISTS ix_activity_events_user_last_event "
+            "ON activity_events (user_id, last_event_at DESC, id DESC)"
+        )
+        op.execute("DROP INDEX CONCURRENTLY IF EXISTS ix_activity_events_user_created")
+
+
+def downgrade() -> None:
+    with op.get_context().autocommit_block():
+        op.execute(
+            "CREATE INDEX CONCURRENTLY IF NOT EXISTS ix_activity_events_user_created "
+            "ON activity_events (user_id, created_at DESC, id DESC)"
+        )
+        op.execute("DROP INDEX CONCURRENTLY IF EXISTS ix_activity_events_user_last_event")
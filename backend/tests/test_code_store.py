@@ -0,0 +1,121 @@
+"""Store local dos códigos de autenticação (InMemoryCodeStore em app/auth/code_store.py)"""
+
+import asyncio
+from types import SimpleNamespace
+
+import pytest
+
+from app.auth import code_store
+from app.auth.code_store import InMemoryCodeStore
+
+
+class FakeClock:
+    def __init__(self):
+        self.now = 1_000.0
+
+    def time(self) -> float:
+        return self.now
+
+
+@pytest.fixture
+def clock(monkeypatch):
+    fake = FakeClock()
+    monkeypatch.setattr(code_store, "time", SimpleNamespace(time=fake.time))
+    return fake
+
+
+def run(coro):
+    return asyncio.run(coro)
+
+
+def test_set_and_get_returns_a_copy(clock):
+    store = InMemoryCodeStore(max_entries=10)
+    run(store.set("a@x.com", {"code": "123456"}, ttl_seconds=60))
+
+    data = run(store.get("a@x.com"))
+    assert data == {"code": "123456", "attempts": 0, "used": False}
+    data["attempts"] = 99
+    assert run(store.get("a@x.com"))["attempts"] == 0
+
+
+def test_entry_expires_after_ttl(clock):
+    store = InMemoryCodeStore(max_entries=10)
+    run(store.set("a", {"code": "1"}, ttl_seconds=60))
+
+    clock.now += 59
+    assert run(store.get("a")) is not None
+    clock.now += 1
+    assert run(store.get("a")) is None
+    assert store.stats["expirations"] == 1
+    assert len(store) == 0
+
+
+def test_cleanup_skips_stale_heap_entries_of_replaced_codes(clock):
+    store = InMemoryCodeStore(max_entries=10)
+    run(store.set("a", {"code": "old"}, ttl_seconds=10))
+    run(store.set("a", {"code": "new"}, ttl_seconds=100))
+
+    clock.now += 50
+    # O item do heap do código antigo venceu, mas o seq não bate com a entrada atual
+    assert run(store.cleanup_expired()) == 0
+    assert run(store.get("a"))["code"] == "new"
+
+    clock.now += 50
+    assert run(store.cleanup_expired()) == 1
+    assert len(store) == 0
+
+
+def test_cleanup_ignores_deleted_codes(clock):
+    store = InMemoryCodeStore(max_entries=10)
+    run(store.set("a", {}, ttl_seconds=10))
+    run(store.set("b", {}, ttl_seconds=30))
+    run(store.delete("a"))
+
+    clock.now += 20
+    assert run(store.cleanup_expired()) == 0
+    assert run(store.get("b")) is not None
+
+
+def test_lru_eviction_keeps_recently_read_codes(clock):
+    store = InMemoryCodeStore(max_entries=2)
+    run(store.set("a", {}, ttl_seconds=60))
+    run(store.set("b", {}, ttl_seconds=60))
+    run(store.get("a"))
+    run(store.set("c", {}, ttl_seconds=60))
+
+    assert run(store.get("b")) is None
+    assert run(store.get("a")) is not None and run(store.get("c")) is not None
+    assert store.stats["evictions"] == 1
+
+
+def test_heap_is_compacted_when_stale_entries_dominate(clock):
+    store = InMemoryCodeStore(max_entries=10)
+    for i in range(1_000):
+        run(store.set("a", {"code": str(i)}, ttl_seconds=60))
+
+    assert len(store._expiry) <= 2 * len(store) + 64 + 1
+    assert run(store.get("a"))["code"] == "999"
+
+
+def test_set_expires_other_codes_first(clock):
+    store = InMemoryCodeStore(max_entries=1)
+    run(store.set("a", {}, ttl_seconds=10))
+    clock.now += 10
+    run(store.set("b", {}, ttl_seconds=10))
+
+    # "a" venceu antes do limite ser atingido: expira, não conta como despejo
+    assert store.stats == {"evictions": 0, "expirations": 1}
+
+
+def test_attempts_and_single_use(clock):
+    store = InMemoryCodeStore(max_entries=10)
+    assert run(store.incr_attempts("a")) is None
+    assert run(store.mark_used("a")) is False
+
+    run(store.set("a", {}, ttl_seconds=60))
+    assert [run(store.incr_attempts("a")) for _ in range(3)] == [1, 2, 3]
+    assert run(store.mark_used("a")) is True
+    assert run(store.mark_used("a")) is False
+
+    clock.now += 60
+    assert run(store.incr_attempts("a")) is None
@@ -0,0 +1,80 @@
+"""Writers de exportação CSV/XLSX (app/exports/writers.py)"""
+
+import csv
+import io
+
+import pytest
+
+from app.exports.writers import CsvExportWriter, XlsxExportWriter, _neutralize_formula
+
+
+@pytest.mark.parametrize("value, expected", [
+    ("-5", "-5"),
+    ("+3.25", "+3.25"),
+    ("-1e3", "-1e3"),
+    ("-1+1", "'-1+1"),
+    ("=HYPERLINK(\"http://x\")", "'=HYPERLINK(\"http://x\")"),
+    ("+SUM(A1:A2)", "'+SUM(A1:A2)"),
+    ("@cmd", "'@cmd"),
+    ("\t=1", "'\t=1"),
+    ("\r=1", "'\r=1"),
+    ("texto = normal", "texto = normal"),
+    ("", ""),
+    (None, ""),
+    (7, "7"),
+])
+def test_neutralize_formula(value, expected):
+    assert _neutralize_formula(value) == expected
+
+
+def test_csv_quotes_formulas_in_header_and_rows():
+    writer = CsvExportWriter()
+    data = writer.header(["session_id", "=Pergunta"]) + writer.rows([["s1", "=1+1"], ["s2", "-5"]]) + writer.close()
+    assert data.startswith("\ufeff".encode("utf-8"))
+    rows = list(csv.reader(io.StringIO(data.decode("utf-8-sig"))))
+    assert rows == [["session_id", "'=Pergunta"], ["s1", "'=1+1"], ["s2", "-5"]]
+
+
+def _xlsx_bytes(writer, columns, rows):
+    return writer.header(columns) + writer.rows(rows) + writer.close()
+
+
+def test_xlsx_opens_in_openpyxl_with_text_cells():
+    openpyxl = pytest.importorskip("openpyxl")
+    data = _xlsx_bytes(XlsxExportWriter(), ["id", "Opinião"], [
+        ["s1", "=1+1"],
+        ["s2", "<b>&amp; \"aspas\"</b>"],
+        ["s3", "controle\x01removido"],
+        ["s4", ""],
+    ])
+
+    workbook = openpyxl.load_workbook(io.BytesIO(data))
+    sheet = workbook.active
+    values = [list(row) for row in sheet.iter_rows(values_only=True)]
+    assert values == [
+        ["id", "Opinião"],
+        ["s1", "=1+1"],
+        ["s2", "<b>&amp; \"aspas\"</b>"],
+        ["s3", "controleremovido"],
+        ["s4", None],
+    ]
+    # inlineStr: texto, nunca fórmula
+    assert sheet["B2"].data_type == "s"
+
+
+def test_xlsx_splits_sheets_and_repeats_header(monkeypatch):
+    openpyxl = pytest.importorskip("openpyxl")
+    monkeypatch.setattr(XlsxExportWriter, "MAX_ROWS_PER_SHEET", 3)
+    data = _xlsx_bytes(XlsxExportWriter(), ["id"], [[f"s{i}"] for i in range(5)])
+
+    workbook = openpyxl.load_workbook(io.BytesIO(data))
+    assert workbook.sheetnames == ["Respostas 1", "Respostas 2", "Respostas 3"]
+    sheets = [[row[0] for row in ws.iter_rows(values_only=True)] for ws in workbook.worksheets]
+    assert sheets == [["id", "s0", "s1"], ["id", "s2", "s3"], ["id", "s4"]]
+
+
+def test_xlsx_without_rows_is_a_valid_workbook():
+    openpyxl = pytest.importorskip("openpyxl")
+    writer = XlsxExportWriter()
+    data = writer.header(["id"]) + writer.close()
+    assert [row for row in openpyxl.load_workbook(io.BytesIO(data)).active.iter_rows(values_only=True)] == [("id",)]
@@ -0,0 +1,69 @@
+"""DSL de filtros por resposta (app/forms/filters.py)"""
+
+import pytest
+from fastapi import HTTPException
+
+from app.forms.filters import MAX_FILTER_CLAUSES, FilterClause, numeric_answer, parse_filters
+
+
+def test_parses_each_operator():
+    clauses = parse_filters([
+        "q1:eq:Enterprise",
+        "q2:in:Pro|Enterprise",
+        "q3:has:Azul",
+        "q4:gte:8",
+        "q5:exists",
+        "q6:eq:a:b",
+    ])
+    assert clauses == [
+        FilterClause("q1", "eq", "Enterprise"),
+        FilterClause("q2", "in", "Pro|Enterprise"),
+        FilterClause("q3", "has", "Azul"),
+        FilterClause("q4", "gte", "8"),
+        FilterClause("q5", "exists", ""),
+        # Só os dois primeiros ":" separam; o resto é valor
+        FilterClause("q6", "eq", "a:b"),
+    ]
+
+
+@pytest.mark.parametrize("expression", [
+    "q1",
+    ":eq:x",
+    "q1:like:x",
+    "q1:EQ:x",
+    "q1:eq",
+    "q1:in:",
+    "q1:gt:oito",
+    "q1:lte:",
+])
+def test_invalid_expression_is_400(expression):
+    with pytest.raises(HTTPException) as exc:
+        parse_filters([expression])
+    assert exc.value.status_code == 400
+
+
+def test_too_many_clauses_is_400():
+    with pytest.raises(HTTPException) as exc:
+        parse_filters(["q1:exists"] * (MAX_FILTER_CLAUSES + 1))
+    assert exc.value.status_code == 400
+
+
+def test_condition_compiles_for_every_operator():
+    for op, value in [("eq", "x"), ("ne", "x"), ("in", "x|y"), ("has", "50%_off"), ("lt", "1.5"), ("exists", "")]:
+        assert FilterClause("q1", op, value).condition() is not None
+
+
+@pytest.mark.parametrize("value, expected", [
+    (["8"], 8.0),
+    ([" 7,5 "], 7.5),
+    (10, 10.0),
+    ("-2.5", -2.5),
+    (["a"], None),
+    (["1", "2"], None),
+    ([], None),
+    (True, None),
+    (None, None),
+])
+def test_numeric_answer(value, expected):
+    """Valor da submissão (antes de serializar), como em submit_form_response"""
+    assert numeric_answer(value) == expected
@@ -0,0 +1,39 @@
+"""Cursores opacos da paginação keyset (app/core/pagination.py)"""
+
+import base64
+import json
+from datetime import datetime
+
+import pytest
+from fastapi import HTTPException
+
+from app.core.pagination import decode_cursor, encode_cursor
+
+
+def _raw_cursor(payload) -> str:
+    return base64.urlsafe_b64encode(json.dumps(payload).encode()).decode().rstrip("=")
+
+
+def test_round_trip_keeps_datetime_and_id():
+    key = (datetime(2025, 10, 6, 12, 30, 15, 123456), 42)
+    assert decode_cursor(encode_cursor(*key), 2) == list(key)
+
+
+def test_cursor_is_url_safe_without_padding():
+    cursor = encode_cursor(datetime(2025, 1, 1), "sessão/ü?")
+    assert "=" not in cursor and "+" not in cursor and "/" not in cursor
+    assert decode_cursor(cursor, 2) == [datetime(2025, 1, 1), "sessão/ü?"]
+
+
+@pytest.mark.parametrize("cursor", [
+    "não-é-base64!!",
+    _raw_cursor({"created_at": "2025-01-01"}),
+    _raw_cursor(["dt:2025-01-01T00:00:00"]),
+    _raw_cursor(["dt:2025-01-01T00:00:00", 1, 2]),
+    _raw_cursor(["dt:ontem", 1]),
+    base64.urlsafe_b64encode(b"\xff\xfe").decode(),
+])
+def test_invalid_cursor_is_400(cursor):
+    with pytest.raises(HTTPException) as exc:
+        decode_cursor(cursor, 2)
+    assert exc.value.status_code == 400
@@ -48,6 +48,57 @@ interface Section {
   questions: Question[];
 }
 
+type TextSummary = NonNullable<FormAnalytics['responses_per_question'][number]['text_summary']>;
+
+// Resumo de perguntas de texto livre: termos e frases mais frequentes
+function TextSummaryView({ summary, total }: { summary: TextSummary; total: number }) {
+  const groups = [
+    { label: 'Termos mais frequentes:', items: summary.top_terms.map(({ term, count }) => ({ text: term, count })) },
+    { label: 'Frases mais frequentes:', items: summary.top_phrases.map(({ phrase, count }) => ({ text: phrase, count })) },
+  ];
+  const hasItems = groups.some((group) => group.items.length > 0);
+
+  if (!hasItems) {
+    // Sem termos: sem respostas, respostas ainda na fila do merge, ou só palavras comuns
+    const message = total === 0
+      ? 'Nenhuma resposta ainda'
+      : summary.pending > 0
+        ? 'Resumo em processamento, as respostas recentes aparecem em instantes'
+        : 'As respostas não têm termos suficientes para um resumo';
+    return (
+      <div className="text-center py-4 text-gray-500 bg-gray-50 rounded-lg">
+        <div className="text-sm">{message}</div>
+      </div>
+    );
+  }
+
+  return (
+    <div className="space-y-3">
+      {groups.filter((group) => group.items.length > 0).map((group) => (
+        <div key={group.label}>
+          <div className="text-sm font-medium text-gray-700 mb-2">{group.label}</div>
+          <div className="flex flex-wrap gap-2">
+            {group.items.map(({ text, count }) => (
+              <span
+                key={text}
+                className="inline-flex items-center gap-1 px-2 py-1 bg-gray-50 border border-gray-200 rounded text-sm text-gray-700"
+                title={`${count} de ${summary.documents} respostas (${((count / summary.documents) * 100).toFixed(1)}%)`}
+              >
+                {text}
+                <span className="text-xs text-gray-500 font-medium">{count}</span>
+              </span>
+            ))}
+          </div>
+        </div>
+      ))}
+      <div className="text-xs text-gray-500">
+        Baseado em {summary.documents} resposta{summary.documents !== 1 ? 's' : ''} com texto (contagens aproximadas)
+        {summary.pending > 0 && ` • ${summary.pending} em processamento`}
+      </div>
+    </div>
+  );
+}
+
 // Componente para seção sortable
 function SortableSection({ section, isCollapsed, onToggleCollapse }: { 
   section: Section; 
@@ -141,6 +192,10 @@ export default function FormSummaryPage() {
   const [sections, setSections] = useState<Section[]>([]);
   const [analytics, setAnalytics] = useState<FormAnalytics | null>(null);
   const [responseSessions, setResponseSessions] = useState<ResponseSession[]>([]);
+  // Respostas carregadas sob demanda, uma página por vez (next_cursor da última página)
+  const [responsesCursor, setResponsesCursor] = useState<string | null>(null);
+  const [responsesLoaded, setResponsesLoaded] = useState(false);
+  const [isLoadingResponses, setIsLoadingResponses] = useState(false);
   const [selectedResponseDetail, setSelectedResponseDetail] = useState<ResponseDetail | null>(null);
   
   const [isLoading, setIsLoading] = useState(true);
@@ -217,9 +272,6 @@ export default function FormSummaryPage() {
             };
             
             setAnalytics(parsedAnalytics);
-            
-            const responsesData = await formsService.getResponses(formId);
-            setResponseSessions(responsesData);
           } catch (error) {
             console.error('Erro ao carregar analytics:', error);
           }
@@ -235,6 +287,27 @@ export default function FormSummaryPage() {
     loadData();
   }, [formId]);
 
+  const loadResponsesPage = async (cursor?: string) => {
+    try {
+      setIsLoadingResponses(true);
+      const page = await formsService.getResponsesPage(formId, cursor);
+      setResponseSessions((current) => (cursor ? [...current, ...page.items] : page.items));
+      setResponsesCursor(page.next_cursor);
+      setResponsesLoaded(true);
+    } catch (error) {
+      console.error('Erro ao carregar respostas:', error);
+    } finally {
+      setIsLoadingResponses(false);
+    }
+  };
+
+  // Primeira página só quando a aba de respostas é aberta
+  useEffect(() => {
+    if (activeTab === 'responses' && analytics && !responsesLoaded && !isLoadingResponses) {
+      loadResponsesPage();
+    }
+  }, [activeTab, analytics, responsesLoaded]);
+
   const handleSaveTitle = async () => {
     if (!formData) return;
     
@@ -306,9 +379,6 @@ export default function FormSummaryPage() {
           };
           
           setAnalytics(parsedAnalytics);
-          
-          const responsesData = await formsService.getResponses(formId);
-          setResponseSessions(responsesData);
         } catch (error) {
           console.error('Erro ao carregar analytics:', error);
         }
@@ -694,7 +764,9 @@ export default function FormSummaryPage() {
                                     Tipo: {questionStats.type || 'N/A'} • {questionStats.total || 0} resposta{(questionStats.total || 0) !== 1 ? 's' : ''}
                                   </div>
                                   
-                                  {questionStats.distribution && Object.keys(questionStats.distribution).length > 0 ? (
+                                  {questionStats.text_summary ? (
+                                    <TextSummaryView summary={questionStats.text_summary} total={questionStats.total || 0} />
+                                  ) : questionStats.distribution && Object.keys(questionStats.distribution).length > 0 ? (
                                     <div className="space-y-2">
                                       <div className="text-sm font-medium text-gray-700">
                                         {questionStats.type === 'checkbox' ? 'Opções Selecionadas:' : 
@@ -767,7 +839,9 @@ export default function FormSummaryPage() {
                   <div>
                     <h3 className="text-lg font-semibold text-gray-900 mb-6">Respostas Específicas</h3>
                     
-                    {responseSessions.length === 0 ? (
+                    {!responsesLoaded && isLoadingResponses ? (
+                      <div className="text-center py-12 text-gray-500">Carregando respostas...</div>
+                    ) : responseSessions.length === 0 ? (
                       <div className="text-center py-12 text-gray-500">
                         <p>Nenhuma resposta encontrada</p>
                         <p className="text-xs mt-2">Certifique-se de que o formulário está público e já recebeu respostas</p>
@@ -800,6 +874,20 @@ export default function FormSummaryPage() {
                             </div>
                           </div>
                         ))}
+                        <div className="flex items-center justify-between pt-2">
+                          <span className="text-sm text-gray-500">
+                            Mostrando {responseSessions.length} de {analytics?.total_responses ?? responseSessions.length} respostas
+                          </span>
+                          {responsesCursor && (
+                            <button
+                              onClick={() => loadResponsesPage(responsesCursor)}
+                              disabled={isLoadingResponses}
+                              className="px-4 py-2 text-sm bg-gray-100 text-gray-700 rounded-lg hover:bg-gray-200 disabled:opacity-50"
+                            >
+                              {isLoadingResponses ? 'Carregando...' : 'Carregar mais respostas'}
+                            </button>
+                          )}
+                        </div>
                       </div>
                     )}
 
@@ -4,6 +4,8 @@ import Cookies from 'js-cookie'
 // Create axios instance with base configuration
 const api = axios.create({
   baseURL: process.env.NEXT_PUBLIC_API_URL || 'http://localhost:8000',
+  // Envia o cookie de read-your-writes da API (leituras logo após uma escrita vão ao primário)
+  withCredentials: true,
   headers: {
     'Content-Type': 'application/json'
   }
@@ -1,6 +1,6 @@
 import api from '../lib/api'
 import axios from 'axios'
-import { User, Form, DashboardStats, FormPublic, ResponseSession, ResponseDetail, CreateFormRequest, CreateSectionRequest, SubmitFormRequest } from '@/types'
+import { User, Form, DashboardStats, FormPublic, ResponseSessionPage, ResponseDetail, CreateFormRequest, CreateSectionRequest, SubmitFormRequest } from '@/types'
 
 // Auth services
 export const authService = {
@@ -89,8 +89,9 @@ export const formsService = {
     return response.data
   },
 
-  getResponses: async (formId: string): Promise<ResponseSession[]> => {
-    const response = await api.get(`/forms/${formId}/responses`)
+  // Paginação por cursor: envie o next_cursor da página anterior
+  getResponsesPage: async (formId: string, cursor?: string, limit: number = 50): Promise<ResponseSessionPage> => {
+    const response = await api.get(`/forms/${formId}/responses`, { params: { cursor, limit } })
     return response.data
   },
 
@@ -137,5 +138,11 @@ export const responseService = {
   getDetail: async (sessionId: string): Promise<ResponseDetail> => {
     const response = await api.get(`/responses/${sessionId}`)
     return response.data
+  },
+
+  // Várias sessões em uma única requisição (ids explícitos ou página do formulário)
+  getBatch: async (params: { session_ids?: string[]; form_id?: string; cursor?: string; limit?: number }): Promise<{ items: ResponseDetail[]; next_cursor: string | null }> => {
+    const response = await api.post('/responses/batch', params)
+    return response.data
   }
 }
@@ -84,6 +84,12 @@ export interface ResponseSession {
   user_agent?: string | null
 }
 
+export interface ResponseSessionPage {
+  items: ResponseSession[]
+  next_cursor: string | null
+  total: number | null
+}
+
 export interface ResponseDetail extends ResponseSession {
   answers: {
     question_id: string
@@ -103,6 +109,12 @@ export interface FormAnalytics {
     type: string
     total: number
     distribution?: Record<string, number>
+    text_summary?: {
+      documents: number
+      pending: number
+      top_terms: Array<{ term: string; count: number }>
+      top_phrases: Array<{ phrase: string; count: number }>
+    }
   }>
 }
 